@@ -0,0 +1,54 @@
+"""
+benchmarks/bench_codegen.py - Code generation throughput with and without the render LRU
+
+Usage: python benchmarks/bench_codegen.py [num_docs]
+
+"no cache" renders every template (cache_size=0); "LRU" is the default
+registry after one warm-up pass over the same IRs.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from codegen import CodeGeneratorRegistry
+from corpus import make_corpus
+from fast_parser import FastParser
+from ir import IRBuilder
+from router import CategoryRouter
+
+
+def generate_all(registry, irs):
+    for ir in irs:
+        registry.generate_pseudo(ir)
+        registry.generate_python(ir)
+
+
+def best_us(registry, irs, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate_all(registry, irs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(irs) * 1e6
+
+
+def main(num_docs: int = 5_000):
+    parser, router, builder = FastParser(), CategoryRouter(), IRBuilder()
+    irs = []
+    for text in make_corpus(num_docs):
+        features = parser.parse(text)
+        irs.append(builder.build(features, router.get_primary_category(features)))
+
+    print(f"Documents: {num_docs} ({len({ir.raw_text for ir in irs})} distinct texts)")
+    print(f"{'registry':<10} {'µs/IR (pseudo + python)':>24}")
+    print(f"{'no cache':<10} {best_us(CodeGeneratorRegistry(cache_size=0), irs):24.2f}")
+    registry = CodeGeneratorRegistry()
+    generate_all(registry, irs)
+    print(f"{'LRU':<10} {best_us(registry, irs):24.2f}")
+    print(registry.cache_info())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,52 @@
+"""
+benchmarks/bench_engines.py - Latency and routing agreement: accurate vs fast engine
+
+Usage: python benchmarks/bench_engines.py [num_docs]
+
+Both engines parse the same corpus uncached; agreement is the share of
+documents whose primary category matches, which is what the fast engine has
+to get right to be useful.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from router import CategoryRouter
+from text_parser import TextParser
+
+
+def timed(parser, texts):
+    start = time.perf_counter()
+    parsed = list(parser.parse_many(iter(texts), batch_size=256))
+    return parsed, time.perf_counter() - start
+
+
+def main(num_docs: int = 5_000):
+    texts = make_corpus(num_docs)
+
+    start = time.perf_counter()
+    accurate = TextParser()
+    load_seconds = time.perf_counter() - start
+    accurate_parsed, accurate_seconds = timed(accurate, texts)
+    fast_parsed, fast_seconds = timed(FastParser(), texts)
+
+    router = CategoryRouter()
+    agree = sum(
+        router.get_primary_category(a).name == router.get_primary_category(f).name
+        for a, f in zip(accurate_parsed, fast_parsed)
+    )
+
+    print(f"Documents:        {num_docs}")
+    print(f"Model load:       {load_seconds:8.3f} s (accurate only)")
+    print(f"Accurate:         {accurate_seconds / num_docs * 1e6:8.1f} µs/doc")
+    print(f"Fast:             {fast_seconds / num_docs * 1e6:8.1f} µs/doc")
+    print(f"Speed-up:         {accurate_seconds / fast_seconds:8.1f}x")
+    print(f"Route agreement:  {agree / num_docs:8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
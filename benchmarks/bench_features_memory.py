@@ -0,0 +1,52 @@
+"""
+benchmarks/bench_features_memory.py - Bytes per document: ParsedFeatures vs CompactFeatures
+
+Usage: python benchmarks/bench_features_memory.py [num_docs]
+
+Every document is rebuilt from a pickle so it owns fresh string objects,
+exactly as features coming out of the parser do; tracemalloc then measures
+what holding all of them costs in each representation.
+"""
+import os
+import pickle
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from pipeline import get_pipeline
+from text_parser import CompactFeatures
+
+
+def held_bytes(build):
+    """Bytes still allocated after build() returns (the result is kept alive)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main(num_docs: int = 20_000):
+    parser = get_pipeline().parser
+    parsed = list(parser.parse_many(make_corpus(num_docs), batch_size=256))
+    blobs = [pickle.dumps(features) for features in parsed]
+    del parsed
+
+    loose, loose_bytes = held_bytes(lambda: [pickle.loads(b) for b in blobs])
+    del loose
+    compact, compact_bytes = held_bytes(
+        lambda: [CompactFeatures.from_features(pickle.loads(b)) for b in blobs]
+    )
+    del compact
+
+    print(f"Documents:        {num_docs}")
+    print(f"ParsedFeatures:   {loose_bytes / num_docs:8.0f} bytes/doc")
+    print(f"CompactFeatures:  {compact_bytes / num_docs:8.0f} bytes/doc")
+    print(f"Reduction:        {1 - compact_bytes / loose_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
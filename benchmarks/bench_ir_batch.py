@@ -0,0 +1,63 @@
+"""
+benchmarks/bench_ir_batch.py - IRBatch columns vs a list of IR models
+
+Usage: python benchmarks/bench_ir_batch.py [num_docs]
+
+Build time is measured untraced; memory is what tracemalloc sees still
+allocated after a second, traced build. Analytics are a category count plus
+a confidence histogram.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from ir import IRBuilder
+from router import CategoryRouter
+
+
+def measured(fn):
+    start = time.perf_counter()
+    out = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    traced = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    return out, seconds, size
+
+
+def main(num_docs: int = 10_000):
+    parser, router, builder = FastParser(), CategoryRouter(), IRBuilder()
+    features = [parser.parse(text) for text in make_corpus(num_docs)]
+    scores = [router.get_primary_category(f) for f in features]
+
+    irs, list_s, list_bytes = measured(
+        lambda: [builder.build(f, s) for f, s in zip(features, scores)])
+    batch, batch_s, batch_bytes = measured(lambda: builder.build_batch(features, scores))
+
+    start = time.perf_counter()
+    Counter(ir.category for ir in irs)
+    np.histogram([ir.confidence for ir in irs], bins=10)
+    list_query = time.perf_counter() - start
+    start = time.perf_counter()
+    batch.category_counts()
+    np.histogram(batch.confidence, bins=10)
+    batch_query = time.perf_counter() - start
+
+    print(f"Documents: {num_docs}")
+    print(f"{'container':<10} {'build ms':>9} {'bytes/IR':>9} {'analytics ms':>13}")
+    print(f"{'list':<10} {list_s * 1e3:9.1f} {list_bytes / num_docs:9.0f} {list_query * 1e3:13.2f}")
+    print(f"{'IRBatch':<10} {batch_s * 1e3:9.1f} {batch_bytes / num_docs:9.0f} {batch_query * 1e3:13.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,48 @@
+"""
+benchmarks/bench_ir_build.py - IR builds per second, validated vs trusted construction
+
+Usage: python benchmarks/bench_ir_build.py [num_docs]
+
+Parses and routes the synthetic corpus once, then times IRBuilder.build()
+alone with pydantic validation on (the old path) and off (the default).
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from ir import IRBuilder
+from router import CategoryRouter
+
+
+def builds_per_second(builder, routed):
+    gc.collect()
+    start = time.perf_counter()
+    for features, category in routed:
+        builder.build(features, category)
+    return len(routed) / (time.perf_counter() - start)
+
+
+def best_of(builder, routed, repeat=5):
+    return max(builds_per_second(builder, routed) for _ in range(repeat))
+
+
+def main(num_docs: int = 20_000):
+    parser = FastParser()
+    router = CategoryRouter()
+    routed = [(f, router.get_primary_category(f))
+              for f in (parser.parse(text) for text in make_corpus(num_docs))]
+
+    validated = best_of(IRBuilder(validate=True), routed)
+    trusted = best_of(IRBuilder(), routed)
+    print(f"Documents:        {num_docs}")
+    print(f"Validated build:  {validated:10,.0f} IR/s")
+    print(f"Trusted build:    {trusted:10,.0f} IR/s  ({trusted / validated:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,56 @@
+"""
+benchmarks/bench_ir_serialize.py - IR size and (de)serialization speed: binary vs JSON
+
+Usage: python benchmarks/bench_ir_serialize.py [num_docs]
+
+Every decode rebuilds a full IR (JSON through model_validate_json), so
+decoding is bounded by model construction for every format; the x columns
+give each format's time relative to to_bytes (above 1 means to_bytes wins).
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from ir import IRBuilder, IntermediateRepresentation
+from router import CategoryRouter
+
+
+def timed_us(fn, items):
+    start = time.perf_counter()
+    out = [fn(item) for item in items]
+    return out, (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main(num_docs: int = 5_000):
+    parser, router, builder = FastParser(), CategoryRouter(), IRBuilder()
+    irs = []
+    for text in make_corpus(num_docs):
+        features = parser.parse(text)
+        irs.append(builder.build(features, router.get_primary_category(features)))
+
+    rows = [
+        ("to_bytes", IntermediateRepresentation.to_bytes, IntermediateRepresentation.from_bytes),
+        ("to_json", IntermediateRepresentation.to_json, IntermediateRepresentation.model_validate_json),
+        ("to_compact_json", IntermediateRepresentation.to_compact_json,
+         IntermediateRepresentation.model_validate_json),
+        ("pickle", pickle.dumps, pickle.loads),
+    ]
+    print(f"Documents: {num_docs}")
+    print(f"{'format':<16} {'bytes/IR':>9} {'encode µs':>10} {'x':>5} {'decode µs':>10} {'x':>5}")
+    baseline = None
+    for name, encode, decode in rows:
+        blobs, encode_us = timed_us(encode, irs)
+        _, decode_us = timed_us(decode, blobs)
+        size = sum(len(blob.encode() if isinstance(blob, str) else blob) for blob in blobs) / len(blobs)
+        baseline = baseline or (encode_us, decode_us)
+        print(f"{name:<16} {size:9.0f} {encode_us:10.1f} {encode_us / baseline[0]:5.2f} "
+              f"{decode_us:10.1f} {decode_us / baseline[1]:5.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_linear_router.py - Linear vs keyword routing: load time, latency, agreement
+
+Usage: python benchmarks/bench_linear_router.py [num_docs]
+
+Trains on data/routing_examples.tsv, saves and reloads the .npz, then routes
+the synthetic corpus with both engines.
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from linear_router import LinearRouter, read_labelled
+from router import CategoryRouter
+
+
+def per_doc_us(route, features_list):
+    start = time.perf_counter()
+    for features in features_list:
+        route(features)
+    return (time.perf_counter() - start) / len(features_list) * 1e6
+
+
+def main(num_docs: int = 5_000):
+    parser = FastParser()
+    texts, labels = read_labelled(os.path.join(ROOT, "data", "routing_examples.tsv"))
+    model = LinearRouter.train([parser.parse(t) for t in texts], labels)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "router.npz")
+        model.save(path)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        model = LinearRouter.load(path)
+        load_ms = (time.perf_counter() - start) * 1e3
+
+    features_list = [parser.parse(text) for text in make_corpus(num_docs)]
+    keywords = CategoryRouter()
+    linear = CategoryRouter(model=model)
+    agree = sum(keywords.get_primary_category(f).name == linear.get_primary_category(f).name
+                for f in features_list)
+
+    print(f"Documents:        {num_docs}")
+    print(f"Model file:       {size / 1024:8.1f} KiB, loads in {load_ms:.1f} ms")
+    print(f"Keyword route:    {per_doc_us(keywords.route, features_list):8.1f} µs/doc")
+    print(f"Linear route:     {per_doc_us(linear.route, features_list):8.1f} µs/doc")
+    print(f"Agreement:        {agree / num_docs:8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
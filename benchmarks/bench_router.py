@@ -0,0 +1,59 @@
+"""
+benchmarks/bench_router.py - Routing latency as the keyword lists grow
+
+Usage: python benchmarks/bench_router.py [num_docs]
+
+Pads every category with synthetic keywords (never present in the corpus)
+and times CategoryRouter.route against the old per-keyword substring test.
+The compiled index should stay flat; the substring scan grows linearly.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from fast_parser import FastParser
+from router import CategoryRouter
+
+
+def substring_matches(router, all_text):
+    """The pre-index matching loop, kept here as the baseline"""
+    return {category: [kw for kw in config["keywords"] if kw in all_text]
+            for category, config in router.CATEGORIES.items()}
+
+
+def padded_router(per_category: int) -> CategoryRouter:
+    categories = {
+        name: {**config, "keywords": config["keywords"] + [
+            f"{name}pad{i}" for i in range(per_category - len(config["keywords"]))]}
+        for name, config in CategoryRouter.CATEGORIES.items()
+    }
+    return type("PaddedRouter", (CategoryRouter,), {"CATEGORIES": categories})()
+
+
+def main(num_docs: int = 2_000):
+    parser = FastParser()
+    texts = [parser.parse(text).raw_text.lower() for text in make_corpus(num_docs)]
+
+    print(f"Documents: {num_docs}\n")
+    print(f"{'keywords/category':>18} {'compiled µs':>12} {'substring µs':>13}")
+    for per_category in (25, 100, 400, 1600):
+        router = padded_router(per_category)
+
+        start = time.perf_counter()
+        for text in texts:
+            router.match_keywords(text)
+        compiled = (time.perf_counter() - start) / num_docs * 1e6
+
+        start = time.perf_counter()
+        for text in texts:
+            substring_matches(router, text)
+        substring = (time.perf_counter() - start) / num_docs * 1e6
+
+        print(f"{per_category:>18} {compiled:12.1f} {substring:13.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_session.py - Edit latency: full re-run vs IncrementalSession
+
+Usage: python benchmarks/bench_session.py [num_sentences] [engine]
+
+Builds one long scenario from corpus sentences, then applies a series of
+one-sentence edits, timing Pipeline.run on the whole edited text against
+IncrementalSession.update.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from pipeline import Pipeline
+from session import IncrementalSession
+
+EDITS = 10
+
+
+def main(num_sentences: int = 500, engine: str = "accurate"):
+    sentences = make_corpus(num_sentences)
+    # Separate pipelines, so neither benefits from the other's parse cache
+    full = Pipeline(engine=engine)
+    session = IncrementalSession(Pipeline(engine=engine), fmt="all")
+
+    start = time.perf_counter()
+    session.update(" ".join(sentences))
+    initial = time.perf_counter() - start
+
+    full_s = session_s = 0.0
+    for edit in range(EDITS):
+        position = edit * num_sentences // EDITS
+        sentences[position] = f"Edit number {edit} changes this sentence."
+        text = " ".join(sentences)
+
+        start = time.perf_counter()
+        full.run(text, fmt="all")
+        full_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        session.update(text)
+        session_s += time.perf_counter() - start
+        assert session.stats.parsed == 1
+
+    print(f"Sentences:            {num_sentences} ({engine} engine)")
+    print(f"Session first update: {initial * 1e3:8.1f} ms")
+    print(f"Full re-run per edit: {full_s / EDITS * 1e3:8.1f} ms")
+    print(f"Session per edit:     {session_s / EDITS * 1e3:8.1f} ms  "
+          f"({full_s / session_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         sys.argv[2] if len(sys.argv) > 2 else "accurate")
@@ -0,0 +1,39 @@
+"""
+benchmarks/bench_worker_pool.py - Memory and throughput: pre-fork vs spawn worker pools
+
+Usage: python benchmarks/bench_worker_pool.py [num_docs] [workers]
+
+PSS splits every shared page between the processes mapping it, so the sum of
+worker PSS is what the pool really costs; RSS counts shared pages once per
+worker and overstates it for the forked pool.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_corpus
+from workers import WorkerPool
+
+
+def main(num_docs: int = 2_000, workers: int = 4):
+    texts = make_corpus(num_docs)
+    print(f"Documents: {num_docs}, workers: {workers}\n")
+    print(f"{'pool':6} {'startup':>9} {'docs/s':>8} {'RSS MiB':>9} {'PSS MiB':>9}")
+
+    for method in ("fork", "spawn"):
+        with WorkerPool(workers=workers, start_method=method) as pool:
+            start = time.perf_counter()
+            for _ in pool.run_many(texts, fmt="pseudo"):
+                pass
+            elapsed = time.perf_counter() - start
+        rss = sum(s.rss_bytes for s in pool.stats) / 2**20
+        pss = sum(s.pss_bytes for s in pool.stats) / 2**20
+        print(f"{method:6} {pool.startup_seconds:8.2f}s {num_docs / elapsed:8.0f} "
+              f"{rss:9.1f} {pss:9.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
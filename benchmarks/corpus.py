@@ -0,0 +1,45 @@
+"""
+benchmarks/corpus.py - Synthetic scenario corpus shared by the benchmarks
+
+Scenarios are templated from the README/EXAMPLES prompts with varied names,
+numbers and objects, so documents repeat vocabulary the way real traffic does
+without being literal duplicates.
+"""
+import random
+from typing import List
+
+TEMPLATES = [
+    "{name} flexes his muscles to impress {group} at the gym.",
+    "Calculate the trajectory of a {thing} thrown at {n} m/s at {angle} degrees.",
+    "The goddess {name} weighs justice in perfect harmony.",
+    "DNA mutations drive evolution across {n} species.",
+    "AI algorithms optimize cloud network performance for {name}.",
+    "{name} feels anxious about making a decision in front of the {group}.",
+    "A {thing} falls due to gravity with an acceleration of {n} m/s.",
+    "Optimize profit given cost constraints for {name}'s startup.",
+    "If the user clicks the {thing} button, show the settings menu.",
+    "{name} gains confidence after {n} repeated successes.",
+    "Find the derivative and minimum of a quadratic function with {n} terms.",
+    "Players compete in a tournament to win the {thing} with the best strategy.",
+    "Peer pressure and social proof make the {group} conform.",
+    "{name} must follow the safety protocol when the alarm rings.",
+]
+
+NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+GROUPS = ["girls", "coworkers", "team", "class", "crowd", "neighbours"]
+THINGS = ["ball", "rock", "drone", "arrow", "package", "satellite"]
+
+
+def make_corpus(size: int, seed: int = 0) -> List[str]:
+    """Return size scenario strings, deterministic for a given seed"""
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            name=rng.choice(NAMES),
+            group=rng.choice(GROUPS),
+            thing=rng.choice(THINGS),
+            n=rng.randint(2, 90),
+            angle=rng.choice([15, 30, 45, 60, 75]),
+        )
+        for _ in range(size)
+    ]
@@ -1,188 +1,214 @@
 """
 codegen/__init__.py - Code generation registry and dispatcher
 """
+import hashlib
+from functools import lru_cache
+
+from codegen.template import Template, TemplateGenerator
 from codegen.psychology import PsychologyGenerator, SocialGenerator
 from codegen.physics import PhysicsGenerator
 from codegen.mathematics import MathematicsGenerator
 
+# Bump whenever any built-in generator's output changes: stored results
+# (see result_store.py) are keyed by it through CodeGeneratorRegistry.version
+GENERATOR_VERSION = "1"
+
+# Rendered outputs each registry keeps (see CodeGeneratorRegistry.generate_pseudo);
+# a few KiB each
+RENDER_CACHE_SIZE = 2048
+
 
-class GenericGenerator:
+class GenericGenerator(TemplateGenerator):
     """Fallback generator for unspecialised categories"""
 
-    @staticmethod
-    def generate_pseudo(ir) -> str:
-        pseudo = [
-            "// GENERIC LOGIC",
-            f"// Scenario: {ir.raw_text}",
-            "",
-            "Input Processing:",
-        ]
-        if ir.entities:
-            pseudo.append(f"  Entities: {', '.join([e.name for e in ir.entities])}")
-        if ir.actions:
-            pseudo.append(f"  Actions: {', '.join([a.verb for a in ir.actions])}")
-        pseudo += [
-            "",
-            "Logic Flow:",
-            "  1. Parse input",
-            "  2. Execute actions",
-            "  3. Update state",
-            "  4. Return output",
-        ]
-        return "\n".join(pseudo)
+    # ParsedFeatures fields read through the IR (entity and action listings)
+    features = frozenset({"actors", "actions"})
+
+    PSEUDO = Template([
+        "// GENERIC LOGIC",
+        "// Scenario: ${raw_text}",
+        "",
+        "Input Processing:",
+        "${entity_summary}",
+        "${action_summary}",
+        "",
+        "Logic Flow:",
+        "  1. Parse input",
+        "  2. Execute actions",
+        "  3. Update state",
+        "  4. Return output",
+    ])
+
+    PYTHON = Template([
+        '"""',
+        "Generic Model: ${raw_text}",
+        '"""',
+        "",
+        "def process_scenario():",
+        '    """Generic scenario processing"""',
+        '    scenario = "${raw_text}"',
+        "    ",
+        '    print(f"Processing: {scenario}")',
+        "    ",
+        "${entity_lines}",
+        "${action_lines}",
+        "    ",
+        '    print("\\nScenario processing complete.")',
+        "",
+        "",
+        'if __name__ == "__main__":',
+        "    process_scenario()",
+    ])
 
     @staticmethod
-    def generate_python(ir) -> str:
-        code = [
-            '"""',
-            f"Generic Model: {ir.raw_text}",
-            '"""',
-            "",
-            "def process_scenario():",
-            '    """Generic scenario processing"""',
-            f'    scenario = "{ir.raw_text}"',
-            "    ",
-            '    print(f"Processing: {scenario}")',
-            "    ",
-        ]
-        if ir.entities:
-            code.append("    entities = [")
-            for entity in ir.entities:
-                code.append(f'        "{entity.name}",')
-            code += ["    ]", '    print(f"Entities: {entities}")']
-        if ir.actions:
-            code.append("    actions = [")
-            for action in ir.actions:
-                code.append(f'        "{action.verb}",')
-            code += ["    ]", '    print(f"Actions: {actions}")']
-        code += [
-            "    ",
-            '    print("\\nScenario processing complete.")',
-            "",
-            "",
-            'if __name__ == "__main__":',
-            "    process_scenario()",
-        ]
-        return "\n".join(code)
-
-
-class OptimizationGenerator:
+    def pseudo_slots(ir) -> tuple:
+        return (ir.raw_text, tuple([e.name for e in ir.entities]),
+                tuple([a.verb for a in ir.actions]))
+
+    python_slots = pseudo_slots
+
+    @classmethod
+    def render_pseudo(cls, raw_text: str, entities: tuple, actions: tuple) -> str:
+        return cls.PSEUDO.render(
+            raw_text=raw_text,
+            entity_summary=[f"  Entities: {', '.join(entities)}"] if entities else [],
+            action_summary=[f"  Actions: {', '.join(actions)}"] if actions else [],
+        )
+
+    @classmethod
+    def render_python(cls, raw_text: str, entities: tuple, actions: tuple) -> str:
+        entity_lines, action_lines = [], []
+        if entities:
+            entity_lines.append("    entities = [")
+            for name in entities:
+                entity_lines.append(f'        "{name}",')
+            entity_lines += ["    ]", '    print(f"Entities: {entities}")']
+        if actions:
+            action_lines.append("    actions = [")
+            for verb in actions:
+                action_lines.append(f'        "{verb}",')
+            action_lines += ["    ]", '    print(f"Actions: {actions}")']
+        return cls.PYTHON.render(raw_text=raw_text, entity_lines=entity_lines,
+                                 action_lines=action_lines)
+
+
+class OptimizationGenerator(TemplateGenerator):
     """Generates code for optimisation scenarios"""
 
-    @staticmethod
-    def generate_pseudo(ir) -> str:
-        return "\n".join([
-            "// OPTIMISATION MODEL",
-            f"// Scenario: {ir.raw_text}",
-            "",
-            "Define:",
-            "  objective_function f(x)",
-            "  constraints g(x) <= 0",
-            "",
-            "Solve:",
-            "  IF unconstrained: gradient_descent(f)",
-            "  ELSE: constrained_optimisation(f, g)",
-            "",
-            "Return: optimal x, f(x)",
-        ])
+    features = frozenset()
 
-    @staticmethod
-    def generate_python(ir) -> str:
-        return "\n".join([
-            '"""',
-            f"Optimisation: {ir.raw_text}",
-            '"""',
-            "from scipy.optimize import minimize",
-            "import numpy as np",
-            "",
-            "",
-            "def objective(x):",
-            "    # Define your objective function here",
-            "    return x[0]**2 + x[1]**2  # example: minimise distance from origin",
-            "",
-            "",
-            "def run_optimisation():",
-            "    x0 = np.array([1.0, 1.0])  # initial guess",
-            "    result = minimize(objective, x0, method='BFGS')",
-            "    print(f'Optimal x: {result.x}')",
-            "    print(f'Optimal f(x): {result.fun:.6f}')",
-            "    print(f'Converged: {result.success}')",
-            "",
-            "",
-            'if __name__ == "__main__":',
-            "    run_optimisation()",
-        ])
-
-
-class RulesGenerator:
+    PSEUDO = Template([
+        "// OPTIMISATION MODEL",
+        "// Scenario: ${raw_text}",
+        "",
+        "Define:",
+        "  objective_function f(x)",
+        "  constraints g(x) <= 0",
+        "",
+        "Solve:",
+        "  IF unconstrained: gradient_descent(f)",
+        "  ELSE: constrained_optimisation(f, g)",
+        "",
+        "Return: optimal x, f(x)",
+    ])
+
+    PYTHON = Template([
+        '"""',
+        "Optimisation: ${raw_text}",
+        '"""',
+        "from scipy.optimize import minimize",
+        "import numpy as np",
+        "",
+        "",
+        "def objective(x):",
+        "    # Define your objective function here",
+        "    return x[0]**2 + x[1]**2  # example: minimise distance from origin",
+        "",
+        "",
+        "def run_optimisation():",
+        "    x0 = np.array([1.0, 1.0])  # initial guess",
+        "    result = minimize(objective, x0, method='BFGS')",
+        "    print(f'Optimal x: {result.x}')",
+        "    print(f'Optimal f(x): {result.fun:.6f}')",
+        "    print(f'Converged: {result.success}')",
+        "",
+        "",
+        'if __name__ == "__main__":',
+        "    run_optimisation()",
+    ])
+
+
+class RulesGenerator(TemplateGenerator):
     """Generates code for rule-based / expert-system scenarios"""
 
-    @staticmethod
-    def generate_pseudo(ir) -> str:
-        return "\n".join([
-            "// RULE ENGINE",
-            f"// Scenario: {ir.raw_text}",
-            "",
-            "FOR EACH rule IN rules (sorted by priority DESC):",
-            "  IF evaluate(rule.condition, state):",
-            "    execute(rule.action)",
-            "    IF rule.is_terminal: STOP",
-            "",
-            "RETURN updated_state",
-        ])
+    features = frozenset()
 
-    @staticmethod
-    def generate_python(ir) -> str:
-        return "\n".join([
-            '"""',
-            f"Rule Engine: {ir.raw_text}",
-            '"""',
-            "from dataclasses import dataclass, field",
-            "from typing import Callable, Any",
-            "",
-            "",
-            "@dataclass",
-            "class Rule:",
-            "    name: str",
-            "    condition: Callable[[dict], bool]",
-            "    action: Callable[[dict], None]",
-            "    priority: int = 1",
-            "",
-            "",
-            "class RuleEngine:",
-            '    """Simple forward-chaining rule engine"""',
-            "",
-            "    def __init__(self):",
-            "        self.rules: list[Rule] = []",
-            "",
-            "    def add_rule(self, rule: Rule):",
-            "        self.rules.append(rule)",
-            "        self.rules.sort(key=lambda r: r.priority, reverse=True)",
-            "",
-            "    def run(self, state: dict) -> dict:",
-            "        for rule in self.rules:",
-            "            if rule.condition(state):",
-            "                rule.action(state)",
-            "        return state",
-            "",
-            "",
-            'if __name__ == "__main__":',
-            "    engine = RuleEngine()",
-            "    engine.add_rule(Rule(",
-            '        name="example",',
-            "        condition=lambda s: s.get('x', 0) > 10,",
-            "        action=lambda s: s.update({'triggered': True}),",
-            "        priority=1,",
-            "    ))",
-            "    result = engine.run({'x': 15})",
-            "    print(result)",
-        ])
+    PSEUDO = Template([
+        "// RULE ENGINE",
+        "// Scenario: ${raw_text}",
+        "",
+        "FOR EACH rule IN rules (sorted by priority DESC):",
+        "  IF evaluate(rule.condition, state):",
+        "    execute(rule.action)",
+        "    IF rule.is_terminal: STOP",
+        "",
+        "RETURN updated_state",
+    ])
+
+    PYTHON = Template([
+        '"""',
+        "Rule Engine: ${raw_text}",
+        '"""',
+        "from dataclasses import dataclass, field",
+        "from typing import Callable, Any",
+        "",
+        "",
+        "@dataclass",
+        "class Rule:",
+        "    name: str",
+        "    condition: Callable[[dict], bool]",
+        "    action: Callable[[dict], None]",
+        "    priority: int = 1",
+        "",
+        "",
+        "class RuleEngine:",
+        '    """Simple forward-chaining rule engine"""',
+        "",
+        "    def __init__(self):",
+        "        self.rules: list[Rule] = []",
+        "",
+        "    def add_rule(self, rule: Rule):",
+        "        self.rules.append(rule)",
+        "        self.rules.sort(key=lambda r: r.priority, reverse=True)",
+        "",
+        "    def run(self, state: dict) -> dict:",
+        "        for rule in self.rules:",
+        "            if rule.condition(state):",
+        "                rule.action(state)",
+        "        return state",
+        "",
+        "",
+        'if __name__ == "__main__":',
+        "    engine = RuleEngine()",
+        "    engine.add_rule(Rule(",
+        '        name="example",',
+        "        condition=lambda s: s.get('x', 0) > 10,",
+        "        action=lambda s: s.update({'triggered': True}),",
+        "        priority=1,",
+        "    ))",
+        "    result = engine.run({'x': 15})",
+        "    print(result)",
+    ])
+
+
+def _render(render, *slots) -> str:
+    return render(*slots)
 
 
 class CodeGeneratorRegistry:
     """Central registry for code generators"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = RENDER_CACHE_SIZE):
         # FIX: all categories the router can produce now have an explicit entry.
         # Previously biology/technology/art/philosophy/rules/game/business/ui/optimization
         # were silently falling through to GenericGenerator without being listed here,
@@ -207,23 +233,58 @@ class CodeGeneratorRegistry:
             "art":          GenericGenerator,
             "generic":      GenericGenerator,
         }
+        # (render_<kind> method, *slot values) → rendered text; thread-safe
+        self._render = lru_cache(maxsize=cache_size)(_render)
 
     def get_generator(self, category: str):
         """Get generator for category, falling back to GenericGenerator"""
         return self.generators.get(category.lower(), GenericGenerator)
 
     def generate_pseudo(self, ir) -> str:
-        """Generate pseudo-code for IR"""
-        return self.get_generator(ir.category).generate_pseudo(ir)
+        """
+        Generate pseudo-code for IR. TemplateGenerators are rendered through
+        an LRU keyed by generator and slot values (see codegen/template.py);
+        other generators are called through generate_pseudo.
+        """
+        generator = self.get_generator(ir.category)
+        slots = getattr(generator, "pseudo_slots", None)
+        if slots is None:
+            return generator.generate_pseudo(ir)
+        return self._render(generator.render_pseudo, *slots(ir))
 
     def generate_python(self, ir) -> str:
-        """Generate Python code for IR"""
-        return self.get_generator(ir.category).generate_python(ir)
+        """Generate Python code for IR (cached like generate_pseudo)"""
+        generator = self.get_generator(ir.category)
+        slots = getattr(generator, "python_slots", None)
+        if slots is None:
+            return generator.generate_python(ir)
+        return self._render(generator.render_python, *slots(ir))
+
+    def cache_info(self):
+        """functools cache statistics of the rendered-output LRU"""
+        return self._render.cache_info()
+
+    def required_features(self, category: str):
+        """
+        ParsedFeatures fields the category's generator reads through the IR,
+        or None if the generator does not declare them (assume everything).
+        """
+        return getattr(self.get_generator(category), "features", None)
 
     def register_generator(self, category: str, generator_class):
         """Register a new generator (for extensibility)"""
         self.generators[category.lower()] = generator_class
 
+    @property
+    def version(self) -> str:
+        """
+        GENERATOR_VERSION plus a digest of the category → generator mapping,
+        so registering a different generator also changes the version.
+        """
+        mapping = ",".join(f"{category}={cls.__module__}.{cls.__qualname__}"
+                           for category, cls in sorted(self.generators.items()))
+        return f"{GENERATOR_VERSION}-{hashlib.sha1(mapping.encode()).hexdigest()[:12]}"
+
 
 # Singleton instance
 _registry = CodeGeneratorRegistry()
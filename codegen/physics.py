@@ -1,146 +1,167 @@
 """
 codegen/physics.py - Physics simulation code generation
 """
-import re
+from codegen.template import Template, TemplateGenerator
 
+# Factors to the SI units projectile_motion() expects
+TO_SI = {"m/s": 1.0, "km/h": 1 / 3.6, "mph": 0.44704, "deg": 1.0, "rad": 57.29577951308232}
 
-class PhysicsGenerator:
+
+class PhysicsGenerator(TemplateGenerator):
     """Generates code for physics scenarios"""
 
+    # Quantities come from the tokenizer alone, so forced physics runs need no tagger/parser/NER
+    features = frozenset({"quantities"})
+
     @staticmethod
-    def generate_pseudo(ir) -> str:
-        """Generate pseudo-code for physics scenario"""
-        pseudo = [
-            "// PHYSICS SIMULATION",
-            "// Kinematic and dynamic motion",
-            "",
-            "Initial Conditions:",
-            "  position = [x0, y0, z0]",
-            "  velocity = [vx0, vy0, vz0]",
-            "  acceleration = [ax, ay, az]",
-            "  mass = m",
-            "",
-            "Time Evolution (dt = timestep):",
-            "  WHILE time < max_time:",
-            "    // Update velocity (v = v0 + a*dt)",
-            "    velocity += acceleration * dt",
-            "    ",
-            "    // Update position (x = x0 + v*dt)",
-            "    position += velocity * dt",
-            "    ",
-            "    // Apply forces if needed",
-            "    force = compute_forces(position, velocity)",
-            "    acceleration = force / mass",
-            "    ",
-            "    time += dt",
-            "",
-            "Conservation Checks:",
-            "  energy = 0.5 * mass * velocity² + potential_energy(position)",
-            "  momentum = mass * velocity",
-        ]
-        return "\n".join(pseudo)
+    def launch_parameters(ir):
+        """(v0 in m/s, angle in degrees) from the IR states, defaulting to 20 m/s at 45°"""
+        velocity, angle = ir.state("velocity"), ir.state("angle")
+        # Bare numbers fill whatever has no unit-tagged value, in order
+        bare = [s.value for s in ir.states if s.unit is None]
+        if velocity is not None:
+            v0 = velocity.value * TO_SI[velocity.unit]
+        else:
+            v0 = float(bare.pop(0)) if bare else 20.0
+        if angle is not None:
+            angle_deg = angle.value * TO_SI[angle.unit]
+        else:
+            angle_deg = float(bare.pop(0)) if bare else 45.0
+        return v0, angle_deg
+
+    PSEUDO = Template([
+        "// PHYSICS SIMULATION",
+        "// Kinematic and dynamic motion",
+        "",
+        "Initial Conditions:",
+        "  position = [x0, y0, z0]",
+        "  velocity = [vx0, vy0, vz0]",
+        "  acceleration = [ax, ay, az]",
+        "  mass = m",
+        "",
+        "Time Evolution (dt = timestep):",
+        "  WHILE time < max_time:",
+        "    // Update velocity (v = v0 + a*dt)",
+        "    velocity += acceleration * dt",
+        "    ",
+        "    // Update position (x = x0 + v*dt)",
+        "    position += velocity * dt",
+        "    ",
+        "    // Apply forces if needed",
+        "    force = compute_forces(position, velocity)",
+        "    acceleration = force / mass",
+        "    ",
+        "    time += dt",
+        "",
+        "Conservation Checks:",
+        "  energy = 0.5 * mass * velocity² + potential_energy(position)",
+        "  momentum = mass * velocity",
+    ])
+
+    PYTHON = Template([
+        '"""',
+        "Physics Simulation: ${raw_text}",
+        '"""',
+        "import numpy as np",
+        "import matplotlib.pyplot as plt",
+        "",
+        "",
+        "class PhysicsSimulator:",
+        '    """Simulates physical motion"""',
+        "    ",
+        "    def __init__(self, mass=1.0, gravity=9.81):",
+        "        self.mass = mass",
+        "        self.gravity = gravity",
+        "    ",
+        "    def projectile_motion(self, v0, angle_deg, dt=0.01, max_time=10):",
+        '        """',
+        "        Simulate projectile motion",
+        "        v0: initial velocity (m/s)",
+        "        angle_deg: launch angle (degrees)",
+        '        """',
+        "        angle_rad = np.radians(angle_deg)",
+        "        ",
+        "        # Initial conditions",
+        "        vx = v0 * np.cos(angle_rad)",
+        "        vy = v0 * np.sin(angle_rad)",
+        "        ",
+        "        x, y = 0.0, 0.0",
+        "        positions = [(x, y)]",
+        "        velocities = [(vx, vy)]",
+        "        ",
+        "        time = 0.0",
+        "        while y >= 0 and time < max_time:",
+        "            vy -= self.gravity * dt",
+        "            x += vx * dt",
+        "            y += vy * dt",
+        "            positions.append((x, y))",
+        "            velocities.append((vx, vy))",
+        "            time += dt",
+        "        ",
+        "        return np.array(positions), np.array(velocities), time",
+        "    ",
+        "    def analyze_motion(self, positions, velocities, flight_time):",
+        '        """Analyze and display motion statistics"""',
+        "        max_height = positions[:, 1].max()",
+        "        range_x = positions[-1, 0]",
+        "        ",
+        "        print(f\"Flight time: {flight_time:.2f} s\")",
+        "        print(f\"Maximum height: {max_height:.2f} m\")",
+        "        print(f\"Range: {range_x:.2f} m\")",
+        "        ",
+        "        v_initial = np.linalg.norm(velocities[0])",
+        "        v_final = np.linalg.norm(velocities[-1])",
+        "        E_initial = 0.5 * self.mass * v_initial**2",
+        "        E_final   = 0.5 * self.mass * v_final**2",
+        "        print(f\"\\nEnergy: initial={E_initial:.2f} J, final={E_final:.2f} J\")",
+        "",
+        "",
+        "# Run simulation",
+        'if __name__ == "__main__":',
+        "    sim = PhysicsSimulator(mass=1.0)",
+        "    ",
+        "    # Simulate projectile: v0=${v0} m/s at ${angle}°",
+        "    positions, velocities, time = sim.projectile_motion(v0=${v0}, angle_deg=${angle})",
+        "    ",
+        "    sim.analyze_motion(positions, velocities, time)",
+        "    ",
+        "    # Optional: uncomment to plot trajectory",
+        "    # plt.plot(positions[:, 0], positions[:, 1])",
+        "    # plt.xlabel('Distance (m)')",
+        "    # plt.ylabel('Height (m)')",
+        "    # plt.title('Projectile Trajectory')",
+        "    # plt.grid(True)",
+        "    # plt.show()",
+    ])
 
     @staticmethod
-    def generate_python(ir) -> str:
-        """Generate executable Python code for physics scenario"""
-        code = [
-            '"""',
-            f"Physics Simulation: {ir.raw_text}",
-            '"""',
-            "import numpy as np",
-            "import matplotlib.pyplot as plt",
-            "",
-            "",
-            "class PhysicsSimulator:",
-            '    """Simulates physical motion"""',
-            "    ",
-            "    def __init__(self, mass=1.0, gravity=9.81):",
-            "        self.mass = mass",
-            "        self.gravity = gravity",
-            "    ",
-            "    def projectile_motion(self, v0, angle_deg, dt=0.01, max_time=10):",
-            '        """',
-            "        Simulate projectile motion",
-            "        v0: initial velocity (m/s)",
-            "        angle_deg: launch angle (degrees)",
-            '        """',
-            "        angle_rad = np.radians(angle_deg)",
-            "        ",
-            "        # Initial conditions",
-            "        vx = v0 * np.cos(angle_rad)",
-            "        vy = v0 * np.sin(angle_rad)",
-            "        ",
-            "        x, y = 0.0, 0.0",
-            "        positions = [(x, y)]",
-            "        velocities = [(vx, vy)]",
-            "        ",
-            "        time = 0.0",
-            "        while y >= 0 and time < max_time:",
-            "            vy -= self.gravity * dt",
-            "            x += vx * dt",
-            "            y += vy * dt",
-            "            positions.append((x, y))",
-            "            velocities.append((vx, vy))",
-            "            time += dt",
-            "        ",
-            "        return np.array(positions), np.array(velocities), time",
-            "    ",
-            "    def analyze_motion(self, positions, velocities, flight_time):",
-            '        """Analyze and display motion statistics"""',
-            "        max_height = positions[:, 1].max()",
-            "        range_x = positions[-1, 0]",
-            "        ",
-            "        print(f\"Flight time: {flight_time:.2f} s\")",
-            "        print(f\"Maximum height: {max_height:.2f} m\")",
-            "        print(f\"Range: {range_x:.2f} m\")",
-            "        ",
-            "        v_initial = np.linalg.norm(velocities[0])",
-            "        v_final = np.linalg.norm(velocities[-1])",
-            "        E_initial = 0.5 * self.mass * v_initial**2",
-            "        E_final   = 0.5 * self.mass * v_final**2",
-            "        print(f\"\\nEnergy: initial={E_initial:.2f} J, final={E_final:.2f} J\")",
-            "",
-            "",
-            "# Run simulation",
-            'if __name__ == "__main__":',
-            "    sim = PhysicsSimulator(mass=1.0)",
-            "    ",
-        ]
+    def pseudo_slots(ir) -> tuple:
+        return ()
 
-        # FIX: re.findall returns strings; must cast to float before embedding in
-        # the generated call — otherwise the generated code passes string literals
-        # to projectile_motion() which then fails on np.cos("20") etc.
-        numbers = re.findall(r"\d+\.?\d*", ir.raw_text)
-        if len(numbers) >= 1:
-            v0 = float(numbers[0])
-            angle = float(numbers[1]) if len(numbers) >= 2 else 45.0
-        else:
-            v0, angle = 20.0, 45.0
+    @classmethod
+    def render_pseudo(cls) -> str:
+        return cls.PSEUDO.render()
 
-        code.append(f"    # Simulate projectile: v0={v0} m/s at {angle}°")
-        code.append(f"    positions, velocities, time = sim.projectile_motion(v0={v0}, angle_deg={angle})")
-        code += [
-            "    ",
-            "    sim.analyze_motion(positions, velocities, time)",
-            "    ",
-            "    # Optional: uncomment to plot trajectory",
-            "    # plt.plot(positions[:, 0], positions[:, 1])",
-            "    # plt.xlabel('Distance (m)')",
-            "    # plt.ylabel('Height (m)')",
-            "    # plt.title('Projectile Trajectory')",
-            "    # plt.grid(True)",
-            "    # plt.show()",
-        ]
+    @staticmethod
+    def python_slots(ir) -> tuple:
+        # FIX: values must be floats before embedding in the generated call —
+        # otherwise the generated code passes string literals to
+        # projectile_motion() which then fails on np.cos("20") etc.
+        return (ir.raw_text, *PhysicsGenerator.launch_parameters(ir))
 
-        return "\n".join(code)
+    @classmethod
+    def render_python(cls, raw_text: str, v0: float, angle: float) -> str:
+        return cls.PYTHON.render(raw_text=raw_text, v0=v0, angle=angle)
 
 
 if __name__ == "__main__":
-    from ir import IntermediateRepresentation
+    from ir import IntermediateRepresentation, State
 
     ir = IntermediateRepresentation(
         raw_text="A ball is thrown at 20 m/s at a 45 degree angle.",
         category="physics",
+        states=[State(variable="velocity", value=20.0, unit="m/s", span=(5, 9)),
+                State(variable="angle", value=45.0, unit="deg", span=(11, 13))],
     )
 
     gen = PhysicsGenerator()
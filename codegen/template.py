@@ -0,0 +1,107 @@
+"""
+codegen/template.py - Code templates compiled once into static text plus slots
+
+A Template is written as the list of lines it renders, with ${name} marking a
+slot. A line that is nothing but a slot is a *line slot*: its value is a
+sequence of whole lines spliced in at that point (none removes the line). Any
+other ${name} is an inline slot whose value is formatted like an f-string
+field. On creation the lines are compiled into a render function that joins
+the static chunks (the text between slots, newlines included) and the slot
+values in a single expression, so no per-call list of literals is built.
+
+    PSEUDO = Template([
+        "// Scenario: ${raw_text}",
+        "${entity_lines}",
+        "Done",
+    ])
+    PSEUDO.render(raw_text=ir.raw_text, entity_lines=["  Entities: Alice"])
+"""
+import re
+from typing import Callable, Sequence
+
+_SLOT = re.compile(r"\$\{(\w+)\}")
+
+
+def _lines(lines: Sequence[str]) -> str:
+    """A line slot's value: each line with its leading newline"""
+    return "\n" + "\n".join(lines) if lines else ""
+
+
+class Template:
+    """Lines with ${name} slots, compiled to a render(**values) function"""
+
+    __slots__ = ("lines", "slots", "render")
+
+    def __init__(self, lines: Sequence[str]):
+        self.lines = tuple(lines)
+        # Even items of terms are static text, odd ones slot expressions
+        terms = [""]
+        slots = {}
+        for number, line in enumerate(self.lines):
+            newline = "\n" if number else ""
+            slot = _SLOT.fullmatch(line)
+            if slot is not None:
+                if number == 0:
+                    raise ValueError("a template cannot start with a line slot")
+                # Rendered lines carry their own leading newlines (see _lines)
+                slots[slot.group(1)] = None
+                terms += [f"_lines({slot.group(1)})", ""]
+                continue
+            # split() alternates static text and slot names
+            parts = _SLOT.split(line)
+            terms[-1] += newline + parts[0]
+            for name, text in zip(parts[1::2], parts[2::2]):
+                slots[name] = None
+                terms += [f'f"{{{name}}}"', text]
+        terms[::2] = [repr(text) for text in terms[::2]]
+        params = f"*, {', '.join(slots)}" if slots else ""
+        source = f"def render({params}):\n    return ''.join(({', '.join(terms)},))\n"
+        namespace = {"_lines": _lines}
+        exec(source, namespace)
+        self.render: Callable[..., str] = namespace["render"]
+        self.slots = tuple(slots)
+
+    def __repr__(self) -> str:
+        return f"Template({len(self.lines)} lines, slots={list(self.slots)})"
+
+
+class TemplateGenerator:
+    """
+    Base for generators built on PSEUDO and PYTHON templates.
+
+    <kind>_slots(ir) returns, as a tuple, the hashable values the output
+    depends on (by default just raw_text), and render_<kind>(*slots) renders
+    from them; CodeGeneratorRegistry caches render_<kind> results by slot
+    values, so work done in render_<kind> is skipped for repeated inputs.
+    The registry never calls generate_<kind> on these generators: customise
+    output through the slots and render methods.
+    """
+
+    PSEUDO: Template
+    PYTHON: Template
+
+    @staticmethod
+    def pseudo_slots(ir) -> tuple:
+        return (ir.raw_text,)
+
+    @staticmethod
+    def python_slots(ir) -> tuple:
+        return (ir.raw_text,)
+
+    @classmethod
+    def render_pseudo(cls, raw_text: str) -> str:
+        return cls.PSEUDO.render(raw_text=raw_text)
+
+    @classmethod
+    def render_python(cls, raw_text: str) -> str:
+        return cls.PYTHON.render(raw_text=raw_text)
+
+    @classmethod
+    def generate_pseudo(cls, ir) -> str:
+        """Generate pseudo-code for IR"""
+        return cls.render_pseudo(*cls.pseudo_slots(ir))
+
+    @classmethod
+    def generate_python(cls, ir) -> str:
+        """Generate Python code for IR"""
+        return cls.render_python(*cls.python_slots(ir))
@@ -0,0 +1,210 @@
+"""
+fast_parser.py - spaCy-free "fast" parse engine for keyword-level routing
+
+Fills ParsedFeatures from a regex tokenizer, a small lemma/suffix table and
+the shared keyword tables in text_parser. No model is loaded and spaCy is
+never imported, so start-up is instant and a parse takes microseconds.
+
+What it cannot do: objects, relations and conditions need a dependency parse
+and stay empty; actions come from a verb lexicon instead of a tagger, and
+actors are capitalised words rather than NER entities. That is enough for
+CategoryRouter.route and IRBuilder.build.
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from text_parser import (ParsedFeatures, TextParser, KEYWORD_INDEX, DOMAIN_PHRASES,
+                         DOMAIN_FIELDS, NUMBER_WORDS, PARSER_VERSION, match_quantities)
+from text_parser import INTENT_WORDS as _INTENT_WORDS
+
+
+ENGINE_VERSION = "1"
+
+# Words, numbers (with decimals), or any other single non-space character
+_TOKEN_RE = re.compile(r"[A-Za-z]+(?:[-'][A-Za-z]+)*|\d+(?:\.\d+)?|\S")
+
+MODALS = frozenset({"can", "could", "may", "might", "must", "shall", "should", "will", "would"})
+INTENT_WORDS = frozenset(_INTENT_WORDS)
+DETERMINERS = frozenset({"a", "an", "the", "this", "that", "these", "those", "his", "her",
+                         "its", "their", "our", "my", "your", "some", "any", "every", "each"})
+# Capitalised only because they start a sentence — never taken as actor names
+FUNCTION_WORDS = DETERMINERS | MODALS | frozenset({
+    "i", "we", "you", "he", "she", "they", "it", "someone", "somebody", "everyone", "people",
+    "if", "when", "while", "after", "before", "because", "as", "so", "then", "and", "but", "or",
+    "in", "on", "at", "to", "for", "with", "from", "of", "by", "about", "there", "here",
+    "what", "why", "how", "who", "which", "where", "find", "no", "not", "all",
+})
+
+# Irregular inflections the suffix rules would get wrong
+IRREGULAR_LEMMAS: Dict[str, str] = {
+    "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "am": "be",
+    "has": "have", "had": "have", "does": "do", "did": "do", "done": "do",
+    "made": "make", "went": "go", "gone": "go", "goes": "go", "ran": "run",
+    "fell": "fall", "fallen": "fall", "threw": "throw", "thrown": "throw",
+    "took": "take", "taken": "take", "gave": "give", "given": "give",
+    "felt": "feel", "thought": "think", "built": "build", "won": "win",
+    "lost": "lose", "got": "get", "saw": "see", "seen": "see", "said": "say",
+    "found": "find", "knew": "know", "known": "know", "grew": "grow", "drove": "drive",
+    "overcame": "overcome", "chose": "choose", "chosen": "choose", "began": "begin",
+}
+
+# Verb lemmas recognised as actions: common verbs plus the router's verb keywords
+VERBS = frozenset({
+    "act", "add", "affect", "allow", "approach", "ask", "avoid", "be", "become", "begin",
+    "believe", "build", "buy", "calculate", "change", "choose", "click", "compete",
+    "compute", "conform", "create", "decide", "define", "design", "discuss", "display",
+    "do", "drive", "earn", "enhance", "evaluate", "fall", "feel", "find", "flex", "follow",
+    "gain", "get", "give", "go", "grow", "have", "help", "impress", "improve", "increase",
+    "influence", "keep", "know", "learn", "leave", "lose", "make", "maximize", "measure",
+    "minimize", "move", "need", "optimize", "overcome", "pay", "play", "predict", "pull",
+    "push", "reach", "reduce", "refine", "ring", "rise", "rotate", "run", "say", "see",
+    "sell", "show", "solve", "spin", "spread", "streamline", "take", "teach", "test",
+    "think", "throw", "train", "trust", "try", "turn", "use", "walk", "want", "weigh", "win",
+})
+
+# Multi-word phrases as lowercase token tuples → domains. Hyphenated phrases
+# ("self-esteem") are single tokens here and join the per-word index instead.
+_PHRASE_INDEX: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_WORD_INDEX: Dict[str, Tuple[str, ...]] = dict(KEYWORD_INDEX)
+for _domain, _phrases in DOMAIN_PHRASES.items():
+    for _phrase in _phrases:
+        _key = tuple(_TOKEN_RE.findall(_phrase.lower()))
+        if len(_key) == 1:
+            _WORD_INDEX[_key[0]] = _WORD_INDEX.get(_key[0], ()) + (_domain,)
+        else:
+            _PHRASE_INDEX[_key] = _PHRASE_INDEX.get(_key, ()) + (_domain,)
+_MAX_PHRASE = max((len(key) for key in _PHRASE_INDEX), default=1)
+
+
+def lemmatize(word: str) -> str:
+    """Lowercase lemma from the irregular table or simple suffix rules"""
+    word = word.lower()
+    if word in IRREGULAR_LEMMAS:
+        return IRREGULAR_LEMMAS[word]
+    if word in VERBS or len(word) <= 3:
+        return word
+    for suffix, replacements in (("ies", ("y",)), ("ied", ("y",)), ("es", ("", "e")),
+                                 ("s", ("",)), ("ed", ("", "e")), ("ing", ("", "e"))):
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            for replacement in replacements:
+                if stem + replacement in VERBS:
+                    return stem + replacement
+            # Doubled final consonant: stopped → stop, running → run
+            if suffix in ("ed", "ing") and len(stem) > 2 and stem[-1] == stem[-2]:
+                if stem[:-1] in VERBS:
+                    return stem[:-1]
+    return word
+
+
+class FastParser:
+    """Drop-in for TextParser when only keywords and the category matter"""
+
+    profile = "pos"
+
+    def __init__(self, cache=None):
+        self.nlp = None
+        self.cache = cache
+
+    @property
+    def cache_namespace(self) -> str:
+        # The keyword tables are shared with TextParser, so its version counts too
+        return f"fast-{ENGINE_VERSION}-v{PARSER_VERSION}"
+
+    def parse(self, text: str) -> ParsedFeatures:
+        """Parse text and extract structured features"""
+        if self.cache is None:
+            return self._extract(text)
+        features = self.cache.get(self.cache_namespace, text)
+        if features is None:
+            features = self._extract(text)
+            self.cache.put(self.cache_namespace, text, features)
+        return features
+
+    def parse_many(self, texts: Iterable[str], batch_size: int = 64,
+                   n_process: int = 1) -> Iterator[ParsedFeatures]:
+        """Same interface as TextParser.parse_many; batching buys nothing here"""
+        for text in texts:
+            yield self.parse(text)
+
+    # Chunked streaming only needs parse_many, so TextParser's version applies as is
+    parse_stream = TextParser.parse_stream
+
+    def _extract(self, text: str) -> ParsedFeatures:
+        spans = [match.span() for match in _TOKEN_RE.finditer(text)]
+        tokens = [text[start:end] for start, end in spans]
+        lowered = [tok.lower() for tok in tokens]
+
+        actions: List[str] = []
+        actors: List[str] = []
+        intents: List[str] = []
+        modal_count = 0
+        domain_signals: Dict[str, List[str]] = {}
+
+        previous = ""
+        i = 0
+        while i < len(tokens):
+            tok, low = tokens[i], lowered[i]
+
+            # Longest phrase first; a phrase absorbs the words inside it
+            matched = 0
+            for size in range(min(_MAX_PHRASE, len(tokens) - i), 1, -1):
+                domains = _PHRASE_INDEX.get(tuple(lowered[i:i + size]))
+                if domains:
+                    phrase = text[spans[i][0]:spans[i + size - 1][1]]
+                    for domain in domains:
+                        domain_signals.setdefault(domain, []).append(phrase)
+                    matched = size
+                    break
+            if matched:
+                previous = lowered[i + matched - 1]
+                i += matched
+                continue
+
+            domains = _WORD_INDEX.get(low)
+            if domains:
+                for domain in domains:
+                    domain_signals.setdefault(domain, []).append(tok)
+
+            if low in MODALS:
+                modal_count += 1
+            if low in INTENT_WORDS:
+                intents.append(tok)
+            if tok[0].isalpha():
+                lemma = lemmatize(low)
+                if lemma in VERBS and previous not in DETERMINERS and low not in MODALS:
+                    actions.append(lemma)
+                elif (tok[0].isupper() and not tok.isupper()
+                      and low not in _WORD_INDEX and low not in FUNCTION_WORDS):
+                    actors.append(tok)
+            previous = low
+            i += 1
+
+        quantities = match_quantities(
+            text,
+            ((i, start, end) for i, (start, end) in enumerate(spans)
+             if text[start].isdigit() or lowered[i] in NUMBER_WORDS),
+            [start for start, _ in spans],
+        )
+
+        signals = {attr: domain_signals.get(domain, []) for domain, attr in DOMAIN_FIELDS.items()}
+        return ParsedFeatures(
+            actors=actors,
+            actions=actions,
+            intents=intents,
+            uncertainty=min(modal_count / max(len(tokens), 1) * 5, 1.0),
+            token_count=len(tokens),
+            modal_count=modal_count,
+            quantities=quantities,
+            domain_signals=domain_signals,
+            raw_text=text,
+            **signals,
+        )
+
+
+if __name__ == "__main__":
+    parser = FastParser()
+    for sample in ("Alice wants to impress her coworkers with high self-esteem.",
+                   "A ball falls due to gravity with acceleration.",
+                   "AI algorithms optimize cloud network performance."):
+        print(parser.parse(sample))
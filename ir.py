@@ -1,10 +1,19 @@
 """
 ir.py - Intermediate Representation (IR) Builder
 """
-import re
+import hashlib
 import json
-from typing import List, Dict, Any, Optional
+import marshal
+import sys
+from itertools import chain
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple, Mapping
+
+import numpy as np
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
+
+from text_parser import RELATION_CODES, RELATION_LABELS
 
 
 class Entity(BaseModel):
@@ -28,6 +37,9 @@ class Relation(BaseModel):
     relation_type: str
     target: str
     strength: float = 1.0
+    # Token indices in raw_text, when the relation came from a dependency parse
+    source_index: Optional[int] = None
+    target_index: Optional[int] = None
 
 
 class State(BaseModel):
@@ -35,6 +47,21 @@ class State(BaseModel):
     variable: str
     value: Any
     unit: Optional[str] = None
+    # Token span (start, end) in raw_text the value was read from, if any
+    span: Optional[Tuple[int, int]] = None
+
+
+# Physical quantity named by each canonical unit (see text_parser.UNIT_ALIASES)
+UNIT_VARIABLES: Dict[str, str] = {
+    "m/s": "velocity", "km/h": "velocity", "mph": "velocity",
+    "m/s^2": "acceleration",
+    "m": "distance", "km": "distance", "cm": "distance", "mm": "distance",
+    "kg": "mass", "g": "mass",
+    "s": "time", "ms": "time", "min": "time", "h": "time",
+    "deg": "angle", "rad": "angle",
+    "N": "force", "J": "energy", "W": "power", "Hz": "frequency",
+    "%": "percentage", "USD": "amount",
+}
 
 
 class Goal(BaseModel):
@@ -51,6 +78,15 @@ class Rule(BaseModel):
     priority: int = 1
 
 
+# to_bytes() layout: magic, a format version byte, then the marshal format
+# version and the Python major/minor version (marshal data is only readable
+# by the CPython release that wrote it), then a marshal payload of
+# the body tuple. Bump the format version whenever the body changes.
+IR_MAGIC = b"WIR"
+IR_FORMAT_VERSION = 2
+IR_HEADER = IR_MAGIC + bytes((IR_FORMAT_VERSION, marshal.version, *sys.version_info[:2]))
+
+
 class IntermediateRepresentation(BaseModel):
     """
     Language-agnostic intermediate representation of a scenario
@@ -78,13 +114,39 @@ class IntermediateRepresentation(BaseModel):
     # Domain-specific enrichments
     psychology_vars: Dict[str, float] = Field(default_factory=dict)
     social_vars: Dict[str, float] = Field(default_factory=dict)
-    physics_vars: Dict[str, float] = Field(default_factory=dict)
+    # Any, not float: physics stores the list of extracted quantity values
+    physics_vars: Dict[str, Any] = Field(default_factory=dict)
     math_vars: Dict[str, Any] = Field(default_factory=dict)
     philosophy_vars: Dict[str, float] = Field(default_factory=dict)
     optimization_vars: Dict[str, Any] = Field(default_factory=dict)
     game_vars: Dict[str, Any] = Field(default_factory=dict)
     business_vars: Dict[str, Any] = Field(default_factory=dict)
 
+    def state(self, variable: str) -> Optional[State]:
+        """First state entry named variable, or None"""
+        return next((s for s in self.states if s.variable == variable), None)
+
+    def relation_array(self) -> np.ndarray:
+        """(n, 3) int32 array of (source token, RELATION_LABELS code, target token)"""
+        rows = [(r.source_index, RELATION_CODES[r.relation_type], r.target_index)
+                for r in self.relations if r.source_index is not None]
+        return np.array(rows, dtype=np.int32).reshape(-1, 3)
+
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Relation graph over the tokens that take part in a relation.
+
+        Returns (nodes, matrix): nodes holds sorted token indices and
+        matrix[i, j] is the label code + 1 of the edge nodes[i] → nodes[j],
+        0 where there is none. Label codes index RELATION_LABELS.
+        """
+        triples = self.relation_array()
+        nodes = np.unique(triples[:, [0, 2]])
+        matrix = np.zeros((len(nodes), len(nodes)), dtype=np.int8)
+        matrix[np.searchsorted(nodes, triples[:, 0]),
+               np.searchsorted(nodes, triples[:, 2])] = triples[:, 1] + 1
+        return nodes, matrix
+
     def to_json(self) -> str:
         """Convert IR to JSON string"""
         return self.model_dump_json(indent=2)
@@ -99,139 +161,406 @@ class IntermediateRepresentation(BaseModel):
         }
         return json.dumps(compact, indent=2)
 
+    def fingerprint(self, version: str = "") -> str:
+        """
+        Stable content hash of every field plus version (normally the
+        generator registry's version): equal IRs get equal fingerprints, so
+        generated artifacts can be stored under it (see result_store.py).
+        """
+        canonical = json.dumps([version, self.model_dump()], sort_keys=True,
+                               separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary encoding, for caches and inter-process transfer.
+
+        Models become positional tuples in a marshal payload. marshal writes
+        a str object it has already seen as a back-reference, so names, verbs
+        and units shared between models are stored once. Free-form values
+        (properties, *_vars, State.value) are marshalled as they are.
+        from_bytes() restores an equal IR.
+        """
+        body = (
+            tuple((e.name, e.type, e.properties) for e in self.entities),
+            tuple((a.verb, a.actor, a.target, tuple(a.modifiers)) for a in self.actions),
+            tuple((r.source, r.relation_type, r.target, r.strength, r.source_index, r.target_index)
+                  for r in self.relations),
+            tuple((s.variable, s.value, s.unit, s.span) for s in self.states),
+            tuple((g.description, g.target, g.success_criteria) for g in self.goals),
+            tuple((r.condition, r.action, r.priority) for r in self.rules),
+            self.environment,
+            tuple(self.assumptions),
+            self.uncertainty,
+            self.category,
+            self.confidence,
+            self.raw_text,
+            self.detail,
+            self.psychology_vars, self.social_vars, self.physics_vars, self.math_vars,
+            self.philosophy_vars, self.optimization_vars, self.game_vars, self.business_vars,
+        )
+        return IR_HEADER + marshal.dumps(body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IntermediateRepresentation":
+        """
+        Decode to_bytes() output. ValueError for foreign or truncated data and
+        for data written with another format, marshal or Python version.
+        """
+        header = data[:len(IR_HEADER)]
+        if len(header) < len(IR_HEADER) or header[:len(IR_MAGIC)] != IR_MAGIC:
+            raise ValueError("not a serialized IntermediateRepresentation")
+        if header != IR_HEADER:
+            version, marshal_version, major, minor = header[len(IR_MAGIC):]
+            raise ValueError(f"IR written with format {version}, marshal {marshal_version}, "
+                             f"Python {major}.{minor}; this reads format {IR_FORMAT_VERSION}, "
+                             f"marshal {marshal.version}, Python {sys.version_info[0]}."
+                             f"{sys.version_info[1]}")
+        try:
+            body = marshal.loads(data[len(IR_HEADER):])
+        except (EOFError, TypeError) as error:
+            raise ValueError(f"corrupt IR payload: {error}") from None
+        (entities, actions, relations, states, goals, rules, environment, assumptions,
+         uncertainty, category, confidence, raw_text, detail, *domain_vars) = body
+        make_ir, make_entity, make_action, make_relation, make_state = _TRUSTED
+        return make_ir(
+            entities=[make_entity(name=name, type=kind, properties=properties)
+                      for name, kind, properties in entities],
+            actions=[make_action(verb=verb, actor=actor, target=target, modifiers=list(modifiers))
+                     for verb, actor, target, modifiers in actions],
+            relations=[make_relation(source=source, relation_type=kind, target=target,
+                                     strength=strength, source_index=source_index,
+                                     target_index=target_index)
+                       for source, kind, target, strength, source_index, target_index in relations],
+            states=[make_state(variable=variable, value=value, unit=unit, span=span)
+                    for variable, value, unit, span in states],
+            goals=[Goal.model_construct(description=description, target=target,
+                                        success_criteria=criteria)
+                   for description, target, criteria in goals],
+            rules=[Rule.model_construct(condition=condition, action=action, priority=priority)
+                   for condition, action, priority in rules],
+            environment=environment,
+            assumptions=list(assumptions),
+            uncertainty=uncertainty,
+            category=category,
+            confidence=confidence,
+            raw_text=raw_text,
+            detail=detail,
+            **dict(zip(_DOMAIN_VARS, domain_vars)),
+        )
+
+
+def trusted_constructor(model):
+    """
+    Validation-free constructor for model, for data that is known to be valid.
+
+    Does what model.model_construct() does for these plain models (no aliases,
+    extras or private attributes) without its per-call field loop, and keeps
+    the fields in declaration order: model_construct() puts the given fields
+    first, which would reorder model_dump() and so the JSON output.
+    """
+    # Required fields are always given, so they only hold a slot (in order) here
+    template = {name: None if field.default is PydanticUndefined else field.default
+                for name, field in model.model_fields.items()}
+    factories = [(name, field.default_factory)
+                 for name, field in model.model_fields.items() if field.default_factory]
+    new, set_attr = model.__new__, object.__setattr__
+
+    def construct(**values):
+        instance = new(model)
+        data = template.copy()
+        data.update(values)  # existing keys: declaration order is kept
+        for name, factory in factories:
+            if name not in values:
+                data[name] = factory()
+        set_attr(instance, "__dict__", data)
+        set_attr(instance, "__pydantic_fields_set__", set(values))
+        set_attr(instance, "__pydantic_extra__", None)
+        set_attr(instance, "__pydantic_private__", None)
+        return instance
+    return construct
+
+
+# (entities, actions, relations, states) as IRBuilder.items() returns them
+IRItems = Tuple[List[Entity], List[Action], List[Relation], List[State]]
+
+
+class CategoryBuilder:
+    """
+    Per-category IR enrichment: a fixed assumption tuple plus a template
+    for one of the IR's *_vars dicts, both frozen when the builder is made.
+
+    Subclasses override domain_vars() when the variables depend on the parse.
+    """
+
+    def __init__(self, assumptions: Tuple[str, ...], var_field: Optional[str] = None,
+                 variables: Optional[Mapping[str, Any]] = None):
+        self.assumptions = tuple(assumptions)
+        self.var_field = var_field
+        self.variables: Mapping[str, Any] = MappingProxyType(dict(variables or {}))
+
+    def domain_vars(self, features) -> Mapping[str, Any]:
+        """Variables for var_field (copied into the IR); the template by default"""
+        return self.variables
+
+
+class PsychologyBuilder(CategoryBuilder):
+    """Sets each variable whose trigger words the parser found"""
+
+    # variable: (value, trigger words); read from the words of psychology_signals
+    # (phrases such as "fear of rejection" included), intents and action
+    # lemmas, so "wants" and "desires" count as well
+    TRIGGERS: Dict[str, Tuple[float, frozenset]] = {
+        "confidence_level": (0.7, frozenset({"confidence"})),
+        "desire_strength":  (0.8, frozenset({"desire", "want"})),
+        "anxiety_level":    (0.6, frozenset({"fear", "anxiety"})),
+    }
+
+    def domain_vars(self, features) -> Mapping[str, Any]:
+        words = {word for signal in features.psychology_signals
+                 for word in signal.lower().split()}
+        words.update(word.lower() for word in chain(features.intents, features.actions))
+        return {name: value for name, (value, triggers) in self.TRIGGERS.items()
+                if not triggers.isdisjoint(words)}
+
+
+class PhysicsBuilder(CategoryBuilder):
+    """Records the parsed quantities' values"""
+
+    def domain_vars(self, features) -> Mapping[str, Any]:
+        # FIX: store extracted values as float, not raw string list
+        if features.quantities:
+            return {"extracted_values": [q.value for q in features.quantities]}
+        return self.variables
+
+
+class PhilosophyBuilder(CategoryBuilder):
+    """Uses the template only when philosophy signals were found"""
+
+    def domain_vars(self, features) -> Mapping[str, Any]:
+        return self.variables if features.philosophy_signals else {}
+
+
+# Category name → builder; IRBuilder falls back to GENERIC_BUILDER
+CATEGORY_BUILDERS: Dict[str, CategoryBuilder] = {}
+
+
+def register_category(category: str, builder: CategoryBuilder) -> None:
+    """Register (or replace) the IR enrichment for a category"""
+    CATEGORY_BUILDERS[category.lower()] = builder
+
+
+GENERIC_BUILDER = CategoryBuilder((
+    "Inputs map to outputs via a defined process",
+    "State transitions are deterministic unless specified",
+))
+
+register_category("psychology", PsychologyBuilder((
+    "Actors have internal mental states",
+    "Behavior is driven by psychological motivations",
+    "Emotions and cognitions influence actions",
+), "psychology_vars"))
+
+register_category("social", CategoryBuilder((
+    "Social interactions follow group dynamics",
+    "Peer influence affects individual behavior",
+    "Social proof can create cascading effects",
+), "social_vars", {"group_influence": 0.7, "social_proof_sensitivity": 0.6}))
+
+register_category("physics", PhysicsBuilder((
+    "Physical laws govern motion and forces",
+    "Conservation principles apply",
+    "Continuous or discrete time evolution",
+), "physics_vars"))
+
+register_category("mathematics", CategoryBuilder((
+    "Mathematical operations are precise",
+    "Functions are well-defined",
+    "Solutions exist within constraints",
+)))
+
+register_category("philosophy", PhilosophyBuilder((
+    "Abstract concepts have logical structure",
+    "Harmony and balance are measurable",
+    "Paradoxes may be intentional",
+), "philosophy_vars", {"harmony_index": 0.8, "paradox_tolerance": 0.7}))
+
+# FIX: these categories had no handling at all — program fell through to
+# an empty IR with no assumptions, silently producing useless output.
+register_category("optimization", CategoryBuilder((
+    "An objective function can be defined",
+    "Constraints bound the feasible region",
+    "A global or local optimum exists",
+), "optimization_vars", {"objective": "maximize", "constraint_count": 0}))
+
+register_category("game", CategoryBuilder((
+    "Players act rationally to maximise their payoff",
+    "Game state transitions are well-defined",
+    "Win/loss conditions are deterministic",
+), "game_vars", {"player_count": 2, "turn_based": True}))
+
+register_category("business", CategoryBuilder((
+    "Profit = revenue − costs",
+    "Market forces influence pricing",
+    "Strategy is constrained by resources",
+), "business_vars", {"revenue": 0.0, "cost": 0.0}))
+
+register_category("ui", CategoryBuilder((
+    "User interactions trigger state changes",
+    "UI components react to events",
+    "Accessibility and responsiveness matter",
+)))
+
+register_category("rules", CategoryBuilder((
+    "Rules are evaluated in priority order",
+    "Conditions are boolean expressions",
+    "Actions execute when conditions are met",
+)))
+
+for _cat in ("technology", "biology", "art"):
+    register_category(_cat, CategoryBuilder((
+        f"Domain-specific knowledge governs {_cat} reasoning",
+        "Patterns can be abstracted into code structures",
+    )))
+
 
 class IRBuilder:
-    """Builds IR from parsed features"""
+    """
+    Builds IR from parsed features.
+
+    Features come from our own parser and already have the right types, so by
+    default the models are created through trusted_constructor(), skipping
+    pydantic validation. validate=True builds them through the normal constructors
+    (e.g. for features from an untrusted source); the IR is the same either way.
+    """
 
-    def build(self, features, category_score,
-              detail: str = "med") -> IntermediateRepresentation:
-        """Construct IR from parsed features and category"""
-        ir = IntermediateRepresentation(
+    def __init__(self, validate: bool = False):
+        self.validate = validate
+
+    def _constructors(self) -> tuple:
+        if self.validate:
+            return IntermediateRepresentation, Entity, Action, Relation, State
+        return _TRUSTED
+
+    def build(self, features, category_score, detail: str = "med",
+              items: Optional[IRItems] = None) -> IntermediateRepresentation:
+        """
+        Construct IR from parsed features and category.
+
+        items, when given, are prebuilt (entities, actions, relations, states)
+        lists used as they are; see IncrementalSession, which reuses the
+        models of unchanged sentences.
+        """
+        # Per-category assumptions & domain vars, copied from frozen templates
+        enrich = CATEGORY_BUILDERS.get(category_score.name, GENERIC_BUILDER)
+        extra: Dict[str, Any] = {"assumptions": list(enrich.assumptions)}
+        variables = enrich.domain_vars(features)
+        if variables:
+            extra[enrich.var_field] = dict(variables)
+
+        if items is None:
+            items = self.items(features)
+        entities, actions, relations, states = items
+        return self._constructors()[0](
             raw_text=features.raw_text,
             category=category_score.name,
             confidence=category_score.confidence,
             uncertainty=features.uncertainty,
             detail=detail,
+            entities=entities,
+            actions=actions,
+            relations=relations,
+            states=states,
+            **extra,
         )
 
-        # Extract entities
-        for actor in features.actors:
-            ir.entities.append(Entity(name=actor, type="person", properties={}))
-
-        # Extract actions
-        for action_verb in features.actions:
-            ir.actions.append(Action(verb=action_verb, modifiers=[]))
-
-        # ── Per-category assumptions & domain vars ────────────────────────────
-        cat = category_score.name
-
-        if cat == "psychology":
-            ir.assumptions.extend([
-                "Actors have internal mental states",
-                "Behavior is driven by psychological motivations",
-                "Emotions and cognitions influence actions",
-            ])
-            text_lower = features.raw_text.lower()
-            if "confidence" in text_lower:
-                ir.psychology_vars["confidence_level"] = 0.7
-            if "desire" in text_lower or "want" in text_lower:
-                ir.psychology_vars["desire_strength"] = 0.8
-            if "fear" in text_lower or "anxiety" in text_lower:
-                ir.psychology_vars["anxiety_level"] = 0.6
-
-        elif cat == "social":
-            ir.assumptions.extend([
-                "Social interactions follow group dynamics",
-                "Peer influence affects individual behavior",
-                "Social proof can create cascading effects",
-            ])
-            ir.social_vars["group_influence"] = 0.7
-            ir.social_vars["social_proof_sensitivity"] = 0.6
-
-        elif cat == "physics":
-            ir.assumptions.extend([
-                "Physical laws govern motion and forces",
-                "Conservation principles apply",
-                "Continuous or discrete time evolution",
-            ])
-            # FIX: store extracted values as float, not raw string list
-            numbers = re.findall(r"\d+\.?\d*", features.raw_text)
-            if numbers:
-                ir.physics_vars["extracted_values"] = [float(n) for n in numbers]
-
-        elif cat == "mathematics":
-            ir.assumptions.extend([
-                "Mathematical operations are precise",
-                "Functions are well-defined",
-                "Solutions exist within constraints",
-            ])
-
-        elif cat == "philosophy":
-            ir.assumptions.extend([
-                "Abstract concepts have logical structure",
-                "Harmony and balance are measurable",
-                "Paradoxes may be intentional",
-            ])
-            if features.philosophy_signals:
-                ir.philosophy_vars["harmony_index"] = 0.8
-                ir.philosophy_vars["paradox_tolerance"] = 0.7
-
-        # FIX: these categories had no handling at all — program fell through to
-        # an empty IR with no assumptions, silently producing useless output.
-        elif cat == "optimization":
-            ir.assumptions.extend([
-                "An objective function can be defined",
-                "Constraints bound the feasible region",
-                "A global or local optimum exists",
-            ])
-            ir.optimization_vars["objective"] = "maximize"
-            ir.optimization_vars["constraint_count"] = 0
-
-        elif cat == "game":
-            ir.assumptions.extend([
-                "Players act rationally to maximise their payoff",
-                "Game state transitions are well-defined",
-                "Win/loss conditions are deterministic",
-            ])
-            ir.game_vars["player_count"] = 2
-            ir.game_vars["turn_based"] = True
-
-        elif cat == "business":
-            ir.assumptions.extend([
-                "Profit = revenue − costs",
-                "Market forces influence pricing",
-                "Strategy is constrained by resources",
-            ])
-            ir.business_vars["revenue"] = 0.0
-            ir.business_vars["cost"] = 0.0
-
-        elif cat == "ui":
-            ir.assumptions.extend([
-                "User interactions trigger state changes",
-                "UI components react to events",
-                "Accessibility and responsiveness matter",
-            ])
-
-        elif cat == "rules":
-            ir.assumptions.extend([
-                "Rules are evaluated in priority order",
-                "Conditions are boolean expressions",
-                "Actions execute when conditions are met",
-            ])
-
-        elif cat in ("technology", "biology", "art"):
-            ir.assumptions.extend([
-                f"Domain-specific knowledge governs {cat} reasoning",
-                "Patterns can be abstracted into code structures",
-            ])
-
-        else:  # generic fallback
-            ir.assumptions.extend([
-                "Inputs map to outputs via a defined process",
-                "State transitions are deterministic unless specified",
-            ])
-
-        return ir
+    def items(self, features) -> IRItems:
+        """Every model list build() derives from features"""
+        return (self.entities(features), self.actions(features),
+                self.relations(features), self.states(features))
+
+    def entities(self, features) -> List[Entity]:
+        """Actors become person entities"""
+        make_entity = self._constructors()[1]
+        return [make_entity(name=actor, type="person", properties={}) for actor in features.actors]
+
+    def actions(self, features) -> List[Action]:
+        make_action = self._constructors()[2]
+        return [make_action(verb=verb, modifiers=[]) for verb in features.actions]
+
+    def relations(self, features, offset: int = 0) -> List[Relation]:
+        """
+        Dependency triples become relations between the token texts; offset
+        is added to the token indices (for features of a later sentence).
+        """
+        make_relation = self._constructors()[3]
+        tokens = features.relation_tokens
+        return [
+            make_relation(
+                source=tokens[head],
+                relation_type=RELATION_LABELS[code],
+                target=tokens[child],
+                source_index=head + offset,
+                target_index=child + offset,
+            )
+            for head, code, child in features.relations
+        ]
+
+    def states(self, features) -> List[State]:
+        """
+        Quantities become states named after what their unit measures;
+        repeats are numbered (velocity, velocity_2, ...)
+        """
+        make_state = self._constructors()[4]
+        return [make_state(variable=variable, value=value, unit=unit, span=span)
+                for variable, value, unit, span in state_rows(features.quantities)]
+
+    def build_batch(self, features_list, category_scores, detail: str = "med"):
+        """
+        Build many IRs straight into an ir_batch.IRBatch, without creating
+        a model per scenario; batch[i] equals build(features_list[i], ...).
+        """
+        from ir_batch import IRBatchWriter
+
+        writer = IRBatchWriter()
+        for features, category_score in zip(features_list, category_scores):
+            enrich = CATEGORY_BUILDERS.get(category_score.name, GENERIC_BUILDER)
+            variables = enrich.domain_vars(features)
+            tokens = features.relation_tokens
+            writer.add(
+                raw_text=features.raw_text,
+                category=category_score.name,
+                confidence=category_score.confidence,
+                uncertainty=features.uncertainty,
+                detail=detail,
+                entities=[(actor, "person") for actor in features.actors],
+                actions=features.actions,
+                relations=[(tokens[head], RELATION_LABELS[code], tokens[child], 1.0, head, child)
+                           for head, code, child in features.relations],
+                states=state_rows(features.quantities),
+                assumptions=enrich.assumptions,
+                domain_vars={enrich.var_field: variables} if variables else {},
+            )
+        return writer.finish()
+
+
+def state_rows(quantities):
+    """(variable, value, unit, span) per quantity, as IRBuilder names its states"""
+    seen: Dict[str, int] = {}
+    for quantity in quantities:
+        name = UNIT_VARIABLES.get(quantity.unit, "value")
+        seen[name] = seen.get(name, 0) + 1
+        yield (name if seen[name] == 1 else f"{name}_{seen[name]}",
+               quantity.value, quantity.unit, (quantity.start, quantity.end))
+
+
+# IRBuilder's validation-free constructors, in build()'s unpacking order
+_TRUSTED = tuple(trusted_constructor(model)
+                 for model in (IntermediateRepresentation, Entity, Action, Relation, State))
+
+# Domain variable dicts, in to_bytes() body order
+_DOMAIN_VARS = ("psychology_vars", "social_vars", "physics_vars", "math_vars",
+                "philosophy_vars", "optimization_vars", "game_vars", "business_vars")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,309 @@
+"""
+ir_batch.py - Struct-of-arrays container for large batches of IRs
+
+A pydantic IntermediateRepresentation costs kilobytes per scenario. IRBatch
+keeps a whole batch as NumPy columns instead:
+
+    raw_text, category, detail   int32 codes into one shared string table
+    confidence, uncertainty      float64, one value per scenario
+    entity_*, action_*, relation_*, state_*, assumption, var_*
+                                 one row per list item; scenario i owns rows
+                                 <kind>_offsets[i]:<kind>_offsets[i + 1]
+
+Fields IRBuilder never fills (goals, rules, environment, entity properties,
+action actors/targets/modifiers) are kept as models in `extras`, only for the
+scenarios that have them. batch[i] builds an IntermediateRepresentation on
+demand; analytics read the columns directly:
+
+    batch = IRBuilder().build_batch(features_list, scores)
+    batch.category_counts()
+    np.histogram(batch.confidence, bins=10)
+"""
+import copy
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ir import IntermediateRepresentation, _DOMAIN_VARS, _TRUSTED
+
+# Column name → array typecode while accumulating (i: int32, d: float64, b: int8)
+_COLUMNS = {
+    "raw_text": "i", "category": "i", "detail": "i", "confidence": "d", "uncertainty": "d",
+    "entity_name": "i", "entity_type": "i",
+    "action_verb": "i",
+    "relation_source": "i", "relation_type": "i", "relation_target": "i",
+    "relation_strength": "d", "relation_source_index": "i", "relation_target_index": "i",
+    "state_variable": "i", "state_value": "d", "state_unit": "i", "state_start": "i",
+    "state_end": "i",
+    "assumption": "i",
+    # var_field indexes ir._DOMAIN_VARS; values are mixed types (IRBatch.var_values)
+    "var_field": "b", "var_key": "i",
+}
+_DTYPES = {"i": np.int32, "d": np.float64, "b": np.int8}
+
+# List kinds, each with a <kind>_offsets column
+_LISTS = ("entity", "action", "relation", "state", "assumption", "var")
+
+# Scenario-level fields beyond the columns that IRBatch can still hold in extras
+_EXTRA_FIELDS = ("goals", "rules", "environment")
+
+
+def _fresh(value):
+    """Views get their own copies of mutable values"""
+    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+
+class IRBatch:
+    """
+    Column store for many IRs; see the module docstring for the layout.
+
+    Build one with IRBuilder.build_batch() or IRBatch.from_irs(). Columns
+    are in self.columns; the scalar ones are also attributes.
+    """
+
+    def __init__(self, strings: List[str], columns: Dict[str, np.ndarray],
+                 var_values: List[Any], extras: Dict[int, Dict[str, Any]]):
+        self.strings = strings
+        self.columns = columns
+        self.var_values = var_values
+        self.extras = extras
+
+    @classmethod
+    def from_irs(cls, irs: Iterable[IntermediateRepresentation]) -> "IRBatch":
+        """Pack existing IR models"""
+        writer = IRBatchWriter()
+        for ir in irs:
+            writer.add_ir(ir)
+        return writer.finish()
+
+    # Scalar columns, one value per scenario
+    @property
+    def category(self) -> np.ndarray:
+        """int32 codes into strings; see category_counts() and decode()"""
+        return self.columns["category"]
+
+    @property
+    def confidence(self) -> np.ndarray:
+        return self.columns["confidence"]
+
+    @property
+    def uncertainty(self) -> np.ndarray:
+        return self.columns["uncertainty"]
+
+    @property
+    def detail(self) -> np.ndarray:
+        return self.columns["detail"]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns (not the string table or extras)"""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def __len__(self) -> int:
+        return len(self.columns["category"])
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """String-table codes → object array of str (-1 → None)"""
+        table = np.array(self.strings + [None], dtype=object)
+        return table[codes]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Scenarios per category, most frequent first"""
+        codes, counts = np.unique(self.category, return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        return {self.strings[code]: int(count)
+                for code, count in zip(codes[order].tolist(), counts[order].tolist())}
+
+    def __iter__(self) -> Iterator[IntermediateRepresentation]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> IntermediateRepresentation:
+        """Build scenario index as an IntermediateRepresentation (a new object each call)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IRBatch index out of range")
+        make_ir, make_entity, make_action, make_relation, make_state = _TRUSTED
+        strings, columns = self.strings, self.columns
+
+        def rows(kind: str, *names: str):
+            start, end = columns[f"{kind}_offsets"][index:index + 2].tolist()
+            return zip(*(columns[name][start:end].tolist() for name in names))
+
+        def text(code: int) -> Optional[str]:
+            return None if code < 0 else strings[code]
+
+        fields: Dict[str, Any] = {
+            "entities": [make_entity(name=strings[name], type=strings[kind], properties={})
+                         for name, kind in rows("entity", "entity_name", "entity_type")],
+            "actions": [make_action(verb=strings[verb], modifiers=[])
+                        for (verb,) in rows("action", "action_verb")],
+            "relations": [
+                make_relation(source=strings[source], relation_type=strings[kind],
+                              target=strings[target], strength=strength,
+                              source_index=None if source_index < 0 else source_index,
+                              target_index=None if target_index < 0 else target_index)
+                for source, kind, target, strength, source_index, target_index in rows(
+                    "relation", "relation_source", "relation_type", "relation_target",
+                    "relation_strength", "relation_source_index", "relation_target_index")
+            ],
+            "states": [
+                make_state(variable=strings[variable], value=value, unit=text(unit),
+                           span=None if start < 0 else (start, end))
+                for variable, value, unit, start, end in rows(
+                    "state", "state_variable", "state_value", "state_unit",
+                    "state_start", "state_end")
+            ],
+            "assumptions": [strings[code] for (code,) in rows("assumption", "assumption")],
+        }
+        start, end = columns["var_offsets"][index:index + 2].tolist()
+        for field, key, value in zip(columns["var_field"][start:end].tolist(),
+                                     columns["var_key"][start:end].tolist(),
+                                     self.var_values[start:end]):
+            fields.setdefault(_DOMAIN_VARS[field], {})[strings[key]] = _fresh(value)
+        for name, value in self.extras.get(index, {}).items():
+            fields[name] = copy.deepcopy(value)
+
+        return make_ir(
+            raw_text=strings[columns["raw_text"][index]],
+            category=strings[columns["category"][index]],
+            confidence=columns["confidence"][index].item(),
+            uncertainty=columns["uncertainty"][index].item(),
+            detail=strings[columns["detail"][index]],
+            **fields,
+        )
+
+
+class IRBatchWriter:
+    """Accumulates scenarios column by column; finish() returns the IRBatch"""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._columns = {name: array(typecode) for name, typecode in _COLUMNS.items()}
+        self._offsets = {kind: array("q", [0]) for kind in _LISTS}
+        self._var_values: List[Any] = []
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._count = 0
+
+    def _code(self, text: Optional[str]) -> int:
+        if text is None:
+            return -1
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self._codes)
+        return code
+
+    def add(self, raw_text: str, category: str, confidence: float, uncertainty: float,
+            detail: str, entities: Iterable[Tuple[str, str]] = (),
+            actions: Iterable[str] = (),
+            relations: Iterable[Tuple[str, str, str, float, Optional[int], Optional[int]]] = (),
+            states: Iterable[Tuple[str, Any, Optional[str], Optional[Tuple[int, int]]]] = (),
+            assumptions: Sequence[str] = (),
+            domain_vars: Optional[Dict[str, Dict[str, Any]]] = None,
+            extras: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append one scenario from plain values: entities as (name, type),
+        relations as (source, type, target, strength, source index, target
+        index), states as (variable, value, unit, span), domain_vars keyed by
+        *_vars field name. extras holds whole fields outside the columns.
+        """
+        columns, code = self._columns, self._code
+        columns["raw_text"].append(code(raw_text))
+        columns["category"].append(code(category))
+        columns["detail"].append(code(detail))
+        columns["confidence"].append(confidence)
+        columns["uncertainty"].append(uncertainty)
+
+        for name, kind in entities:
+            columns["entity_name"].append(code(name))
+            columns["entity_type"].append(code(kind))
+        for verb in actions:
+            columns["action_verb"].append(code(verb))
+        for source, kind, target, strength, source_index, target_index in relations:
+            columns["relation_source"].append(code(source))
+            columns["relation_type"].append(code(kind))
+            columns["relation_target"].append(code(target))
+            columns["relation_strength"].append(strength)
+            columns["relation_source_index"].append(-1 if source_index is None else source_index)
+            columns["relation_target_index"].append(-1 if target_index is None else target_index)
+
+        states = list(states)
+        if all(type(value) is float for _, value, _, _ in states):
+            for variable, value, unit, span in states:
+                start, end = span if span is not None else (-1, -1)
+                columns["state_variable"].append(code(variable))
+                columns["state_value"].append(value)
+                columns["state_unit"].append(code(unit))
+                columns["state_start"].append(start)
+                columns["state_end"].append(end)
+        else:  # the float column would change the values
+            make_state = _TRUSTED[4]
+            extras = dict(extras or {}, states=[
+                make_state(variable=variable, value=value, unit=unit, span=span)
+                for variable, value, unit, span in states])
+
+        for assumption in assumptions:
+            columns["assumption"].append(code(assumption))
+        for field, variables in (domain_vars or {}).items():
+            field_code = _DOMAIN_VARS.index(field)
+            for key, value in variables.items():
+                columns["var_field"].append(field_code)
+                columns["var_key"].append(code(key))
+                self._var_values.append(_fresh(value))
+
+        lengths = {"entity": "entity_name", "action": "action_verb", "relation": "relation_source",
+                   "state": "state_variable", "assumption": "assumption", "var": "var_field"}
+        for kind, column in lengths.items():
+            self._offsets[kind].append(len(columns[column]))
+        if extras:
+            self._extras[self._count] = extras
+        self._count += 1
+
+    def add_ir(self, ir: IntermediateRepresentation) -> None:
+        """Append an existing IR; anything the columns cannot hold goes to extras"""
+        extras = {name: copy.deepcopy(getattr(ir, name))
+                  for name in _EXTRA_FIELDS if getattr(ir, name)}
+        entities = [(e.name, e.type) for e in ir.entities]
+        if any(e.properties for e in ir.entities):
+            extras["entities"], entities = copy.deepcopy(ir.entities), []
+        actions = [a.verb for a in ir.actions]
+        if any(a.actor is not None or a.target is not None or a.modifiers for a in ir.actions):
+            extras["actions"], actions = copy.deepcopy(ir.actions), []
+        self.add(
+            raw_text=ir.raw_text,
+            category=ir.category,
+            confidence=ir.confidence,
+            uncertainty=ir.uncertainty,
+            detail=ir.detail,
+            entities=entities,
+            actions=actions,
+            relations=[(r.source, r.relation_type, r.target, r.strength,
+                        r.source_index, r.target_index) for r in ir.relations],
+            states=[(s.variable, s.value, s.unit, s.span) for s in ir.states],
+            assumptions=ir.assumptions,
+            domain_vars={field: getattr(ir, field) for field in _DOMAIN_VARS if getattr(ir, field)},
+            extras=extras,
+        )
+
+    def finish(self) -> IRBatch:
+        """Freeze everything added so far into an IRBatch"""
+        columns = {name: np.array(values, dtype=_DTYPES[_COLUMNS[name]])
+                   for name, values in self._columns.items()}
+        for kind, offsets in self._offsets.items():
+            columns[f"{kind}_offsets"] = np.array(offsets, dtype=np.int64)
+        return IRBatch(list(self._codes), columns, self._var_values, self._extras)
+
+
+if __name__ == "__main__":
+    from pipeline import get_pipeline
+
+    pipeline = get_pipeline()
+    texts = ["A ball falls due to gravity at 9.8 m/s.", "Someone overcomes fear.",
+             "Optimize the network."]
+    features = [pipeline.parser.parse(text) for text in texts]
+    scores = [pipeline.router.get_primary_category(f) for f in features]
+    batch = pipeline.builder.build_batch(features, scores)
+    print(len(batch), batch.category_counts(), batch.confidence)
+    print(batch[0].to_compact_json())
@@ -0,0 +1,150 @@
+"""
+linear_router.py - Hashed bag-of-words softmax regression as a routing engine
+
+An alternative to the hand-weighted keyword counts in CategoryRouter. Words of
+the routed text (raw text, verb lemmas and parser signals — the same text the
+keyword router matches) are hashed with crc32 into a fixed number of columns,
+so there is no vocabulary to store, and scored by a single weight matrix.
+
+Train offline from a labelled file (one "category<TAB>scenario" per line):
+
+    python linear_router.py train data/routing_examples.tsv router.npz
+
+and route with it through CategoryRouter(model=LinearRouter.load("router.npz"))
+or `main.py --router-model router.npz`.
+"""
+import sys
+import zlib
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from text_parser import ParsedFeatures
+# The keyword router's tokenizer, so both routers see the same words
+from router import CategoryRouter, CategoryScore, _WORD_RE
+
+
+MODEL_VERSION = 1
+
+# Always-present column acting as the per-category bias
+_BIAS = "<bias>"
+
+
+def tokens(features: ParsedFeatures) -> List[str]:
+    """Bag of words for features: plurals folded to the singular, plus the bias token"""
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+             for w in _WORD_RE.findall(CategoryRouter.signal_text(features))]
+    words.append(_BIAS)
+    return words
+
+
+def hash_tokens(words: Iterable[str], n_features: int) -> np.ndarray:
+    """Column index of every word; crc32 is stable across processes, unlike hash()"""
+    return np.fromiter((zlib.crc32(w.encode("utf-8")) % n_features for w in words),
+                       dtype=np.int64)
+
+
+class LinearRouter:
+    """Softmax regression over hashed words; route() matches CategoryRouter.route"""
+
+    def __init__(self, weights: np.ndarray, labels: Sequence[str], min_confidence: float = 0.05):
+        self.weights = weights            # n_features × categories, float32
+        self.labels = list(labels)
+        self.min_confidence = min_confidence
+
+    @property
+    def n_features(self) -> int:
+        return self.weights.shape[0]
+
+    def probabilities(self, features: ParsedFeatures) -> np.ndarray:
+        """Category probabilities, in self.labels order"""
+        logits = self.weights[hash_tokens(tokens(features), self.n_features)].sum(axis=0)
+        exp = np.exp(logits - logits.max())
+        return exp / exp.sum()
+
+    def route(self, features: ParsedFeatures) -> List[CategoryScore]:
+        """Categories at or above min_confidence (always at least one), most likely first"""
+        probs = self.probabilities(features)
+        order = np.argsort(-probs, kind="stable")
+        scores = []
+        for c in order.tolist():
+            if scores and probs[c] < self.min_confidence:
+                break
+            scores.append(CategoryScore(name=self.labels[c], confidence=float(probs[c]),
+                                        signals=[]))
+        return scores
+
+    # ── persistence ───────────────────────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        """Write weights and labels as a compressed .npz (unused columns compress away)"""
+        np.savez_compressed(path, version=MODEL_VERSION, weights=self.weights.astype(np.float32),
+                            labels=np.array(self.labels))
+
+    @classmethod
+    def load(cls, path: str) -> "LinearRouter":
+        with np.load(path) as data:
+            if int(data["version"]) != MODEL_VERSION:
+                raise ValueError(f"{path}: router model version {int(data['version'])}, "
+                                 f"expected {MODEL_VERSION}")
+            return cls(data["weights"], [str(label) for label in data["labels"]])
+
+    # ── training ──────────────────────────────────────────────────────────────
+
+    @classmethod
+    def train(cls, features_list: Sequence[ParsedFeatures], labels: Sequence[str],
+              n_features: int = 2 ** 14, epochs: int = 300, learning_rate: float = 0.5,
+              l2: float = 1e-4) -> "LinearRouter":
+        """Full-batch gradient descent on the softmax cross-entropy"""
+        categories = sorted(set(labels))
+        y = np.array([categories.index(label) for label in labels])
+        docs = len(features_list)
+
+        columns = [hash_tokens(tokens(f), n_features) for f in features_list]
+        indices = np.concatenate(columns)
+        doc_of = np.repeat(np.arange(docs), [len(c) for c in columns])
+        starts = np.cumsum([0] + [len(c) for c in columns[:-1]])
+
+        weights = np.zeros((n_features, len(categories)), dtype=np.float64)
+        onehot = np.eye(len(categories))[y]
+        for _ in range(epochs):
+            # Every document has the bias token, so no reduceat segment is empty
+            logits = np.add.reduceat(weights[indices], starts, axis=0)
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            grad = np.zeros_like(weights)
+            np.add.at(grad, indices, (probs - onehot)[doc_of])
+            weights -= learning_rate * (grad / docs + l2 * weights)
+        return cls(weights.astype(np.float32), categories)
+
+
+def read_labelled(path: str) -> Tuple[List[str], List[str]]:
+    """(texts, labels) from a "category<TAB>scenario" file; blank and # lines are skipped"""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            label, sep, text = line.partition("\t")
+            if not sep:
+                raise ValueError(f"{path}:{line_no}: expected 'category<TAB>scenario'")
+            labels.append(label.strip())
+            texts.append(text.strip())
+    return texts, labels
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "train":
+        sys.exit("usage: python linear_router.py train LABELLED.tsv MODEL.npz")
+    from pipeline import get_pipeline
+
+    texts, labels = read_labelled(sys.argv[2])
+    features_list = list(get_pipeline().parser.parse_many(texts))
+    model = LinearRouter.train(features_list, labels)
+    model.save(sys.argv[3])
+
+    correct = sum(model.route(f)[0].name == label for f, label in zip(features_list, labels))
+    print(f"Trained on {len(texts)} scenarios, {len(model.labels)} categories; "
+          f"training accuracy {correct / len(texts):.1%} → {sys.argv[3]}")
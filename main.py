@@ -4,24 +4,48 @@ main.py - CLI for "What Does That Look Like in Code" (WDLIC)
 Converts natural language scenarios into dumb pseudo-code and executable code
 """
 import sys
+from itertools import tee
+
 import click
 
 # FIX: import from text_parser, not parser (parser.py shadows stdlib `parser` module)
-from text_parser import TextParser
-from router import CategoryRouter, CategoryScore
-from ir import IRBuilder
+from text_parser import select_profile
+from pipeline import CATEGORY_ALIASES, build_pipeline
+from result_store import ResultStore
 from codegen import get_registry
 from render import OutputRenderer
-
-
-# FIX: category_map was buried inside the function and was missing most router
-# categories (social, ui, business, game, rules, philosophy, biology, technology, art).
-# Moved here as a module-level constant so it's easy to extend.
-CATEGORY_ALIASES: dict[str, str] = {
-    "psych": "psychology",
-    "math":  "mathematics",
-    "opt":   "optimization",
-}
+from workers import WorkerPool
+from score_export import export_scores
+
+
+# ParsedFeatures fields read outside the generators. The router needs verb
+# lemmas on top of the keyword signals; the IR preview printed by --format all
+# lists entities, actions and relations, shows the uncertainty score and dumps
+# the IR, so it is the one output that needs the dependency parse. A generator
+# that reads ir.relations asks for it the same way, with "relations" and
+# "relation_tokens" in its features.
+ROUTER_FEATURES = {"raw_text", "actions", "psychology_signals", "social_signals",
+                   "physics_signals", "math_signals", "philosophy_signals"}
+PREVIEW_FEATURES = {"actors", "actions", "relations", "relation_tokens", "uncertainty"}
+
+
+def select_parser_profile(category: str, output_format: str, registry) -> str:
+    """Pick the cheapest parser profile that still fills every field this run reads"""
+    if category == "auto":
+        # Any generator may end up being chosen, so cover all of the declared ones
+        fields = set(ROUTER_FEATURES)
+        names = registry.generators
+    else:
+        fields = set()
+        names = [CATEGORY_ALIASES.get(category.lower(), category.lower())]
+    for name in names:
+        required = registry.required_features(name)
+        if required is None:
+            return "full"
+        fields |= required
+    if output_format == "all":
+        fields |= PREVIEW_FEATURES
+    return select_profile(fields)
 
 
 @click.command()
@@ -52,7 +76,51 @@ CATEGORY_ALIASES: dict[str, str] = {
 )
 @click.option("--seed", type=int, default=None, help="Random seed for reproducibility")
 @click.option("--no-color", is_flag=True, help="Disable colored output")
-def main(text, output_format, category, detail, seed, no_color):
+@click.option(
+    "--batch", "batch_file",
+    type=click.File("r"), default=None,
+    help="Process one scenario per line from FILE ('-' for stdin)",
+)
+@click.option("--batch-size", type=int, default=64, help="Texts per spaCy batch in --batch mode")
+@click.option(
+    "--workers", type=int, default=1,
+    help="Parser processes in --batch mode; with --engine fast only a --pool runs in parallel",
+)
+@click.option(
+    "--cache-dir", type=click.Path(file_okay=False), default=None,
+    help="Persist parsed features here so later runs skip spaCy for repeated scenarios",
+)
+@click.option(
+    "--engine", type=click.Choice(["accurate", "fast"]), default="accurate",
+    help="accurate: spaCy parse; fast: keyword-only parse with no model load",
+)
+@click.option(
+    "--pool", type=click.Choice(["fork", "spawn"]), default=None,
+    help="Run --batch on a pool of --workers processes (fork shares one loaded model)",
+)
+@click.option(
+    "--router-model", type=click.Path(exists=True, dir_okay=False), default=None,
+    help="Route with a trained linear model (.npz from linear_router.py) instead of keywords",
+)
+@click.option(
+    "--top-k", type=click.IntRange(min=1), default=1,
+    help="Generate for the N best-matching categories and show them as alternatives",
+)
+@click.option(
+    "--export-scores", "export_path", type=click.Path(), default=None,
+    help="With --batch: only route, writing score matrices to PATH (.npz, or a directory of .npy)",
+)
+@click.option(
+    "--result-store", "store_path", type=click.Path(dir_okay=False), default=None,
+    help="SQLite file of generated code and rendered output, reused when the IR is unchanged",
+)
+@click.option(
+    "--result-store-mb", type=click.IntRange(min=1), default=64,
+    help="Size limit of --result-store; least recently used results are evicted past it",
+)
+def main(text, output_format, category, detail, seed, no_color,
+         batch_file, batch_size, workers, cache_dir, engine, pool, router_model, top_k,
+         export_path, store_path, result_store_mb):
     """
     WDLIC - What Does That Look Like in Code
 
@@ -65,9 +133,21 @@ def main(text, output_format, category, detail, seed, no_color):
       wdlic "Calculate trajectory of a ball at 20 m/s at 45 degrees" --format python
 
       wdlic "Optimize profit given cost constraints" --category optimization
+
+      wdlic --batch scenarios.txt --workers 4 --format pseudo
+
+      wdlic --batch scenarios.txt --engine fast
+
+      wdlic --batch scenarios.txt --pool fork --workers 4
+
+      wdlic "AI optimizes network profit" --top-k 3
+
+      wdlic --batch corpus.txt --export-scores scores.npz
+
+      wdlic --batch scenarios.txt --result-store results.sqlite
     """
     # Handle interactive mode if no text provided
-    if not text:
+    if not text and batch_file is None:
         click.echo("WDLIC - What Does That Look Like in Code")
         click.echo("Enter your scenario (or 'quit' to exit):\n")
         text = click.prompt("", type=str)
@@ -81,55 +161,93 @@ def main(text, output_format, category, detail, seed, no_color):
         random.seed(seed)
         np.random.seed(seed)
 
-    # Initialize components
+    if export_path is not None and batch_file is None:
+        raise click.UsageError("--export-scores needs --batch")
+    # The fast engine parses in-process, so only whole-pipeline workers help
+    if workers > 1 and engine == "fast" and pool is None:
+        raise click.UsageError("--workers with --engine fast needs --pool")
+    if top_k > 1 and (pool is not None or category != "auto"):
+        raise click.UsageError("--top-k needs --category auto and cannot be combined with --pool")
+
+    # Initialize components — the spaCy model is shared process-wide, so
+    # embedding callers and repeated runs pay the load once, while the
+    # pipeline around it is this run's own and configured as it is built
+    # Score export only routes, so nothing beyond the router's fields is parsed
+    profile = (select_profile(ROUTER_FEATURES) if export_path is not None
+               else select_parser_profile(category, output_format, get_registry()))
+    store = None
+    if store_path is not None:
+        store = ResultStore(store_path, max_bytes=result_store_mb * 2**20)
+    pipeline = build_pipeline(profile=profile, engine=engine, cache_dir=cache_dir,
+                              router_model=router_model, store=store)
     # FIX: pass no_color to OutputRenderer so the flag actually takes effect
-    parser = TextParser()
-    router = CategoryRouter()
-    ir_builder = IRBuilder()
-    generator_registry = get_registry()
-    renderer = OutputRenderer(no_color=no_color)
+    renderer = OutputRenderer(no_color=no_color, store=store)
 
     try:
-        # Parse input text
-        features = parser.parse(text)
-
-        # Route to category
-        if category == "auto":
-            category_score = router.get_primary_category(features)
+        if export_path is not None:
+            numbered = ((line_no, line.strip()) for line_no, line in enumerate(batch_file, 1)
+                        if line.strip())
+            # tee buffers whatever parse_many reads ahead, so each line number
+            # is paired with its own features however far ahead that is
+            line_nos, texts = tee(numbered)
+            parsed = pipeline.parser.parse_many((text for _, text in texts),
+                                                batch_size=batch_size, n_process=workers)
+            count = export_scores(zip((line_no for line_no, _ in line_nos), parsed), export_path,
+                                  router=pipeline.router, batch_size=batch_size)
+            click.echo(f"Wrote routing scores for {count} scenarios to {export_path}", err=True)
+            return
+
+        if top_k > 1:
+            # Alternatives mode: parse once, generate for each top category
+            if batch_file is not None:
+                texts = (line.strip() for line in batch_file if line.strip())
+                parsed = pipeline.parser.parse_many(texts, batch_size=batch_size, n_process=workers)
+            else:
+                parsed = [pipeline.parser.parse(text)]
+            for features in parsed:
+                renderer.render_alternatives(
+                    pipeline.alternatives(features, top_k, detail=detail, fmt=output_format),
+                    output_format,
+                )
+            return
+
+        if batch_file is not None and pool is not None:
+            # Whole-pipeline workers: parsing and code generation both run in
+            # parallel, and forked workers share the parent's model pages
+            texts = (line.strip() for line in batch_file if line.strip())
+            with WorkerPool(workers, start_method=pool, profile=profile, engine=engine,
+                            cache_dir=cache_dir, router_model=router_model, store_path=store_path,
+                            store_bytes=result_store_mb * 2**20) as worker_pool:
+                for result in worker_pool.run_many(texts, category=category, detail=detail,
+                                                   fmt=output_format):
+                    renderer.render_result(result, output_format)
+            for stats in worker_pool.stats:
+                click.echo(f"worker {stats.pid}: {stats.processed} scenarios, "
+                           f"{stats.throughput:.0f}/s, RSS {stats.rss_bytes / 2**20:.1f} MiB, "
+                           f"PSS {stats.pss_bytes / 2**20:.1f} MiB", err=True)
+            return
+
+        if batch_file is not None:
+            # Bulk mode: stream every scenario through nlp.pipe instead of
+            # paying the per-document overhead of parsing line by line.
+            texts = (line.strip() for line in batch_file if line.strip())
+            results = pipeline.run_many(texts, category=category, detail=detail,
+                                        fmt=output_format, batch_size=batch_size,
+                                        n_process=workers)
         else:
-            # Manual category override — normalise alias then build a synthetic score
-            category_name = CATEGORY_ALIASES.get(category.lower(), category.lower())
-            category_score = CategoryScore(name=category_name, confidence=1.0, signals=[])
-
-        # FIX: pass detail level through to IR builder so generators can use it
-        ir = ir_builder.build(features, category_score, detail=detail)
-
-        # Generate code
-        pseudo_code = None
-        python_code = None
-
-        if output_format in ("pseudo", "all"):
-            pseudo_code = generator_registry.generate_pseudo(ir)
-
-        if output_format in ("python", "all"):
-            python_code = generator_registry.generate_python(ir)
-
-        # Render output
-        if output_format == "pseudo":
-            renderer.render_header(ir.category, ir.confidence)
-            renderer.render_assumptions(ir.assumptions)
-            renderer.render_pseudo_code(pseudo_code)
-        elif output_format == "python":
-            renderer.render_header(ir.category, ir.confidence)
-            renderer.render_python_code(python_code)
-        else:  # all
-            renderer.render_complete_output(ir, pseudo_code, python_code)
+            results = [pipeline.run(text, category=category, detail=detail, fmt=output_format)]
+
+        for result in results:
+            renderer.render_result(result, output_format)
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         if "--debug" in sys.argv:
             raise
         sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+"""
+parse_cache.py - Bounded LRU cache in front of TextParser.parse
+
+Repeated scenarios (README examples, templated prompts) skip spaCy entirely on
+a hit. With a cache_dir, parsed features are also written to disk as JSON,
+keyed by parser version, model name/version and parser profile, so a
+restarted process still skips NLP for anything it has seen before.
+
+Keys are the exact input text. Features carry token indices, token counts
+and relations for one particular tokenisation, so two texts that differ only
+in whitespace are parsed separately rather than sharing an entry.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, fields, replace
+from typing import Optional
+
+from text_parser import ParsedFeatures, Quantity
+
+# Entries written before a field was added are misses rather than half-filled features
+_FIELD_NAMES = frozenset(f.name for f in fields(ParsedFeatures))
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed by ParseCache.stats"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_hits: int = 0
+    disk_writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ParseCache:
+    """
+    Thread-safe LRU of ParsedFeatures keyed by (namespace, text).
+
+    The namespace identifies the parser version, model and profile that
+    produced the features (see TextParser.cache_namespace). Cached features
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024, cache_dir: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[tuple, ParsedFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss/eviction counters"""
+        with self._lock:
+            return replace(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, text: str) -> Optional[ParsedFeatures]:
+        """Return cached features for text, or None on a miss"""
+        key = (namespace, text)
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+        if features is None and self.cache_dir is not None:
+            features = self._read(key)
+            if features is not None:
+                with self._lock:
+                    self._stats.disk_hits += 1
+                    self._stats.hits += 1
+                self._insert(key, features)
+        if features is None:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+        return features
+
+    def put(self, namespace: str, text: str, features: ParsedFeatures) -> None:
+        """Store features for text in memory, and on disk if cache_dir is set"""
+        key = (namespace, text)
+        self._insert(key, features)
+        if self.cache_dir is not None:
+            self._write(key, features)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the on-disk layer is left alone)"""
+        with self._lock:
+            self._entries.clear()
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _insert(self, key: tuple, features: ParsedFeatures) -> None:
+        with self._lock:
+            self._entries[key] = features
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _path(self, key: tuple) -> str:
+        namespace, text = key
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, namespace, digest[:2], digest + ".json")
+
+    def _read(self, key: tuple) -> Optional[ParsedFeatures]:
+        try:
+            with open(self._path(key), encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.keys() != _FIELD_NAMES:
+                return None
+            # JSON has no tuples or int keys; restore them
+            data["quantities"] = [Quantity(*q) for q in data["quantities"]]
+            data["relations"] = [tuple(r) for r in data["relations"]]
+            data["relation_tokens"] = {int(i): t for i, t in data["relation_tokens"].items()}
+            return ParsedFeatures(**data)
+        except (OSError, ValueError, TypeError):
+            # Missing, truncated or written by an incompatible version: a miss
+            return None
+
+    def _write(self, key: tuple, features: ParsedFeatures) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(asdict(features), fh, ensure_ascii=False)
+        os.replace(tmp, path)
+        with self._lock:
+            self._stats.disk_writes += 1
@@ -0,0 +1,247 @@
+"""
+pipeline.py - Warm, process-wide pipeline shared by the CLI, tests and embedders
+
+Loading a spaCy model dominates start-up time, so the model is loaded at most
+once per process and every Pipeline built through get_pipeline() shares it.
+The "fast" engine (fast_parser.FastParser) skips spaCy altogether.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from text_parser import TextParser, ParsedFeatures, PROFILE_EXCLUDES, load_model
+from fast_parser import FastParser
+from parse_cache import ParseCache
+from result_store import ResultStore
+from router import CategoryRouter, CategoryScore
+from ir import IRBuilder, IntermediateRepresentation
+from codegen import get_registry
+
+
+# FIX: category_map was buried inside the function and was missing most router
+# categories (social, ui, business, game, rules, philosophy, biology, technology, art).
+# Moved here as a module-level constant so it's easy to extend.
+CATEGORY_ALIASES: dict[str, str] = {
+    "psych": "psychology",
+    "math":  "mathematics",
+    "opt":   "optimization",
+}
+
+ENGINES = ("accurate", "fast")
+
+
+@dataclass
+class PipelineResult:
+    """Everything produced for one scenario"""
+    features: ParsedFeatures
+    category: CategoryScore
+    ir: IntermediateRepresentation
+    pseudo_code: Optional[str] = None
+    python_code: Optional[str] = None
+    # ir.fingerprint(registry.version), set when the pipeline has a result store
+    fingerprint: Optional[str] = None
+
+
+class Pipeline:
+    """
+    TextParser → CategoryRouter → IRBuilder → code generators, kept warm.
+
+    A Pipeline holds no per-request state, so one instance can serve many
+    threads; build it through get_pipeline() to share the loaded model.
+    Parses go through an in-memory ParseCache unless another cache is given.
+    engine="fast" swaps in FastParser: no model, keyword-level features only.
+    With a ResultStore, generated code is looked up by IR fingerprint first
+    and the generators only run for artifacts the store does not have.
+    """
+
+    def __init__(self, model_name: str = "en_core_web_sm", profile: str = "full", nlp=None,
+                 cache: Optional[ParseCache] = None, engine: str = "accurate",
+                 store: Optional[ResultStore] = None, router: Optional[CategoryRouter] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+        if cache is None:
+            cache = ParseCache()
+        self.engine = engine
+        if engine == "fast":
+            self.parser = FastParser(cache=cache)
+        else:
+            self.parser = TextParser(model_name, profile=profile, nlp=nlp, cache=cache)
+        self.router = router or CategoryRouter()
+        self.builder = IRBuilder()
+        self.registry = get_registry()
+        self.store = store
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def categorize(self, features: ParsedFeatures, category: str = "auto") -> CategoryScore:
+        """Route features, or build a synthetic score for a forced category"""
+        if category == "auto":
+            return self.router.get_primary_category(features)
+        # Manual category override — normalise alias then build a synthetic score
+        category_name = CATEGORY_ALIASES.get(category.lower(), category.lower())
+        return CategoryScore(name=category_name, confidence=1.0, signals=[])
+
+    def analyze(self, features: ParsedFeatures, category: str = "auto",
+                detail: str = "med", fmt: str = "all") -> PipelineResult:
+        """Route, build the IR and generate code for already parsed features"""
+        return self._generate(features, self.categorize(features, category), detail, fmt)
+
+    def alternatives(self, features: ParsedFeatures, top_k: int = 3, detail: str = "med",
+                     fmt: str = "all") -> List[PipelineResult]:
+        """
+        One result per each of the top_k routed categories, best first.
+
+        Each category gets its own IR and generator run on a shared thread
+        pool. The built-in generators are pure Python and hold the GIL, so
+        the threads only overlap the result-store lookups and writes (SQLite
+        releases the GIL) and generators that block on I/O; CPU-bound
+        generation runs no faster than sequentially.
+        """
+        scores = self.router.route(features)[:top_k]
+        if len(scores) == 1:
+            return [self._generate(features, scores[0], detail, fmt)]
+        executor = self._get_executor()
+        futures = [executor.submit(self._generate, features, score, detail, fmt)
+                   for score in scores]
+        return [future.result() for future in futures]
+
+    def run_alternatives(self, text: str, top_k: int = 3, detail: str = "med",
+                         fmt: str = "all") -> List[PipelineResult]:
+        """Parse text once and generate for each of its top_k categories"""
+        return self.alternatives(self.parser.parse(text), top_k, detail, fmt)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix="wdlic-gen")
+        return self._executor
+
+    def _generate(self, features: ParsedFeatures, category_score: CategoryScore,
+                  detail: str, fmt: str) -> PipelineResult:
+        # FIX: pass detail level through to IR builder so generators can use it
+        ir = self.builder.build(features, category_score, detail=detail)
+        return self.generate_code(PipelineResult(features=features, category=category_score, ir=ir),
+                                  fmt)
+
+    def generate_code(self, result: PipelineResult, fmt: str = "all") -> PipelineResult:
+        """Fill in result's code for fmt from result.ir, through the result store if any"""
+        ir = result.ir
+        generators = {"pseudo": self.registry.generate_pseudo,
+                      "python": self.registry.generate_python}
+        kinds = [kind for kind in generators if fmt in (kind, "all")]
+        artifacts: Dict[str, str] = {}
+        if self.store is not None:
+            result.fingerprint = ir.fingerprint(self.registry.version)
+            artifacts = self.store.get_many(result.fingerprint, kinds)
+        generated = {kind: generators[kind](ir) for kind in kinds if kind not in artifacts}
+        if generated and self.store is not None:
+            self.store.put_many(result.fingerprint, generated)
+        artifacts.update(generated)
+        result.pseudo_code = artifacts.get("pseudo")
+        result.python_code = artifacts.get("python")
+        return result
+
+    def run(self, text: str, category: str = "auto", detail: str = "med",
+            fmt: str = "all") -> PipelineResult:
+        """Run one scenario through the whole pipeline"""
+        return self.analyze(self.parser.parse(text), category, detail, fmt)
+
+    def run_many(self, texts: Iterable[str], category: str = "auto", detail: str = "med",
+                 fmt: str = "all", batch_size: int = 64,
+                 n_process: int = 1) -> Iterator[PipelineResult]:
+        """Run a stream of scenarios, parsing and routing them in batches"""
+        parsed = self.parser.parse_many(texts, batch_size=batch_size, n_process=n_process)
+        if category != "auto":
+            for features in parsed:
+                yield self.analyze(features, category, detail, fmt)
+            return
+        while True:
+            batch = list(islice(parsed, batch_size))
+            if not batch:
+                return
+            for features, scores in zip(batch, self.router.route_batch(batch)):
+                yield self._generate(features, scores[0], detail, fmt)
+
+
+# Process-wide state. Models are keyed by (model name, excluded components) so a
+# fully loaded model can also serve every narrower profile.
+_lock = threading.Lock()
+_models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_pipelines: Dict[Tuple[str, str, str], Pipeline] = {}
+
+
+def _shared_model(model_name: str, profile: str):
+    """Return a loaded model with every component the profile needs (lock held)"""
+    needed_excludes = set(PROFILE_EXCLUDES[profile])
+    for (name, excluded), nlp in _models.items():
+        if name == model_name and set(excluded) <= needed_excludes:
+            return nlp
+    excluded = PROFILE_EXCLUDES[profile]
+    nlp = _models[(model_name, excluded)] = load_model(model_name, exclude=excluded)
+    return nlp
+
+
+def get_pipeline(model_name: str = "en_core_web_sm", profile: str = "full",
+                 engine: str = "accurate") -> Pipeline:
+    """Return the shared Pipeline for model_name/profile/engine, building it on first use"""
+    if engine == "fast":
+        model_name, profile = "", "pos"  # FastParser ignores both
+    key = (model_name, profile, engine)
+    pipeline = _pipelines.get(key)
+    if pipeline is None:
+        with _lock:
+            pipeline = _pipelines.get(key)
+            if pipeline is None:
+                nlp = _shared_model(model_name, profile) if engine == "accurate" else None
+                pipeline = _pipelines[key] = Pipeline(model_name, profile, nlp=nlp, engine=engine)
+    return pipeline
+
+
+def build_pipeline(model_name: str = "en_core_web_sm", profile: str = "full",
+                   engine: str = "accurate", cache_dir: Optional[str] = None,
+                   router_model: Optional[str] = None,
+                   store: Optional[ResultStore] = None) -> Pipeline:
+    """
+    A new Pipeline for one caller's configuration, around the shared model.
+
+    get_pipeline() instances are shared by everyone in the process and must
+    not be reconfigured; build a private one here instead. cache_dir backs
+    the parse cache with that directory; router_model is a .npz written by
+    linear_router.LinearRouter.save to route with instead of keywords; store
+    is the ResultStore generated code is looked up in and saved to.
+    """
+    if engine == "fast":
+        model_name, profile = "", "pos"
+        nlp = None
+    else:
+        with _lock:
+            nlp = _shared_model(model_name, profile)
+    cache = ParseCache(cache_dir=cache_dir) if cache_dir is not None else None
+    router = None
+    if router_model is not None:
+        from linear_router import LinearRouter
+        router = CategoryRouter(model=LinearRouter.load(router_model))
+    return Pipeline(model_name, profile, nlp=nlp, cache=cache, engine=engine, store=store,
+                    router=router)
+
+
+def loaded_models() -> List[Tuple[str, Tuple[str, ...]]]:
+    """(model name, excluded components) for every model loaded in this process"""
+    return list(_models)
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    pipeline = get_pipeline()
+    print(f"Cold start: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    result = get_pipeline().run("A ball falls due to gravity with acceleration.", fmt="pseudo")
+    print(f"Warm run:   {time.perf_counter() - start:.3f}s")
+    print(result.category)
+    print(result.pseudo_code)
@@ -1,19 +1,39 @@
 """
 render.py - Output formatting and rendering
 """
+from importlib.metadata import version
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich import box
 
+# Part of every stored rendering's kind, with the rich version (which can
+# change panel and syntax output): bump it whenever the render_* methods
+# change what they print, so renderings stored before are not replayed
+RENDER_VERSION = "2"
+RICH_VERSION = version("rich")
+
 
 class OutputRenderer:
-    """Renders output with rich formatting"""
+    """
+    Renders output with rich formatting.
+
+    With a ResultStore, render_result() reuses the stored rendering of any
+    result whose fingerprint it has already rendered in the same style.
+    """
 
-    def __init__(self, no_color: bool = False):
+    def __init__(self, no_color: bool = False, store=None):
         # FIX: no_color flag was accepted in main() but never passed here,
         # so --no-color had zero effect. Wire it through to Console.
         self.console = Console(no_color=no_color)
+        self.store = store
+
+    @property
+    def style(self) -> str:
+        """What the rendered text depends on besides the result: width and colours"""
+        color_system = "plain" if self.console.no_color else self.console.color_system
+        return f"{self.console.width}x{color_system or 'plain'}"
 
     def render_header(self, category: str, confidence: float):
         """Render category and confidence header"""
@@ -44,6 +64,10 @@ class OutputRenderer:
         if ir.actions:
             summary.append(f"Actions: {', '.join([a.verb for a in ir.actions[:5]])}")
 
+        if ir.relations:
+            edges = [f"{r.source} -{r.relation_type}-> {r.target}" for r in ir.relations[:5]]
+            summary.append(f"Relations: {', '.join(edges)}")
+
         if ir.assumptions:
             summary.append(f"Assumptions: {len(ir.assumptions)} defined")
 
@@ -92,6 +116,41 @@ class OutputRenderer:
         self.render_python_code(python_code)
         self.console.print("\n[dim]═══════════════════════════════════════════[/dim]\n")
 
+    def render_result(self, result, output_format: str = "all"):
+        """Render a PipelineResult in the requested output format"""
+        if self.store is None or result.fingerprint is None:
+            self._render_result(result, output_format)
+            return
+        kind = f"render:{RENDER_VERSION}:{RICH_VERSION}:{output_format}:{self.style}"
+        rendered = self.store.get(result.fingerprint, kind)
+        if rendered is None:
+            with self.console.capture() as capture:
+                self._render_result(result, output_format)
+            rendered = capture.get()
+            self.store.put(result.fingerprint, kind, rendered)
+        self.console.file.write(rendered)
+
+    def _render_result(self, result, output_format: str):
+        ir = result.ir
+        if output_format == "pseudo":
+            self.render_header(ir.category, ir.confidence)
+            self.render_assumptions(ir.assumptions)
+            self.render_pseudo_code(result.pseudo_code)
+        elif output_format == "python":
+            self.render_header(ir.category, ir.confidence)
+            self.render_python_code(result.python_code)
+        else:  # all
+            self.render_complete_output(ir, result.pseudo_code, result.python_code)
+
+    def render_alternatives(self, results, output_format: str = "all"):
+        """Render the results of one scenario's top categories as numbered alternatives"""
+        for number, result in enumerate(results, 1):
+            self.console.print(
+                f"\n[bold magenta]── Alternative {number}/{len(results)}: "
+                f"{result.category.name} ──[/bold magenta]"
+            )
+            self.render_result(result, output_format)
+
 
 if __name__ == "__main__":
     from ir import IntermediateRepresentation
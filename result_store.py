@@ -0,0 +1,186 @@
+"""
+result_store.py - Content-addressed SQLite store of generated artifacts
+
+Generators are pure functions of the IR, so their output can be stored under
+IntermediateRepresentation.fingerprint(registry.version) and reused by any
+later run, batch or interactive, that builds an equal IR. Each fingerprint
+holds several artifacts, one per kind: "pseudo", "python", and rendered
+terminal output ("render:<render version>:<rich version>:<format>:<style>",
+see OutputRenderer.render_result).
+
+The database is bounded by max_bytes of artifact text; when a write goes over,
+the least recently used artifacts are evicted until the store is back under
+EVICT_TO of the limit. Several processes may share one file.
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Optional
+
+# Eviction frees down to this fraction of max_bytes, so a full store does not
+# evict on every single write
+EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    fingerprint TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    last_used   REAL NOT NULL,
+    PRIMARY KEY (fingerprint, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS artifacts_last_used ON artifacts (last_used);
+-- Running total kept by triggers, so size checks stay O(1) across processes
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS artifacts_insert AFTER INSERT ON artifacts
+    BEGIN UPDATE totals SET bytes = bytes + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS artifacts_delete AFTER DELETE ON artifacts
+    BEGIN UPDATE totals SET bytes = bytes - OLD.size; END;
+CREATE TRIGGER IF NOT EXISTS artifacts_update AFTER UPDATE OF size ON artifacts
+    BEGIN UPDATE totals SET bytes = bytes - OLD.size + NEW.size; END;
+"""
+
+
+@dataclass
+class StoreStats:
+    """Counters exposed by ResultStore.stats (this process only)"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultStore:
+    """
+    Thread-safe, size-bounded map of (fingerprint, kind) → artifact text.
+
+    One connection per store, serialised by a lock; open a new ResultStore in
+    each process (a connection must not cross a fork).
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 2**20):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = StoreStats()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def stats(self) -> StoreStats:
+        """Snapshot of the hit/miss/write/eviction counters"""
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def total_bytes(self) -> int:
+        """Artifact bytes currently held (all processes)"""
+        with self._lock:
+            return self._db.execute("SELECT bytes FROM totals").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+    def get(self, fingerprint: str, kind: str) -> Optional[str]:
+        """Stored artifact of this kind, or None on a miss"""
+        return self.get_many(fingerprint, (kind,)).get(kind)
+
+    def get_many(self, fingerprint: str, kinds: Iterable[str]) -> Dict[str, str]:
+        """Every stored artifact among kinds, by kind; missing kinds are left out"""
+        kinds = list(kinds)
+        if not kinds:
+            return {}
+        marks = ",".join("?" * len(kinds))
+        with self._lock:
+            found = dict(self._db.execute(
+                f"SELECT kind, value FROM artifacts WHERE fingerprint = ? AND kind IN ({marks})",
+                (fingerprint, *kinds),
+            ))
+            if found:
+                self._db.execute(
+                    f"UPDATE artifacts SET last_used = ? WHERE fingerprint = ? AND kind IN ({marks})",
+                    (time.time(), fingerprint, *found),
+                )
+            self._stats.hits += len(found)
+            self._stats.misses += len(kinds) - len(found)
+        return found
+
+    def put(self, fingerprint: str, kind: str, value: str) -> None:
+        """Store value, evicting least recently used artifacts if over max_bytes"""
+        self.put_many(fingerprint, {kind: value})
+
+    def put_many(self, fingerprint: str, artifacts: Dict[str, str]) -> None:
+        """Store several artifacts of one fingerprint in a single transaction"""
+        if not artifacts:
+            return
+        now = time.time()
+        rows = [(fingerprint, kind, value, len(value.encode("utf-8")), now)
+                for kind, value in artifacts.items()]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (fingerprint, kind) DO UPDATE SET "
+                    "value = excluded.value, size = excluded.size, last_used = excluded.last_used",
+                    rows,
+                )
+                self._stats.writes += len(rows)
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Remove every stored artifact"""
+        with self._lock:
+            self._db.execute("DELETE FROM artifacts")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until under EVICT_TO × max_bytes (lock held)"""
+        total = self._db.execute("SELECT bytes FROM totals").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        victims = []
+        for fingerprint, kind, size in self._db.execute(
+                "SELECT fingerprint, kind, size FROM artifacts ORDER BY last_used"):
+            victims.append((fingerprint, kind))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM artifacts WHERE fingerprint = ? AND kind = ?", victims)
+        self._stats.evictions += len(victims)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.sqlite"), max_bytes=200)
+        for n in range(10):
+            store.put(f"fp{n}", "pseudo", "x" * 50)
+        print(f"{len(store)} artifacts, {store.total_bytes} bytes, {store.stats}")
+        store.close()
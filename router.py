@@ -1,6 +1,9 @@
 # router.py - Category Router for classifying input into domains
+import re
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
 
 # FIX: import from text_parser, not parser (parser.py shadows stdlib `parser` module)
 from text_parser import ParsedFeatures
@@ -14,8 +17,34 @@ class CategoryScore:
     signals: List[str]
 
 
+# Words for keyword matching: letters/digits, hyphenated compounds kept whole
+_WORD_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def compile_keywords(categories: Dict[str, dict]) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+    """
+    Index every keyword to the (category, position in its list) pairs it belongs to.
+
+    Routing then costs one dict lookup per word of input however many keywords
+    there are. Keywords must be single words (hyphens allowed).
+    """
+    index: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+    for category, config in categories.items():
+        for position, keyword in enumerate(config["keywords"]):
+            if not _WORD_RE.fullmatch(keyword):
+                raise ValueError(f"Router keyword {keyword!r} ({category}) is not a single word")
+            index[keyword] = index.get(keyword, ()) + ((category, position),)
+    return index
+
+
 class CategoryRouter:
-    """Routes parsed features to appropriate categories"""
+    """
+    Routes parsed features to appropriate categories.
+
+    By default categories are scored by keyword matches against CATEGORIES.
+    Pass model (e.g. a linear_router.LinearRouter) to route with it instead;
+    it only needs a route(features) method returning CategoryScores.
+    """
 
     CATEGORIES = {
         "psychology": {
@@ -127,12 +156,60 @@ class CategoryRouter:
         },
     }
 
-    def route(self, features: ParsedFeatures) -> List[CategoryScore]:
-        """Classify parsed features into categories with confidence scores"""
-        scores = []
+    # Parser signals that add a flat 0.2 to their category when non-empty
+    BOOST_FIELDS = {
+        "psychology":  "psychology_signals",
+        "social":      "social_signals",
+        "physics":     "physics_signals",
+        "mathematics": "math_signals",
+        "philosophy":  "philosophy_signals",
+    }
+
+    def __init__(self, model=None):
+        self.model = model
+        # Compiled once per router; rebuild the router after editing CATEGORIES
+        self._index = compile_keywords(self.CATEGORIES)
+        self._matrices = None
+
+    def _lookup(self, word: str):
+        """Index entries for word, trying it without a plural suffix on a miss"""
+        hits = self._index.get(word)
+        if hits is None and word.endswith("s"):
+            hits = self._index.get(word[:-1])
+            if hits is None and word.endswith("es"):
+                hits = self._index.get(word[:-2])
+        return hits
 
-        # Combine all text signals for matching
-        all_text = " ".join([
+    def match_keywords(self, text: str) -> Dict[str, List[str]]:
+        """
+        Keywords of each category that occur in text as whole words.
+
+        One scan over the words of text. Unlike substring tests, "if" does not
+        match "life", nor "ai" "said", nor "sum" "summer". Plurals ("fears")
+        match their keyword, and the parts of a hyphenated word match too
+        ("peer-reviewed" → "peer"). Matches are listed in keyword order.
+        """
+        found: Dict[str, Dict[int, str]] = {}
+        for category, position in self._hits(text):
+            found.setdefault(category, {})[position] = \
+                self.CATEGORIES[category]["keywords"][position]
+        return {category: [kw for _, kw in sorted(positions.items())]
+                for category, positions in found.items()}
+
+    def _hits(self, text: str) -> Set[Tuple[str, int]]:
+        """(category, keyword position) of every keyword occurring in text"""
+        hits = set()
+        for word in set(_WORD_RE.findall(text)):
+            entries = self._lookup(word)
+            if entries is None and "-" in word:
+                entries = tuple(e for part in word.split("-") for e in (self._lookup(part) or ()))
+            hits.update(entries or ())
+        return hits
+
+    @staticmethod
+    def signal_text(features: ParsedFeatures) -> str:
+        """Raw text plus verb lemmas and parser signals, lowercased, as matched by route()"""
+        return " ".join([
             features.raw_text.lower(),
             " ".join(features.actions),
             " ".join(features.psychology_signals),
@@ -142,22 +219,26 @@ class CategoryRouter:
             " ".join(features.philosophy_signals),
         ]).lower()
 
+    def route(self, features: ParsedFeatures) -> List[CategoryScore]:
+        """Classify parsed features into categories with confidence scores"""
+        if self.model is not None:
+            return self.model.route(features)
+        scores = []
+
+        # FIX: was `kw in all_text` per keyword — a substring test, so "if" matched
+        # "life" and "ai" matched "said", at O(keywords × text) per call
+        matched = self.match_keywords(self.signal_text(features))
+
         for category, config in self.CATEGORIES.items():
-            matches = [kw for kw in config["keywords"] if kw in all_text]
+            matches = matched.get(category)
 
             if matches:
                 base_confidence = len(matches) / len(config["keywords"])
                 confidence = min(base_confidence * config["weight"] * 2, 1.0)
 
                 # Boost from specialized parser signals
-                boosts = {
-                    "psychology": features.psychology_signals,
-                    "social":     features.social_signals,
-                    "physics":    features.physics_signals,
-                    "mathematics": features.math_signals,
-                    "philosophy": features.philosophy_signals,
-                }
-                if category in boosts and boosts[category]:
+                boost_field = self.BOOST_FIELDS.get(category)
+                if boost_field is not None and getattr(features, boost_field):
                     confidence = min(confidence + 0.2, 1.0)
 
                 scores.append(CategoryScore(
@@ -173,6 +254,108 @@ class CategoryRouter:
 
         return scores
 
+    def _build_matrices(self):
+        """Keyword columns, keyword × category membership and per-category constants"""
+        names = list(self.CATEGORIES)
+        # One column per (category, keyword position): a word listed under two
+        # categories is two columns, each counting toward its own category
+        keyword_ids: Dict[Tuple[str, int], int] = {}
+        for name in names:
+            for position in range(len(self.CATEGORIES[name]["keywords"])):
+                keyword_ids[(name, position)] = len(keyword_ids)
+        membership = np.zeros((len(keyword_ids), len(names)), dtype=np.float64)
+        for (name, _), k in keyword_ids.items():
+            membership[k, names.index(name)] = 1.0
+        sizes = np.array([len(self.CATEGORIES[n]["keywords"]) for n in names], dtype=np.float64)
+        weights = np.array([self.CATEGORIES[n]["weight"] for n in names], dtype=np.float64)
+        boostable = [(c, self.BOOST_FIELDS[n]) for c, n in enumerate(names) if n in self.BOOST_FIELDS]
+        self._matrices = (names, keyword_ids, membership, sizes, weights, boostable)
+        return self._matrices
+
+    def route_batch(self, features_list: Sequence[ParsedFeatures]) -> List[List[CategoryScore]]:
+        """
+        route() for many documents at once; element i equals route(features_list[i]).
+
+        Keyword hits form a sparse documents × keywords matrix; multiplying it
+        by the keywords × categories membership matrix gives every match count
+        in one product, and confidences and signal boosts are then array
+        operations over all documents and categories together.
+        """
+        if self.model is not None:
+            return [self.model.route(features) for features in features_list]
+        names = (self._matrices or self._build_matrices())[0]
+        doc_hits, counts, confidence = self._score_arrays(features_list)
+
+        # Back to Python objects: one list conversion per matrix, then per-document
+        # work is only over the categories that matched
+        results = []
+        for hit_set, row, matched in zip(doc_hits, confidence.tolist(), (counts > 0).tolist()):
+            positions: Dict[str, List[int]] = {}
+            for name, position in hit_set:
+                positions.setdefault(name, []).append(position)
+            # Stable sort on descending confidence keeps CATEGORIES order for ties, like route()
+            order = sorted((c for c, hit in enumerate(matched) if hit), key=lambda c: -row[c])
+            scores = []
+            for c in order:
+                keywords = self.CATEGORIES[names[c]]["keywords"]
+                scores.append(CategoryScore(
+                    name=names[c],
+                    confidence=row[c],
+                    signals=[keywords[p] for p in sorted(positions[names[c]])],
+                ))
+            if not scores:
+                scores.append(CategoryScore(name="generic", confidence=0.5, signals=[]))
+            results.append(scores)
+        return results
+
+    def score_matrix(self, features_list: Sequence[ParsedFeatures]
+                     ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        (category names, confidence, signal counts) for many documents, as arrays.
+
+        confidence is float32 documents × categories with route()'s values and
+        0 for categories that did not match (route() omits those; the
+        "generic" fallback is not a column). signal counts is int32, the number
+        of keywords matched per category. With a model, confidence holds its
+        probabilities and the counts are zero.
+        """
+        if self.model is not None:
+            names = list(self.model.labels)
+            confidence = np.array([self.model.probabilities(f) for f in features_list],
+                                  dtype=np.float32).reshape(-1, len(names))
+            return names, confidence, np.zeros(confidence.shape, dtype=np.int32)
+        names = (self._matrices or self._build_matrices())[0]
+        _, counts, confidence = self._score_arrays(features_list)
+        return list(names), confidence.astype(np.float32), counts.astype(np.int32)
+
+    def _score_arrays(self, features_list: Sequence[ParsedFeatures]):
+        """Per-document hit sets, match counts and confidences (float64), all categories"""
+        from scipy import sparse
+
+        names, keyword_ids, membership, sizes, weights, boostable = (
+            self._matrices or self._build_matrices())
+        docs = len(features_list)
+
+        doc_hits = [self._hits(self.signal_text(features)) for features in features_list]
+        indptr, indices = [0], []
+        for hit_set in doc_hits:
+            indices.extend(keyword_ids[hit] for hit in hit_set)
+            indptr.append(len(indices))
+        hits = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), indices, indptr),
+            shape=(docs, len(keyword_ids)),
+        )
+
+        counts = hits @ membership  # documents × categories
+        confidence = np.minimum(counts / sizes * weights * 2, 1.0)
+        boost = np.zeros_like(confidence, dtype=bool)
+        for c, field_name in boostable:
+            boost[:, c] = [bool(getattr(features, field_name)) for features in features_list]
+        # Like route(), only categories with a keyword match get the boost
+        boost &= counts > 0
+        confidence = np.where(boost, np.minimum(confidence + 0.2, 1.0), confidence)
+        return doc_hits, counts, confidence
+
     def get_primary_category(self, features: ParsedFeatures) -> CategoryScore:
         """Get the single highest-confidence category"""
         return self.route(features)[0]
@@ -0,0 +1,134 @@
+"""
+score_export.py - Columnar export of routing scores for offline analysis
+
+Routes a corpus in batches and writes, per document:
+
+    ids            int64    document id (1-based line number in the input)
+    confidence     float32  documents × categories, see CategoryRouter.score_matrix
+    signal_counts  int32    documents × categories, keywords matched
+    categories     str      column names for the two matrices
+
+to a compressed .npz, or to a directory of .npy files that load memory-mapped:
+
+    scores = load_scores("scores/")          # np.load(..., mmap_mode="r")
+    scores["confidence"][:, scores["categories"].tolist().index("physics")]
+"""
+import json
+import os
+import tempfile
+import zipfile
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from router import CategoryRouter
+from text_parser import ParsedFeatures
+
+
+class _NpyStream:
+    """
+    A .npy file written a chunk of rows at a time.
+
+    The header is written first with 0 rows and rewritten with the final row
+    count on close; numpy pads it so the first axis can grow in place (see
+    numpy.lib.format.GROWTH_AXIS_MAX_DIGITS), so its length never changes.
+    """
+
+    def __init__(self, path: str, dtype, row_shape: Tuple[int, ...] = ()):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.rows = 0
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def append(self, array: np.ndarray) -> None:
+        np.ascontiguousarray(array, dtype=self.dtype).tofile(self.file)
+        self.rows += len(array)
+
+    def close(self) -> None:
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+    def _write_header(self) -> None:
+        np.lib.format.write_array_header_1_0(self.file, {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.rows, *self.row_shape),
+        })
+
+
+def export_scores(documents: Iterable[Tuple[int, ParsedFeatures]], path: str,
+                  router: Optional[CategoryRouter] = None, batch_size: int = 1024) -> int:
+    """
+    Route (id, features) pairs in batches and write the score arrays to path.
+
+    Each id travels with its features, so ids cannot drift out of step with
+    the rows however the features are produced (enumerate(features, 1)
+    numbers them from 1).
+
+    path ending in ".npz" writes one compressed archive; anything else is a
+    directory receiving <name>.npy per array (plus categories.json), which is
+    the layout to use for memory-mapped loading. Every batch is appended to
+    the files as soon as it is scored, so memory stays at one batch however
+    long the input is. Returns the document count.
+    """
+    router = router or CategoryRouter()
+    if not path.endswith(".npz"):
+        os.makedirs(path, exist_ok=True)
+        return _write_scores(documents, path, router, batch_size)
+
+    # An archive member must be complete before it is added, so the arrays
+    # are streamed to .npy files beside the archive and compressed into it
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as tmp:
+        count = _write_scores(documents, tmp, router, batch_size)
+        np.save(os.path.join(tmp, "categories.npy"), np.array(router.score_matrix([])[0]))
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for name in ("ids", "confidence", "signal_counts", "categories"):
+                archive.write(os.path.join(tmp, f"{name}.npy"), arcname=f"{name}.npy")
+    return count
+
+
+def _write_scores(documents: Iterable[Tuple[int, ParsedFeatures]], directory: str,
+                  router: CategoryRouter, batch_size: int) -> int:
+    """The directory layout of export_scores, one batch in memory at a time"""
+    documents = iter(documents)
+    names = router.score_matrix([])[0]
+    streams = {
+        "ids": _NpyStream(os.path.join(directory, "ids.npy"), np.int64),
+        "confidence": _NpyStream(os.path.join(directory, "confidence.npy"), np.float32,
+                                 (len(names),)),
+        "signal_counts": _NpyStream(os.path.join(directory, "signal_counts.npy"), np.int32,
+                                    (len(names),)),
+    }
+    try:
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                break
+            ids, features = zip(*batch)
+            _, confidence, counts = router.score_matrix(features)
+            streams["ids"].append(np.array(ids, dtype=np.int64))
+            streams["confidence"].append(confidence)
+            streams["signal_counts"].append(counts)
+    finally:
+        for stream in streams.values():
+            stream.close()
+    # Plain JSON keeps every .npy loadable without allow_pickle
+    with open(os.path.join(directory, "categories.json"), "w", encoding="utf-8") as fh:
+        json.dump(names, fh)
+    return streams["ids"].rows
+
+
+def load_scores(path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Load arrays written by export_scores; .npy directories are memory-mapped by default"""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+              for name in ("ids", "confidence", "signal_counts")}
+    with open(os.path.join(path, "categories.json"), encoding="utf-8") as fh:
+        arrays["categories"] = np.array(json.load(fh))
+    return arrays
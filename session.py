@@ -0,0 +1,129 @@
+"""
+session.py - Incremental re-analysis of a scenario that is being edited
+
+IncrementalSession keeps the features of every sentence of the current text.
+On update() only sentences it has not seen are parsed; the document features
+are joined from the per-sentence ones (text_parser.join_features) and routed,
+and the IR is assembled from per-sentence model lists that are kept between
+updates, so unchanged sentences cost a list extend rather than new models.
+The generators run only when the IR differs from the previous one. Parsing,
+model construction and code generation then follow the edit; what stays
+linear in the text (splitting, joining, routing) is cheap list work.
+
+    session = IncrementalSession()
+    result = session.update(draft)
+    result = session.update(draft_with_one_sentence_changed)   # parses 1 sentence
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ir import Action, Entity, IRBuilder, Relation
+from pipeline import Pipeline, PipelineResult, get_pipeline
+from text_parser import ParsedFeatures, join_features, split_chunks
+
+
+class _Sentence:
+    """One parsed sentence and the IR models built from it so far"""
+    __slots__ = ("features", "entities", "actions", "relations", "offset")
+
+    def __init__(self, features: ParsedFeatures, builder: IRBuilder):
+        self.features = features
+        self.entities: List[Entity] = builder.entities(features)
+        self.actions: List[Action] = builder.actions(features)
+        self.relations: List[Relation] = []
+        self.offset = -1  # token offset self.relations were built for
+
+    def relations_at(self, offset: int, builder: IRBuilder) -> List[Relation]:
+        """Relations with token indices shifted to offset; rebuilt only when it moved"""
+        if offset != self.offset:
+            self.relations = builder.relations(self.features, offset)
+            self.offset = offset
+        return self.relations
+
+
+@dataclass
+class EditStats:
+    """What one IncrementalSession.update() had to redo"""
+    sentences: int
+    # Sentences not in the previous text, sent to the parser
+    parsed: int
+    # False when the IR came out equal to the previous one and its code was reused
+    regenerated: bool
+
+
+class IncrementalSession:
+    """
+    One scenario under edit, analysed sentence by sentence.
+
+    The document's raw_text is its sentences joined by single spaces, so
+    edits that only reflow whitespace leave the IR, and the code, as it was.
+    Successive results share the models of unchanged sentences, so treat
+    them as read-only. Not thread-safe: use one session per editor.
+    """
+
+    def __init__(self, pipeline: Optional[Pipeline] = None, category: str = "auto",
+                 detail: str = "med", fmt: str = "all", max_chars: int = 10_000):
+        self.pipeline = pipeline or get_pipeline()
+        self.category = category
+        self.detail = detail
+        self.fmt = fmt
+        self.max_chars = max_chars
+        self.result: Optional[PipelineResult] = None
+        self.stats: Optional[EditStats] = None
+        self._sentences: List[str] = []
+        self._parsed: Dict[str, _Sentence] = {}
+
+    def update(self, text: str) -> PipelineResult:
+        """Analyse the new version of the text, reusing everything an edit did not touch"""
+        sentences = list(split_chunks(text, by="sentence", max_chars=self.max_chars))
+        if self.result is not None and sentences == self._sentences:
+            self.stats = EditStats(len(sentences), 0, False)
+            return self.result
+
+        builder = self.pipeline.builder
+        new = [s for s in dict.fromkeys(sentences) if s not in self._parsed]
+        fresh = {text: _Sentence(features, builder)
+                 for text, features in zip(new, self.pipeline.parser.parse_many(new))}
+        # Keep only the current sentences, so memory follows the text, not its history
+        self._parsed = {s: self._parsed.get(s) or fresh[s] for s in sentences}
+        self._sentences = sentences
+
+        parts = [self._parsed[s] for s in sentences]
+        features = join_features([part.features for part in parts], " ".join(sentences))
+        score = self.pipeline.categorize(features, self.category)
+
+        entities, actions, relations = [], [], []
+        offset = 0
+        for part in parts:
+            entities += part.entities
+            actions += part.actions
+            # A sentence repeated in the text is one _Sentence: its relations
+            # are rebuilt for each position, which is rare enough not to matter
+            relations += part.relations_at(offset, builder)
+            offset += part.features.token_count
+        # States are numbered across the whole text (velocity, velocity_2, ...)
+        items = (entities, actions, relations, builder.states(features))
+        ir = builder.build(features, score, detail=self.detail, items=items)
+        result = PipelineResult(features=features, category=score, ir=ir)
+
+        previous = self.result
+        regenerated = previous is None or previous.ir != ir
+        if regenerated:
+            self.pipeline.generate_code(result, self.fmt)
+        else:
+            result.pseudo_code = previous.pseudo_code
+            result.python_code = previous.python_code
+            result.fingerprint = previous.fingerprint
+        self.stats = EditStats(len(sentences), len(new), regenerated)
+        self.result = result
+        return result
+
+
+if __name__ == "__main__":
+    session = IncrementalSession(fmt="pseudo")
+    draft = ("Alice wants to impress Bob. She throws a ball at 20 m/s. "
+             "The ball flies at 45 degrees.")
+    edited = draft.replace("20 m/s", "25 m/s")
+    for text in (draft, edited, edited.replace(". ", ".\n")):
+        result = session.update(text)
+        print(session.stats, result.category.name)
@@ -0,0 +1,59 @@
+"""
+spacy_components.py - Custom spaCy pipeline components used by TextParser
+
+Kept apart from text_parser.py so that importing the parser module (and with
+it ParsedFeatures and the keyword tables) does not import spaCy; the fast
+engine relies on that. TextParser imports this module when it loads a model.
+
+Running signal extraction as a pipeline component means multi-process
+nlp.pipe workers do the matching, and only the small per-domain dict rides
+back on the Doc.
+"""
+from typing import Dict, List, Set
+
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+
+from text_parser import DOMAIN_KEYWORDS, DOMAIN_PHRASES
+
+
+if not Doc.has_extension("domain_signals"):
+    Doc.set_extension("domain_signals", default=None)
+
+
+class DomainSignalMatcher:
+    """Writes {domain: [matched text, ...]} to doc._.domain_signals"""
+
+    def __init__(self, nlp: Language, name: str = "domain_signals"):
+        self.name = name
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        terms: Dict[str, Set[str]] = {domain: set(words) for domain, words in DOMAIN_KEYWORDS.items()}
+        for domain, phrases in DOMAIN_PHRASES.items():
+            terms.setdefault(domain, set()).update(phrases)
+        # Tokenizer only: patterns must not depend on components a profile drops
+        for domain, words in terms.items():
+            self.matcher.add(domain, [nlp.make_doc(word) for word in sorted(words)])
+
+    def __call__(self, doc: Doc) -> Doc:
+        matches = self.matcher(doc)
+        # A word inside a longer phrase ("proof" in "social proof") is not a
+        # separate signal; one word listed under several domains still is
+        covered = set()
+        for _, start, end in matches:
+            if end - start > 1:
+                covered.update(range(start, end))
+
+        signals: Dict[str, List[str]] = {}
+        strings = doc.vocab.strings
+        for match_id, start, end in matches:
+            if end - start == 1 and start in covered:
+                continue
+            signals.setdefault(strings[match_id], []).append(doc[start:end].text)
+        doc._.domain_signals = signals
+        return doc
+
+
+@Language.factory("domain_signals")
+def make_domain_signals(nlp: Language, name: str) -> DomainSignalMatcher:
+    return DomainSignalMatcher(nlp, name)
@@ -10,18 +10,19 @@ from text_parser import TextParser, ParsedFeatures
 from router import CategoryRouter, CategoryScore
 from ir import IRBuilder, IntermediateRepresentation
 from codegen import get_registry
+from pipeline import Pipeline, get_pipeline
 
 
 def test_parser_import():
     """Test that parser imports correctly"""
-    parser = TextParser()
-    assert parser is not None
+    parser = get_pipeline().parser
+    assert isinstance(parser, TextParser)
     assert parser.nlp is not None
 
 
 def test_parser_basic():
     """Test basic parsing functionality"""
-    parser = TextParser()
+    parser = get_pipeline().parser
     text = "A person walks to the store."
     features = parser.parse(text)
 
@@ -33,8 +34,8 @@ def test_parser_basic():
 
 def test_router_psychology():
     """Test routing to psychology category"""
-    parser = TextParser()
-    router = CategoryRouter()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
 
     text = "Someone feels anxious about making a decision."
     features = parser.parse(text)
@@ -47,8 +48,8 @@ def test_router_psychology():
 
 def test_router_physics():
     """Test routing to physics category"""
-    parser = TextParser()
-    router = CategoryRouter()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
 
     text = "A ball falls due to gravity with acceleration."
     features = parser.parse(text)
@@ -60,9 +61,9 @@ def test_router_physics():
 
 def test_ir_builder():
     """Test IR builder"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
 
     text = "A person decides to act."
     features = parser.parse(text)
@@ -79,9 +80,9 @@ def test_ir_builder():
 
 def test_ir_builder_detail_stored():
     """Test that detail level is stored in IR"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
 
     text = "A person thinks carefully."
     features = parser.parse(text)
@@ -92,11 +93,120 @@ def test_ir_builder_detail_stored():
         assert ir.detail == detail
 
 
+def test_ir_builder_trusted_matches_validated():
+    """Test that the trusted (unvalidated) path builds the same IR, down to the JSON"""
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+
+    for text in ("A ball is thrown at 20 m/s at 45 degrees.", "Alice wants to overcome her fear."):
+        features = parser.parse(text)
+        for category in router.route(features):
+            fast = IRBuilder().build(features, category)
+            checked = IRBuilder(validate=True).build(features, category)
+            assert fast == checked
+            assert fast.to_json() == checked.to_json()
+            assert fast.to_compact_json() == checked.to_compact_json()
+
+
+def test_ir_category_builders():
+    """Test table-driven category enrichment: signal-driven vars and registration"""
+    from ir import CategoryBuilder, CATEGORY_BUILDERS, register_category
+
+    features = get_pipeline().parser.parse("Alice has confidence but feels fear.")
+    ir = IRBuilder().build(features, CategoryScore(name="psychology", confidence=0.9, signals=[]))
+    assert ir.psychology_vars == {"confidence_level": 0.7, "anxiety_level": 0.6}
+    assert ir.assumptions[0] == "Actors have internal mental states"
+
+    # Trigger words inside a phrase signal still count ("fear" in "fear of rejection")
+    features = get_pipeline().parser.parse("I live with a fear of rejection.")
+    assert "fear" not in features.psychology_signals
+    ir = IRBuilder().build(features, CategoryScore(name="psychology", confidence=0.9, signals=[]))
+    assert ir.psychology_vars == {"anxiety_level": 0.6}
+
+    # Plural nouns trigger through their lemma
+    for text, expected in (("Her fears keep growing.", {"anxiety_level": 0.6}),
+                           ("His desires shape his choices.", {"desire_strength": 0.8})):
+        features = get_pipeline().parser.parse(text)
+        ir = IRBuilder().build(features, CategoryScore(name="psychology", confidence=0.9, signals=[]))
+        assert ir.psychology_vars == expected, text
+
+    # Builds get their own copies of the frozen templates
+    social = CategoryScore(name="social", confidence=0.9, signals=[])
+    ir.assumptions.append("mutated")
+    first = IRBuilder().build(features, social)
+    first.social_vars["group_influence"] = 0.0
+    assert IRBuilder().build(features, social).social_vars["group_influence"] == 0.7
+
+    register_category("weather", CategoryBuilder(("Weather changes over time",),
+                                                 "environment", {"season": "winter"}))
+    try:
+        ir = IRBuilder().build(features, CategoryScore(name="weather", confidence=0.9, signals=[]))
+        assert ir.assumptions == ["Weather changes over time"]
+        assert ir.environment == {"season": "winter"}
+    finally:
+        del CATEGORY_BUILDERS["weather"]
+
+
+def test_ir_bytes_round_trip():
+    """Test that to_bytes/from_bytes restores an identical IR and rejects other versions"""
+    from ir import Goal, Rule, IR_HEADER
+
+    ir = get_pipeline().run("Alice throws the ball at 20 m/s because she wants to win.",
+                            fmt="pseudo").ir
+    ir.goals.append(Goal(description="win the game"))
+    ir.rules.append(Rule(condition="score > 10", action="stop", priority=2))
+    ir.environment["bounds"] = (0, 100)
+
+    data = ir.to_bytes()
+    restored = IntermediateRepresentation.from_bytes(data)
+    assert restored == ir
+    assert restored.to_json() == ir.to_json()
+    assert len(data) < len(ir.to_compact_json())
+
+    header = len(IR_HEADER)
+    # Another format version, marshal version and Python minor version
+    stale = [data[:offset] + bytes((data[offset] + 1,)) + data[offset + 1:]
+             for offset in (3, 4, header - 1)]
+    truncated = [data[:3], data[:header - 1], data[:header], data[:len(data) // 2]]
+    for bad in stale + truncated + [b"{}", b""]:
+        try:
+            IntermediateRepresentation.from_bytes(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("from_bytes accepted foreign data")
+
+
+def test_ir_batch_matches_models():
+    """Test that IRBatch views equal individually built IRs and from_irs round-trips"""
+    from ir import Entity, Goal
+    from ir_batch import IRBatch
+
+    pipeline = get_pipeline()
+    texts = ["A ball falls due to gravity at 9.8 m/s.", "Someone overcomes fear.",
+             "Optimize the network.", "Players earn points to win."]
+    features = [pipeline.parser.parse(text) for text in texts]
+    scores = [pipeline.router.get_primary_category(f) for f in features]
+    batch = pipeline.builder.build_batch(features, scores, detail="high")
+    irs = [pipeline.builder.build(f, s, detail="high") for f, s in zip(features, scores)]
+
+    assert len(batch) == len(irs)
+    assert list(batch) == irs
+    assert batch[-1] == irs[-1]
+    assert batch.confidence.tolist() == [ir.confidence for ir in irs]
+    assert sum(batch.category_counts().values()) == len(irs)
+
+    irs[0].goals.append(Goal(description="fall"))
+    irs[1].entities.append(Entity(name="fear", type="emotion", properties={"level": 3}))
+    irs[2].environment["bounds"] = (0, 100)
+    assert list(IRBatch.from_irs(irs)) == irs
+
+
 def test_code_generation_pseudo():
     """Test pseudo-code generation"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
     registry = get_registry()
 
     text = "Someone overcomes fear."
@@ -113,9 +223,9 @@ def test_code_generation_pseudo():
 
 def test_code_generation_python():
     """Test Python code generation"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
     registry = get_registry()
 
     text = "A ball is thrown."
@@ -132,8 +242,8 @@ def test_code_generation_python():
 
 def test_multiple_categories():
     """Test that router can identify multiple possible categories"""
-    parser = TextParser()
-    router = CategoryRouter()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
 
     text = "Calculate the force needed to optimize trajectory."
     features = parser.parse(text)
@@ -144,6 +254,325 @@ def test_multiple_categories():
     assert any(cat in ["physics", "mathematics", "optimization"] for cat in category_names)
 
 
+def test_router_matches_whole_words():
+    """Keywords match whole words (plurals included), not substrings"""
+    router = CategoryRouter()
+    assert router.match_keywords("he said life in summer is fun") == {}
+
+    matched = router.match_keywords("fears of peer-reviewed mutations and self-esteem")
+    assert matched["psychology"] == ["fear", "self-esteem"]
+    assert matched["social"] == ["peer"] and matched["biology"] == ["mutation"]
+
+    features = ParsedFeatures(raw_text="She said life is good in summer.")
+    assert router.get_primary_category(features).name == "generic"
+
+
+def test_route_batch_matches_route():
+    """route_batch gives exactly route()'s scores, signals and order per document"""
+    router = CategoryRouter()
+    parser = get_pipeline().parser
+    features_list = [parser.parse(text) for text in (
+        "A ball falls due to gravity with acceleration.",
+        "Someone overcomes fear and anxiety in the group.",
+        "Optimize profit given cost constraints for the startup.",
+        "Nothing to see here.",
+    )]
+    features_list.append(ParsedFeatures(raw_text="fear", psychology_signals=["fear"]))
+
+    assert router.route_batch(features_list) == [router.route(f) for f in features_list]
+    assert router.route_batch([]) == []
+
+
+def test_export_scores_npz_and_mmap():
+    """Exported matrices hold route()'s confidences; the .npy layout loads memory-mapped"""
+    import tempfile
+    import numpy as np
+    from score_export import export_scores, load_scores
+
+    parser = get_pipeline().parser
+    router = CategoryRouter()
+    features_list = [parser.parse(text) for text in (
+        "A ball falls due to gravity.", "Someone overcomes fear in the group.", "Hello there.")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in (os.path.join(tmp, "scores.npz"), os.path.join(tmp, "scores")):
+            assert export_scores(enumerate(features_list, 1), path, router, batch_size=2) == 3
+            scores = load_scores(path)
+            assert scores["ids"].tolist() == [1, 2, 3]
+            assert scores["confidence"].dtype == np.float32
+            categories = scores["categories"].tolist()
+            for row, features in enumerate(features_list):
+                for score in router.route(features):
+                    if score.name != "generic":
+                        column = categories.index(score.name)
+                        assert scores["confidence"][row, column] == np.float32(score.confidence)
+                        assert scores["signal_counts"][row, column] == len(score.signals)
+            assert scores["confidence"][2].sum() == 0  # no match → generic, all-zero row
+        assert isinstance(load_scores(path)["confidence"], np.memmap)
+
+        # Streamed headers are rewritten with the final row count, zero included
+        empty = os.path.join(tmp, "empty")
+        assert export_scores(iter([]), empty, router) == 0
+        assert np.load(os.path.join(empty, "confidence.npy")).shape == (0, len(categories))
+
+
+def test_linear_router_train_save_load():
+    """A trained linear model round-trips through .npz and routes via CategoryRouter"""
+    import tempfile
+    from linear_router import LinearRouter, read_labelled
+
+    texts, labels = read_labelled(os.path.join(os.path.dirname(__file__), "..", "data",
+                                               "routing_examples.tsv"))
+    parser = get_pipeline().parser
+    features_list = [parser.parse(text) for text in texts]
+    model = LinearRouter.train(features_list, labels, n_features=2 ** 12)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "router.npz")
+        model.save(path)
+        loaded = LinearRouter.load(path)
+    assert loaded.labels == model.labels
+
+    router = CategoryRouter(model=loaded)
+    predicted = [router.get_primary_category(f).name for f in features_list]
+    assert sum(p == label for p, label in zip(predicted, labels)) >= 0.9 * len(labels)
+    assert abs(loaded.probabilities(features_list[0]).sum() - 1.0) < 1e-5
+    assert router.route_batch(features_list[:3]) == [router.route(f) for f in features_list[:3]]
+
+
+def test_pipeline_shared():
+    """get_pipeline() hands every caller the same warm components"""
+    pipeline = get_pipeline()
+    assert isinstance(pipeline, Pipeline)
+    assert get_pipeline() is pipeline
+
+    # Narrower profiles reuse the already loaded model instead of reloading it
+    keywords = get_pipeline(profile="keywords")
+    assert keywords.parser.nlp is pipeline.parser.nlp
+    assert keywords.parser.parse("A ball falls.").actions == []
+
+
+def test_pipeline_run():
+    """Pipeline.run covers parse → route → IR → codegen in one call"""
+    result = get_pipeline().run("Optimize the network.", category="opt", detail="high", fmt="pseudo")
+
+    assert result.category.name == "optimization"
+    assert result.ir.detail == "high"
+    assert result.pseudo_code and result.python_code is None
+
+
+def test_ir_fingerprint():
+    """Equal IRs share a fingerprint; any field or the generator version changes it"""
+    from ir import IntermediateRepresentation as IR
+
+    features = get_pipeline().parser.parse("A ball falls due to gravity.")
+    category = get_pipeline().router.get_primary_category(features)
+    first = IRBuilder().build(features, category)
+    second = IRBuilder(validate=True).build(features, category)
+    assert first.fingerprint("1") == second.fingerprint("1")
+    assert first.fingerprint("1") != first.fingerprint("2")
+    assert IR.from_bytes(first.to_bytes()).fingerprint() == first.fingerprint()
+    second.detail = "high"
+    assert first.fingerprint("1") != second.fingerprint("1")
+
+
+def test_result_store_reuses_generated_code():
+    """A stored fingerprint skips the generators; eviction keeps the size bound"""
+    import tempfile
+    from result_store import ResultStore
+
+    class CountingGenerator:
+        calls = 0
+
+        @classmethod
+        def generate_pseudo(cls, ir):
+            cls.calls += 1
+            return f"// {ir.raw_text}"
+
+        generate_python = generate_pseudo
+
+    text = "Sort the boxes on the shelf."
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.sqlite"))
+        pipeline = Pipeline(profile="keywords", store=store)
+        registry = pipeline.registry
+        previous = registry.generators.get("generic")
+        registry.register_generator("generic", CountingGenerator)
+        try:
+            first = pipeline.run(text, category="generic", fmt="all")
+            again = pipeline.run(text, category="generic", fmt="all")
+        finally:
+            if previous is None:
+                del registry.generators["generic"]
+            else:
+                registry.register_generator("generic", previous)
+        assert CountingGenerator.calls == 2  # pseudo + python, once
+        assert again.pseudo_code == first.pseudo_code == f"// {text}"
+        assert again.fingerprint == first.fingerprint
+        assert store.stats.hits == 2
+
+        store.clear()
+        small = ResultStore(os.path.join(tmp, "small.sqlite"), max_bytes=1000)
+        for n in range(50):
+            small.put(f"fp{n}", "pseudo", "x" * 100)
+        assert small.total_bytes <= 1000
+        assert small.get("fp49", "pseudo") == "x" * 100
+        assert small.get("fp0", "pseudo") is None
+        small.close()
+        store.close()
+
+
+def test_renderer_reuses_stored_render():
+    """Stored renderings are replayed only for the same render and rich versions"""
+    import io
+    import tempfile
+    import render
+    from result_store import ResultStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.sqlite"))
+        result = Pipeline(profile="keywords", store=store).run("A ball falls.", fmt="pseudo")
+        renderer = render.OutputRenderer(no_color=True, store=store)
+        renderer.console.file = io.StringIO()
+        renderer.render_result(result, "pseudo")
+        kind = f"render:{render.RENDER_VERSION}:{render.RICH_VERSION}:pseudo:{renderer.style}"
+        assert store.get(result.fingerprint, kind) == renderer.console.file.getvalue()
+
+        previous, render.RENDER_VERSION = render.RENDER_VERSION, "next"
+        try:
+            hits = store.stats.hits
+            renderer.render_result(result, "pseudo")
+            assert store.stats.hits == hits  # a new version is a miss, not a replay
+        finally:
+            render.RENDER_VERSION = previous
+        store.close()
+
+
+def test_incremental_session_reparses_only_edits():
+    """Edits re-parse only changed sentences and match a from-scratch build"""
+    from session import IncrementalSession
+
+    session = IncrementalSession(get_pipeline(), fmt="pseudo")
+    draft = ("Alice wants to impress Bob. She throws a ball at 20 m/s. "
+             "The ball flies at 45 degrees. Bob watches the ball.")
+    first = session.update(draft)
+    assert session.stats.parsed == 4 and session.stats.regenerated
+
+    edited = draft.replace("20 m/s", "25 m/s")
+    result = session.update(edited)
+    assert session.stats.parsed == 1 and session.stats.regenerated
+    rebuilt = IRBuilder().build(result.features, result.category)
+    assert result.ir == rebuilt
+    assert [s.value for s in result.ir.states][:1] == [25.0]
+    assert result.pseudo_code == get_pipeline().registry.generate_pseudo(rebuilt)
+    assert first.ir != result.ir
+
+    # Reflowing whitespace changes nothing: no parse, no code generation
+    reflowed = session.update(edited.replace(". ", ".\n"))
+    assert session.stats.parsed == 0 and not session.stats.regenerated
+    assert reflowed.pseudo_code == result.pseudo_code
+
+
+def test_pipeline_alternatives_concurrent():
+    """Top-k alternatives follow route() order and generate concurrently"""
+    import time
+
+    class SlowRegistry:
+        """Generators that block for 0.2 s, like one waiting on I/O"""
+        def generate_pseudo(self, ir):
+            time.sleep(0.2)
+            return f"// {ir.category}"
+
+        def generate_python(self, ir):
+            return ""
+
+    pipeline = Pipeline(nlp=get_pipeline().parser.nlp)
+    pipeline.registry = SlowRegistry()
+    features = pipeline.parser.parse("AI algorithms optimize network profit for the group.")
+    expected = [score.name for score in pipeline.router.route(features)[:3]]
+    assert len(expected) == 3
+
+    start = time.perf_counter()
+    results = pipeline.alternatives(features, top_k=3, fmt="pseudo")
+    elapsed = time.perf_counter() - start
+
+    assert [r.category.name for r in results] == expected
+    assert [r.ir.category for r in results] == expected
+    assert results[1].pseudo_code == f"// {expected[1]}"
+    assert elapsed < 0.5  # ~0.2 s in parallel, 0.6 s in sequence
+
+
+def test_worker_pool_fork():
+    """Forked workers return the same results as the parent, in input order"""
+    from workers import WorkerPool
+
+    texts = ["A ball falls due to gravity.", "Someone overcomes fear.", "Optimize the network."] * 3
+    with WorkerPool(workers=2, start_method="fork") as pool:
+        results = list(pool.run_many(texts, fmt="pseudo"))
+
+    expected = [get_pipeline().run(text, fmt="pseudo") for text in texts]
+    assert [r.pseudo_code for r in results] == [r.pseudo_code for r in expected]
+    assert [r.ir for r in results] == [r.ir for r in expected]
+    assert len(pool.stats) == 2
+    assert sum(s.processed for s in pool.stats) == len(texts)
+    assert all(s.rss_bytes > 0 for s in pool.stats)
+
+
+def test_worker_pool_router_model():
+    """Workers load the router model given to the pool without touching get_pipeline()"""
+    import tempfile
+    from linear_router import LinearRouter, read_labelled
+    from workers import WorkerPool
+
+    texts, labels = read_labelled(os.path.join(os.path.dirname(__file__), "..", "data",
+                                               "routing_examples.tsv"))
+    parser = get_pipeline().parser
+    features_list = [parser.parse(text) for text in texts]
+    # Shifted labels, so the model disagrees with the default keyword router
+    model = LinearRouter.train(features_list, labels[1:] + labels[:1], n_features=2 ** 12)
+    router = CategoryRouter(model=model)
+    expected = [router.get_primary_category(f).name for f in features_list]
+    assert expected != [CategoryRouter().get_primary_category(f).name for f in features_list]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "router.npz")
+        model.save(path)
+        with WorkerPool(workers=1, start_method="spawn", router_model=path) as pool:
+            results = list(pool.run_many(texts, fmt="pseudo"))
+        assert [r.ir.category for r in results] == expected
+
+        # Forked workers are configured in the parent, on a private pipeline
+        with WorkerPool(workers=1, start_method="fork", router_model=path,
+                        cache_dir=os.path.join(tmp, "cache")) as pool:
+            results = list(pool.run_many(texts, fmt="pseudo"))
+        assert [r.ir.category for r in results] == expected
+    shared = get_pipeline()
+    assert shared.router.model is None and shared.parser.cache.cache_dir is None
+
+
+def test_worker_pool_reports_dead_workers():
+    """A worker that fails to start or dies raises WorkerError instead of hanging"""
+    import signal
+    from workers import WorkerError, WorkerPool
+
+    pool = WorkerPool(workers=1, start_method="spawn", model_name="no_such_model")
+    try:
+        pool.start()
+    except WorkerError as exc:
+        assert "failed to start" in str(exc)
+    else:
+        raise AssertionError("a worker without a model started")
+
+    with WorkerPool(workers=2, start_method="fork") as pool:
+        os.kill(pool._processes[0].pid, signal.SIGKILL)
+        try:
+            list(pool.run_many(["Someone overcomes fear."] * 20, fmt="pseudo"))
+        except WorkerError as exc:
+            assert f"status {-signal.SIGKILL}" in str(exc)
+        else:
+            raise AssertionError("a killed worker went unnoticed")
+
+
 def test_all_registered_categories_generate():
     """Test that every registered category produces non-empty output"""
     registry = get_registry()
@@ -159,11 +588,34 @@ def test_all_registered_categories_generate():
         assert len(python) > 0, f"Empty python for category: {cat_name}"
 
 
+def test_codegen_templates_cached():
+    """Test template slots and that cached registry output matches the generators"""
+    from codegen import CodeGeneratorRegistry, GenericGenerator
+    from codegen.template import Template
+    from ir import Entity
+
+    template = Template(['print(f"{x}") ${a}', "${block}", "end ${a}"])
+    assert template.render(a="{1}", block=["one", "two"]) == 'print(f"{x}") {1}\none\ntwo\nend {1}'
+    assert template.render(a=2, block=[]) == 'print(f"{x}") 2\nend 2'
+
+    registry = CodeGeneratorRegistry()
+    ir = IntermediateRepresentation(raw_text="Alice and Bob trade cards.", category="generic",
+                                    entities=[Entity(name="Alice", type="person")])
+    first = registry.generate_python(ir)
+    assert registry.generate_python(ir.model_copy()) == first
+    assert registry.cache_info().hits == 1
+    assert first == GenericGenerator.generate_python(ir)
+    assert '        "Alice",' in first.splitlines()
+
+    ir.entities.append(Entity(name="Bob", type="person"))
+    assert '        "Bob",' in registry.generate_python(ir).splitlines()
+
+
 def test_end_to_end_psychology():
     """End-to-end test for psychology scenario"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
     registry = get_registry()
 
     text = "A person gains confidence after success."
@@ -181,9 +633,9 @@ def test_end_to_end_psychology():
 
 def test_end_to_end_physics():
     """End-to-end test for physics scenario"""
-    parser = TextParser()
-    router = CategoryRouter()
-    builder = IRBuilder()
+    parser = get_pipeline().parser
+    router = get_pipeline().router
+    builder = get_pipeline().builder
     registry = get_registry()
 
     text = "A projectile moves with velocity and acceleration."
@@ -214,6 +666,17 @@ def test_physics_generated_code_uses_floats():
     )
 
 
+def test_physics_reads_quantities_from_ir():
+    """Velocity and angle come from typed IR states, whatever the word order"""
+    for text in ("A ball thrown at 30 m/s at 60 degrees.",
+                 "At 60 degrees, a ball is thrown at 108 km/h."):
+        result = get_pipeline().run(text, category="physics", fmt="python")
+        velocity = result.ir.state("velocity")
+        assert velocity.unit in ("m/s", "km/h") and velocity.span is not None
+        assert result.ir.state("angle").value == 60.0
+        assert "projectile_motion(v0=30.0, angle_deg=60.0)" in result.python_code
+
+
 def test_social_variance_uses_true_mean():
     """Ensure social dynamics variance is computed with the true mean"""
     from codegen.psychology import SocialGenerator
@@ -240,13 +703,33 @@ if __name__ == "__main__":
     test_router_physics();             print("✓ Router physics")
     test_ir_builder();                 print("✓ IR builder")
     test_ir_builder_detail_stored();   print("✓ IR builder detail level")
+    test_ir_builder_trusted_matches_validated(); print("✓ Trusted IR build")
+    test_ir_category_builders();       print("✓ IR category builders")
+    test_ir_bytes_round_trip();        print("✓ IR binary round trip")
+    test_ir_batch_matches_models();    print("✓ IR batch")
     test_code_generation_pseudo();     print("✓ Code generation (pseudo)")
     test_code_generation_python();     print("✓ Code generation (python)")
     test_multiple_categories();        print("✓ Multiple categories")
+    test_router_matches_whole_words(); print("✓ Router whole words")
+    test_route_batch_matches_route();  print("✓ Batch routing")
+    test_export_scores_npz_and_mmap(); print("✓ Score export")
+    test_linear_router_train_save_load(); print("✓ Linear router")
+    test_pipeline_shared();            print("✓ Shared pipeline")
+    test_pipeline_run();               print("✓ Pipeline run")
+    test_ir_fingerprint();             print("✓ IR fingerprint")
+    test_result_store_reuses_generated_code(); print("✓ Result store")
+    test_renderer_reuses_stored_render(); print("✓ Stored renderings")
+    test_incremental_session_reparses_only_edits(); print("✓ Incremental session")
+    test_pipeline_alternatives_concurrent(); print("✓ Concurrent alternatives")
+    test_worker_pool_fork();           print("✓ Fork worker pool")
+    test_worker_pool_router_model();   print("✓ Worker pool router model")
+    test_worker_pool_reports_dead_workers(); print("✓ Dead workers reported")
     test_all_registered_categories_generate(); print("✓ All categories generate")
+    test_codegen_templates_cached();   print("✓ Codegen template cache")
     test_end_to_end_psychology();      print("✓ End-to-end (psychology)")
     test_end_to_end_physics();         print("✓ End-to-end (physics)")
     test_physics_generated_code_uses_floats(); print("✓ Physics float literals")
+    test_physics_reads_quantities_from_ir(); print("✓ Physics quantities from IR")
     test_social_variance_uses_true_mean();     print("✓ Social variance formula")
 
     print("\n✓ All tests passed!")
@@ -0,0 +1,419 @@
+"""
+tests/test_parser.py - Parser-level tests for WDLIC
+"""
+import sys
+import os
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from text_parser import (TextParser, ParsedFeatures, CompactFeatures, Quantity, select_profile,
+                         split_chunks, KEYWORD_INDEX, DOMAIN_KEYWORDS, RELATION_LABELS, PARSER_VERSION)
+from router import CategoryRouter
+from pipeline import get_pipeline
+from parse_cache import ParseCache
+from fast_parser import FastParser
+
+
+SCENARIOS = [
+    "A person walks to the store.",
+    "A ball falls due to gravity with acceleration.",
+    "Someone overcomes fear and anxiety.",
+    "The goddess weighs justice in perfect harmony.",
+]
+
+
+def test_parse_many_matches_parse():
+    """Batch parsing yields the same features as parse(), in input order"""
+    parser = get_pipeline().parser
+    batched = list(parser.parse_many(iter(SCENARIOS), batch_size=2))
+
+    assert len(batched) == len(SCENARIOS)
+    for text, features in zip(SCENARIOS, batched):
+        assert isinstance(features, ParsedFeatures)
+        assert features.raw_text == text
+        assert features == parser.parse(text)
+
+
+def test_keyword_index_covers_all_domains():
+    """Every domain keyword is indexed lowercase, shared words map to each domain"""
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            assert domain in KEYWORD_INDEX[keyword.lower()]
+    assert set(KEYWORD_INDEX["validation"]) == {"psychology", "social"}
+
+
+def test_domain_signals_single_pass():
+    """Signals for the extended domains are filled alongside the original ones"""
+    parser = get_pipeline(profile="keywords").parser
+    features = parser.parse("AI malware spreads through the cloud network while fear grows.")
+
+    assert features.domain_signals["technology"] == ["AI", "cloud", "network"]
+    assert features.domain_signals["security"] == ["malware"]
+    assert features.psychology_signals == ["fear"]
+    assert features.psychology_signals is features.domain_signals["psychology"]
+    assert "physics" not in features.domain_signals
+
+
+def test_domain_signal_phrases():
+    """Multi-word phrases match inside the pipeline and absorb their words"""
+    parser = get_pipeline().parser
+    doc = parser.nlp("Social proof and low self-esteem fuel peer pressure.")
+    assert doc._.domain_signals["social"] == ["Social proof", "peer pressure"]
+
+    features = parser.parse("Social proof and low self-esteem fuel peer pressure.")
+    assert features.psychology_signals == ["self-esteem"]
+    assert "math" not in features.domain_signals  # "proof" belongs to the phrase
+
+
+def test_domain_signals_from_workers():
+    """Signals computed in nlp.pipe worker processes come back on the Doc"""
+    parser = TextParser(nlp=get_pipeline().parser.nlp)  # uncached: really parse
+    texts = SCENARIOS * 2
+    assert list(parser.parse_many(iter(texts), batch_size=2, n_process=2)) == \
+        [parser.parse(text) for text in texts]
+
+
+def test_select_profile():
+    """The cheapest profile covering the requested fields is chosen"""
+    assert select_profile([]) == "keywords"
+    assert select_profile(["physics_signals", "raw_text"]) == "keywords"
+    assert select_profile(["actions", "math_signals"]) == "pos"
+    assert select_profile(["actors"]) == "entities"
+    assert select_profile(["relations", "actions"]) == "full"
+
+
+def test_keywords_profile_skips_pipeline():
+    """Keywords-only parsing loads no model components but still fills signals"""
+    parser = TextParser(profile="keywords")
+    assert parser.nlp.pipe_names == ["domain_signals"]
+
+    features = parser.parse("A ball falls due to gravity with acceleration.")
+    assert features.physics_signals == ["gravity", "acceleration"]
+    assert features.actions == []
+    assert features.objects == [] and features.relations == []
+
+
+def test_forced_category_profile():
+    """A forced run parses only what its generator reads; the full preview needs relations"""
+    from main import select_parser_profile
+    from codegen import get_registry
+
+    registry = get_registry()
+    assert select_parser_profile("physics", "python", registry) == "keywords"
+    assert select_parser_profile("physics", "pseudo", registry) != "full"
+    assert select_parser_profile("psych", "pseudo", registry) == "entities"
+    assert select_parser_profile("auto", "pseudo", registry) != "full"
+    # --format all prints the IR, relations included, so only then is the parse full
+    assert select_parser_profile("auto", "all", registry) == "full"
+
+
+def test_cli_forced_category_prunes_profile():
+    """A forced-category CLI run builds its pipeline with a pruned parser profile"""
+    from click.testing import CliRunner
+    import main as cli
+
+    profiles = []
+    real_build_pipeline = cli.build_pipeline
+
+    def recording_build_pipeline(**kwargs):
+        profiles.append(kwargs["profile"])
+        return real_build_pipeline(**kwargs)
+
+    cli.build_pipeline = recording_build_pipeline
+    try:
+        for fmt in ("pseudo", "python"):
+            result = CliRunner().invoke(cli.main, ["A ball falls at 9.8 m/s^2.", "--no-color",
+                                                   "--category", "physics", "--format", fmt])
+            assert result.exit_code == 0, result.output
+    finally:
+        cli.build_pipeline = real_build_pipeline
+    assert profiles == ["keywords", "keywords"]
+
+
+def test_cli_run_fills_relations():
+    """The default CLI run parses with a profile that yields IR relations"""
+    from click.testing import CliRunner
+    import main as cli
+
+    result = CliRunner().invoke(cli.main, ["Alice throws the ball to Bob.", "--no-color"])
+    assert result.exit_code == 0, result.output
+    assert "Relations: throws -nsubj-> Alice, throws -dobj-> ball" in result.output
+    assert '"relation_type": "nsubj"' in result.output
+
+
+def test_cli_leaves_shared_pipeline_alone():
+    """CLI options configure the run's own pipeline, never the process-wide ones"""
+    from click.testing import CliRunner
+    import pipeline as shared
+    import main as cli
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = CliRunner().invoke(cli.main, ["A ball falls.", "--no-color", "--format", "pseudo",
+                                               "--cache-dir", os.path.join(tmp, "cache"),
+                                               "--result-store", os.path.join(tmp, "r.sqlite")])
+        assert result.exit_code == 0, result.output
+    for pipeline in shared._pipelines.values():
+        assert pipeline.parser.cache.cache_dir is None and pipeline.store is None
+
+
+def test_cli_export_scores_keeps_line_numbers():
+    """Exported ids are the input line numbers, blank lines skipped"""
+    from click.testing import CliRunner
+    from score_export import load_scores
+    import main as cli
+
+    lines = ["A ball falls.", "", "Fear grows.", "Alice trusts the group."] * 3
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores")
+        result = CliRunner().invoke(cli.main, ["--batch", "-", "--export-scores", path,
+                                               "--batch-size", "2"],
+                                    input="\n".join(lines) + "\n")
+        assert result.exit_code == 0, result.output
+        ids = load_scores(path)["ids"].tolist()
+    assert ids == [n for n, line in enumerate(lines, 1) if line]
+
+
+def test_cli_rejects_top_k_before_loading():
+    """An invalid --top-k combination fails before any pipeline is built"""
+    from click.testing import CliRunner
+    import main as cli
+
+    def no_build(**kwargs):
+        raise AssertionError("pipeline built for a rejected command line")
+
+    real_build_pipeline, cli.build_pipeline = cli.build_pipeline, no_build
+    try:
+        result = CliRunner().invoke(cli.main, ["A ball falls.", "--top-k", "2",
+                                               "--category", "physics"])
+    finally:
+        cli.build_pipeline = real_build_pipeline
+    assert result.exit_code == 2 and "--top-k" in result.output
+
+
+def test_cli_rejects_fast_workers_without_pool():
+    """--workers cannot parallelise the in-process fast engine unless a pool runs it"""
+    from click.testing import CliRunner
+    import main as cli
+
+    result = CliRunner().invoke(cli.main, ["--batch", "-", "--engine", "fast", "--workers", "2"],
+                                input="A ball falls.\n")
+    assert result.exit_code == 2 and "--pool" in result.output
+
+
+def test_parse_cache_lru():
+    """Repeats hit the cache, other spacing misses, the oldest entry is evicted past maxsize"""
+    cache = ParseCache(maxsize=2)
+    parser = TextParser(profile="keywords", nlp=get_pipeline().parser.nlp, cache=cache)
+    assert parser.cache_namespace.startswith(f"v{PARSER_VERSION}-")
+
+    first = parser.parse("A ball falls.")
+    assert parser.parse("A ball falls.") is first
+    # Token-dependent fields belong to one tokenisation, so spacing is part of the key
+    spaced = parser.parse("  A ball   falls. ")
+    assert spaced.raw_text == "  A ball   falls. " and spaced is not first
+    parser.parse("Fear grows.")
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 3, 1)
+    assert cache.get(parser.cache_namespace, "A ball falls.") is None
+
+
+def test_parse_cache_on_disk():
+    """A fresh cache over the same directory serves features without spaCy"""
+    nlp = get_pipeline().parser.nlp
+    with tempfile.TemporaryDirectory() as cache_dir:
+        warm = TextParser(nlp=nlp, cache=ParseCache(cache_dir=cache_dir))
+        expected = warm.parse(SCENARIOS[1])
+
+        cache = ParseCache(cache_dir=cache_dir)
+        restarted = TextParser(nlp=nlp, cache=cache)
+        assert restarted.parse(SCENARIOS[1]) == expected
+        assert cache.stats.disk_hits == 1
+
+
+def test_parse_many_streams_cache_hits():
+    """A fully cached input of unbounded length yields before reading far ahead"""
+    parser = TextParser(nlp=get_pipeline().parser.nlp, cache=ParseCache())
+    expected = parser.parse("A ball falls.")
+    reads = 0
+
+    def endless():
+        nonlocal reads
+        while True:
+            reads += 1
+            yield "A ball falls."
+
+    results = parser.parse_many(endless(), batch_size=4)
+    assert [next(results) for _ in range(6)] == [expected] * 6
+    assert reads == 8  # two chunks of batch_size
+
+
+def test_parse_many_with_cache_keeps_order():
+    """Cached and uncached inputs interleave in input order"""
+    parser = TextParser(nlp=get_pipeline().parser.nlp, cache=ParseCache())
+    parser.parse(SCENARIOS[0])
+    parser.parse(SCENARIOS[2])
+
+    texts = SCENARIOS + SCENARIOS[:1]
+    results = list(parser.parse_many(iter(texts), batch_size=1))
+    assert [f.raw_text for f in results] == texts
+    assert parser.cache.stats.hits == 3
+
+
+def test_split_chunks():
+    """Sentences split on terminal punctuation, paragraphs on blank lines"""
+    lines = iter(["A ball falls. Gravity", "pulls it down!", "", "Fear grows."])
+    assert list(split_chunks(lines)) == ["A ball falls.", "Gravity pulls it down!", "Fear grows."]
+    assert list(split_chunks("One. Two.\n\nThree.", by="paragraph")) == ["One. Two.", "Three."]
+
+
+def test_parse_stream_chunks_and_aggregate():
+    """Each chunk is routable on its own; the aggregate folds them together"""
+    parser = get_pipeline().parser
+    router = CategoryRouter()
+    document = "A ball falls due to gravity with acceleration.\n\nSomeone overcomes fear and anxiety."
+
+    chunks = list(parser.parse_stream(document, by="paragraph"))
+    assert [c.index for c in chunks] == [0, 1]
+    assert chunks[0].features.raw_text.startswith("A ball falls")
+    assert router.get_primary_category(chunks[0].features).name == "physics"
+
+    aggregate = chunks[-1].aggregate
+    assert aggregate.chunks == 2
+    assert aggregate.token_count == sum(c.features.token_count for c in chunks)
+    summary = aggregate.to_features()
+    assert summary.physics_signals == ["gravity", "acceleration"]
+    assert summary.psychology_signals == ["fear", "anxiety"]
+
+
+def test_compact_features_round_trip():
+    """CompactFeatures keeps the public attributes and converts back exactly"""
+    features = get_pipeline().parser.parse(SCENARIOS[1])
+    compact = CompactFeatures.from_features(features)
+
+    assert not hasattr(compact, "__dict__")
+    assert compact.physics_signals == tuple(features.physics_signals)
+    assert compact.to_features() == features
+
+    # Interned: the same word in two documents is one string object
+    other = CompactFeatures.from_features(get_pipeline().parser.parse("Gravity and gravity."))
+    assert other.physics_signals[1] is compact.physics_signals[0]
+
+    router = CategoryRouter()
+    assert router.route(compact) == router.route(features)
+
+
+def test_fast_engine_routes_like_accurate():
+    """The fast engine fills signals/actions and agrees on the category"""
+    fast = FastParser()
+    router = CategoryRouter()
+    features = fast.parse("Alice wants to impress her coworkers with high self-esteem.")
+    assert features.actors == ["Alice"]
+    assert features.actions == ["want", "impress"]
+    assert features.psychology_signals == ["impress", "self-esteem"]
+    assert features.relations == []
+
+    for text in SCENARIOS:
+        assert router.get_primary_category(fast.parse(text)).name == \
+            router.get_primary_category(get_pipeline().parser.parse(text)).name
+
+    result = get_pipeline(engine="fast").run(SCENARIOS[1], fmt="python")
+    assert result.category.name == "physics" and result.python_code
+
+
+def test_fast_engine_never_imports_spacy():
+    """Running the fast pipeline in a fresh interpreter leaves spaCy unloaded"""
+    root = os.path.join(os.path.dirname(__file__), "..")
+    code = ("import sys; from pipeline import get_pipeline; "
+            "get_pipeline(engine='fast').run('A ball falls.'); "
+            "print('spacy' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=root,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
+
+
+def test_quantities_with_units():
+    """Numbers carry canonical units and token spans, in both engines"""
+    text = "Throw it at 45 degrees and 20 m/s for 5 students and $30."
+    features = get_pipeline(profile="keywords").parser.parse(text)
+    assert [(q.value, q.unit) for q in features.quantities] == \
+        [(45.0, "deg"), (20.0, "m/s"), (5.0, None), (30.0, "USD")]
+    assert features.quantities[0] == Quantity(45.0, "deg", 3, 5)
+
+    fast = FastParser().parse(text)
+    assert [(q.value, q.unit) for q in fast.quantities] == \
+        [(q.value, q.unit) for q in features.quantities]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        parser = TextParser(nlp=get_pipeline().parser.nlp, cache=ParseCache(cache_dir=cache_dir))
+        expected = parser.parse(text)
+        restarted = TextParser(nlp=parser.nlp, cache=ParseCache(cache_dir=cache_dir))
+        assert restarted.parse(text).quantities == expected.quantities
+
+
+def test_relations_are_token_triples():
+    """Relations are integer triples; the IR turns them into Relations and arrays"""
+    result = get_pipeline().run("Alice throws the ball.", fmt="pseudo")
+    features = result.features
+    assert (1, RELATION_LABELS.index("nsubj"), 0) in features.relations
+    assert features.relation_tokens[0] == "Alice"
+
+    subject = next(r for r in result.ir.relations if r.relation_type == "nsubj")
+    assert (subject.source, subject.target) == ("throws", "Alice")
+    assert result.ir.relation_array().shape == (len(features.relations), 3)
+
+    nodes, matrix = result.ir.adjacency()
+    head, child = list(nodes).index(1), list(nodes).index(0)
+    assert RELATION_LABELS[matrix[head, child] - 1] == "nsubj"
+
+    empty = get_pipeline(profile="keywords").run("Alice throws the ball.", fmt="pseudo")
+    assert empty.ir.relations == [] and empty.ir.adjacency()[1].shape == (0, 0)
+
+
+def test_array_extraction_matches_token_loop():
+    """The Doc.to_array masks give the same fields as reading Token attributes"""
+    parser = TextParser(nlp=get_pipeline().parser.nlp)
+    doc = parser.nlp("Alice wants 20 apples if it rains, and she must go. Bob should run.")
+    features = parser._extract(doc)
+
+    assert features.actions == [tok.lemma_ for tok in doc if tok.pos_ == "VERB"]
+    assert features.intents == ["must", "should"] and \
+        features.intents == [tok.text for tok in doc if tok.lower_ in ("want", "need", "should", "must")]
+    assert features.conditions == [tok.text for tok in doc if tok.dep_ == "advcl"]
+    assert features.modal_count == sum(tok.tag_ == "MD" for tok in doc)
+    assert features.relations == [(tok.head.i, RELATION_LABELS.index(tok.dep_), tok.i)
+                                  for tok in doc if tok.dep_ in RELATION_LABELS]
+
+
+if __name__ == "__main__":
+    print("Running parser tests...")
+
+    test_parse_many_matches_parse();   print("✓ parse_many matches parse")
+    test_keyword_index_covers_all_domains(); print("✓ Keyword index")
+    test_domain_signals_single_pass(); print("✓ Domain signals")
+    test_domain_signal_phrases();      print("✓ Domain signal phrases")
+    test_domain_signals_from_workers(); print("✓ Domain signals from workers")
+    test_select_profile();             print("✓ Profile selection")
+    test_keywords_profile_skips_pipeline(); print("✓ Keywords profile")
+    test_forced_category_profile();    print("✓ Forced category profile")
+    test_cli_forced_category_prunes_profile(); print("✓ CLI forced category prunes profile")
+    test_cli_run_fills_relations();    print("✓ CLI run fills relations")
+    test_cli_leaves_shared_pipeline_alone(); print("✓ CLI leaves shared pipeline alone")
+    test_cli_export_scores_keeps_line_numbers(); print("✓ CLI export keeps line numbers")
+    test_cli_rejects_top_k_before_loading(); print("✓ CLI rejects --top-k early")
+    test_cli_rejects_fast_workers_without_pool(); print("✓ CLI rejects fast --workers")
+    test_parse_cache_lru();            print("✓ Parse cache LRU")
+    test_parse_cache_on_disk();        print("✓ Parse cache on disk")
+    test_parse_many_streams_cache_hits(); print("✓ parse_many streams cache hits")
+    test_parse_many_with_cache_keeps_order(); print("✓ parse_many with cache")
+    test_split_chunks();               print("✓ Chunk splitting")
+    test_parse_stream_chunks_and_aggregate(); print("✓ Streaming parse")
+    test_compact_features_round_trip(); print("✓ Compact features")
+    test_fast_engine_routes_like_accurate(); print("✓ Fast engine routing")
+    test_fast_engine_never_imports_spacy(); print("✓ Fast engine without spaCy")
+    test_quantities_with_units();      print("✓ Quantities with units")
+    test_relations_are_token_triples(); print("✓ Relation triples")
+    test_array_extraction_matches_token_loop(); print("✓ Array extraction")
+
+    print("\n✓ All tests passed!")
@@ -5,9 +5,17 @@ Renamed from parser.py to avoid shadowing Python's stdlib `parser` module,
 which caused ImportError in Python 3.9+ where the stdlib module was removed
 and confused imports in earlier versions.
 """
-import spacy
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+import re
+import sys
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import (List, Dict, Any, Optional, Iterable, Iterator, FrozenSet, Set, Tuple,
+                    NamedTuple, Sequence, Union)
+
+import numpy as np
 
 # Keyword maps for heuristic enrichment
 
@@ -78,6 +86,208 @@ AI_KEYWORDS = {"neural", "deep", "learning", "model", "training", "dataset",
 SECURITY_KEYWORDS = {"vulnerability", "exploit", "attack", "defense", "firewall",
                      "encryption", "authentication", "authorization", "malware", "phishing"}
 
+# Every keyword set above, by domain name
+DOMAIN_KEYWORDS: Dict[str, Set[str]] = {
+    "belief":        BELIEF_KEYWORDS,
+    "identity":      IDENTITY_KEYWORDS,
+    "morality":      MORALITY_KEYWORDS,
+    "philosophy":    PHILOSOPHY_KEYWORDS,
+    "psychology":    PSYCHOLOGY_KEYWORDS,
+    "social":        SOCIAL_KEYWORDS,
+    "physics":       PHYSICS_KEYWORDS,
+    "math":          MATH_KEYWORDS,
+    "technology":    TECHNOLOGY_KEYWORDS,
+    "biology":       BIOLOGY_KEYWORDS,
+    "chemistry":     CHEMISTRY_KEYWORDS,
+    "medicine":      MEDICINE_KEYWORDS,
+    "neuroscience":  NEUROSCIENCE_KEYWORDS,
+    "linguistics":   LINGUISTICS_KEYWORDS,
+    "art":           ART_KEYWORDS,
+    "history":       HISTORY_KEYWORDS,
+    "geography":     GEOGRAPHY_KEYWORDS,
+    "politics":      POLITICS_KEYWORDS,
+    "economics":     ECONOMICS_KEYWORDS,
+    "business":      BUSINESS_KEYWORDS,
+    "education":     EDUCATION_KEYWORDS,
+    "environment":   ENVIRONMENT_KEYWORDS,
+    "law":           LAW_KEYWORDS,
+    "ethics":        ETHICS_KEYWORDS,
+    "mythology":     MYTHOLOGY_KEYWORDS,
+    "astronomy":     ASTRONOMY_KEYWORDS,
+    "engineering":   ENGINEERING_KEYWORDS,
+    "sports":        SPORTS_KEYWORDS,
+    "music":         MUSIC_KEYWORDS,
+    "food":          FOOD_KEYWORDS,
+    "travel":        TRAVEL_KEYWORDS,
+    "psychotherapy": PSYCHOTHERAPY_KEYWORDS,
+    "ai":            AI_KEYWORDS,
+    "security":      SECURITY_KEYWORDS,
+}
+
+# ParsedFeatures attributes that carry the signals of the original eight domains
+DOMAIN_FIELDS: Dict[str, str] = {
+    "belief":     "beliefs",
+    "identity":   "identity_signals",
+    "morality":   "morality_signals",
+    "philosophy": "philosophy_signals",
+    "psychology": "psychology_signals",
+    "social":     "social_signals",
+    "physics":    "physics_signals",
+    "math":       "math_signals",
+}
+
+
+def build_keyword_index(domains: Dict[str, Set[str]]) -> Dict[str, Tuple[str, ...]]:
+    """Invert domain → keywords into lowercase keyword → domains"""
+    index: Dict[str, List[str]] = {}
+    for domain, keywords in domains.items():
+        for keyword in keywords:
+            index.setdefault(keyword.lower(), []).append(domain)
+    return {keyword: tuple(names) for keyword, names in index.items()}
+
+
+# One dict lookup per token finds every domain a word belongs to, however many
+# domains there are. Keys are lowercase, so "AI", "DNA" etc. match too.
+KEYWORD_INDEX: Dict[str, Tuple[str, ...]] = build_keyword_index(DOMAIN_KEYWORDS)
+
+# Multi-word terms the single-token index can never see
+DOMAIN_PHRASES: Dict[str, Set[str]] = {
+    "psychology": {"self-esteem", "self esteem", "self-awareness", "fear of rejection"},
+    "social":     {"social proof", "peer pressure", "group think"},
+    "ethics":     {"moral dilemma"},
+    "astronomy":  {"black hole"},
+    "ai":         {"machine learning", "neural network", "deep learning"},
+    "technology": {"machine learning"},
+}
+
+# Part of every parse cache namespace (see ParseCache): bump it whenever
+# extraction or the keyword tables above change, so cached features from the
+# previous rules become misses instead of being served as current
+PARSER_VERSION = "2"
+
+
+# Feature profiles — how much of the spaCy pipeline a caller actually needs.
+# Each profile fills the fields listed for it plus everything from the profiles
+# before it, and skips the components listed in PROFILE_EXCLUDES. Component
+# names follow the en_core_web_* pipelines; names a model lacks are ignored.
+FEATURE_PROFILES: Tuple[str, ...] = ("keywords", "pos", "entities", "full")
+
+PROFILE_FIELDS: Dict[str, FrozenSet[str]] = {
+    # Tokenizer only: keyword signals and intents are plain token lookups
+    "keywords": frozenset({
+        "raw_text", "environment", "intents", "domain_signals", "token_count", "quantities",
+        "beliefs", "identity_signals", "morality_signals", "philosophy_signals",
+        "psychology_signals", "social_signals", "physics_signals", "math_signals",
+    }),
+    # Tagger + lemmatizer: verbs for actions, modal tags for uncertainty, and
+    # inflected keywords ("fears") in the *_signals fields, matched by lemma
+    "pos": frozenset({"actions", "uncertainty", "modal_count"}),
+    # NER: PERSON/ORG entities for actors
+    "entities": frozenset({"actors"}),
+    # Dependency parser: noun chunks, subject/object relations, adverbial clauses
+    "full": frozenset({"objects", "relations", "relation_tokens", "conditions"}),
+}
+
+PROFILE_EXCLUDES: Dict[str, Tuple[str, ...]] = {
+    "keywords": ("tok2vec", "tagger", "attribute_ruler", "lemmatizer", "parser", "senter", "ner"),
+    "pos":      ("parser", "senter", "ner"),
+    "entities": ("parser", "senter"),
+    "full":     (),
+}
+
+
+def select_profile(fields: Iterable[str]) -> str:
+    """Return the cheapest feature profile that fills every requested field"""
+    missing = set(fields)
+    for profile in FEATURE_PROFILES:
+        missing -= PROFILE_FIELDS[profile]
+        if not missing:
+            return profile
+    raise ValueError(f"Unknown ParsedFeatures field(s): {sorted(missing)}")
+
+# Dependency labels kept as relations; a relation stores the label's index here
+RELATION_LABELS: Tuple[str, ...] = ("nsubj", "dobj")
+RELATION_CODES: Dict[str, int] = {label: code for code, label in enumerate(RELATION_LABELS)}
+
+INTENT_WORDS: Tuple[str, ...] = ("want", "need", "should", "must")
+
+# Token attributes TextParser._extract reads with one Doc.to_array call, by column
+_ARRAY_ATTRS = ("LOWER", "POS", "TAG", "DEP", "LEMMA", "HEAD", "IDX", "LENGTH", "LIKE_NUM")
+_LOWER, _POS, _TAG, _DEP, _LEMMA, _HEAD, _IDX, _LENGTH, _LIKE_NUM = range(len(_ARRAY_ATTRS))
+
+
+class Quantity(NamedTuple):
+    """A number with its (canonical) unit; start/end are token indices, end exclusive"""
+    value: float
+    unit: Optional[str]
+    start: int
+    end: int
+
+
+# Canonical unit for every spelling the unit grammar accepts (lowercased)
+UNIT_ALIASES: Dict[str, str] = {
+    "m/s^2": "m/s^2", "m/s²": "m/s^2", "m/s2": "m/s^2",
+    "m/s": "m/s", "mps": "m/s", "km/h": "km/h", "kph": "km/h", "kmh": "km/h", "mph": "mph",
+    "km": "km", "cm": "cm", "mm": "mm", "m": "m", "meter": "m", "meters": "m",
+    "metre": "m", "metres": "m",
+    "kg": "kg", "kilogram": "kg", "kilograms": "kg", "g": "g", "gram": "g", "grams": "g",
+    "ms": "ms", "s": "s", "sec": "s", "secs": "s", "second": "s", "seconds": "s",
+    "min": "min", "mins": "min", "minute": "min", "minutes": "min",
+    "h": "h", "hr": "h", "hrs": "h", "hour": "h", "hours": "h",
+    "°": "deg", "deg": "deg", "degree": "deg", "degrees": "deg",
+    "rad": "rad", "radian": "rad", "radians": "rad",
+    "n": "N", "newton": "N", "newtons": "N", "j": "J", "joule": "J", "joules": "J",
+    "w": "W", "watt": "W", "watts": "W", "hz": "Hz", "hertz": "Hz",
+    "%": "%", "percent": "%",
+}
+
+# Unit right after a number: longest alias first so "m/s^2" beats "m/s" beats
+# "m", and no letter may follow so "5 students" is not "5 s"
+_UNIT_RE = re.compile(
+    r"\s*(" + "|".join(re.escape(unit) for unit in sorted(UNIT_ALIASES, key=len, reverse=True))
+    + r")(?![A-Za-z0-9])",
+    re.IGNORECASE,
+)
+NUMBER_WORDS: Dict[str, float] = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "twenty": 20, "thirty": 30,
+    "forty": 40, "fifty": 50, "hundred": 100, "thousand": 1000,
+}
+
+
+def number_value(text: str) -> Optional[float]:
+    """Numeric value of a number token ("20", "1,500", "9.81", "twenty"), else None"""
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        value = NUMBER_WORDS.get(text.lower())
+        return None if value is None else float(value)
+
+
+def match_quantities(text: str, numbers: Iterable[Tuple[int, int, int]],
+                     token_starts: List[int]) -> List["Quantity"]:
+    """
+    Attach units to number tokens.
+
+    numbers are (token index, start char, end char) of each number-like token;
+    token_starts are the start offsets of all tokens, used to turn the end of
+    a matched unit back into a token index. Shared by both parse engines.
+    """
+    quantities = []
+    for i, start, end in numbers:
+        value = number_value(text[start:end])
+        if value is None:
+            continue
+        unit, stop = None, i + 1
+        match = _UNIT_RE.match(text, end)
+        if match:
+            unit = UNIT_ALIASES[match.group(1).lower()]
+            stop = bisect_left(token_starts, match.end())
+        elif start and text[start - 1] == "$":
+            unit = "USD"
+        quantities.append(Quantity(value, unit, i, stop))
+    return quantities
+
 
 @dataclass
 class ParsedFeatures:
@@ -85,11 +295,19 @@ class ParsedFeatures:
     actors: List[str] = field(default_factory=list)
     objects: List[str] = field(default_factory=list)
     actions: List[str] = field(default_factory=list)
-    relations: List[str] = field(default_factory=list)
+    # (head token index, RELATION_LABELS code, child token index)
+    relations: List[Tuple[int, int, int]] = field(default_factory=list)
+    # Text of every token a relation refers to, by token index
+    relation_tokens: Dict[int, str] = field(default_factory=dict)
     intents: List[str] = field(default_factory=list)
     conditions: List[str] = field(default_factory=list)
     environment: Dict[str, Any] = field(default_factory=dict)
     uncertainty: float = 0.0
+    # Raw counts behind uncertainty, kept so chunked parses can be combined
+    token_count: int = 0
+    modal_count: int = 0
+    # Numbers with units, extracted once here so nothing downstream re-scans raw_text
+    quantities: List[Quantity] = field(default_factory=list)
 
     # Extended enrichers
     beliefs: List[str] = field(default_factory=list)
@@ -100,49 +318,406 @@ class ParsedFeatures:
     social_signals: List[str] = field(default_factory=list)
     physics_signals: List[str] = field(default_factory=list)
     math_signals: List[str] = field(default_factory=list)
+    # Signals for every domain in DOMAIN_KEYWORDS that matched at least once
+    domain_signals: Dict[str, List[str]] = field(default_factory=dict)
 
     raw_text: str = ""
 
 
+# Shared read-only stand-in for empty dict fields in CompactFeatures
+_EMPTY_MAPPING = MappingProxyType({})
+
+
+def _compact_value(value):
+    """Lists → tuples with interned strings, dicts → dicts of compacted values"""
+    if isinstance(value, list):
+        if not value:
+            return ()
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+    if isinstance(value, dict):
+        if not value:
+            return _EMPTY_MAPPING
+        return {(sys.intern(k) if isinstance(k, str) else k):
+                (sys.intern(v) if isinstance(v, str) else _compact_value(v))
+                for k, v in value.items()}
+    return value
+
+
+def _expand_value(value):
+    """Inverse of _compact_value: fresh, mutable lists and dicts"""
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _expand_value(v) for k, v in value.items()}
+    return value
+
+
+class CompactFeatures:
+    """
+    Slotted, interned counterpart of ParsedFeatures for high-volume batch jobs.
+
+    Same public attributes as ParsedFeatures, but list fields are tuples of
+    sys.intern()ed strings (empty ones all share ()), and empty dicts share one
+    read-only mapping. Repeated words across documents then cost one pointer
+    per occurrence instead of a fresh string. Read-only by convention; use
+    to_features() for a mutable copy. Router and IRBuilder accept either.
+    """
+
+    __slots__ = tuple(f.name for f in fields(ParsedFeatures))
+
+    def __init__(self, **values):
+        for f in fields(ParsedFeatures):
+            default = f.default_factory() if callable(f.default_factory) else f.default
+            setattr(self, f.name, _compact_value(values.get(f.name, default)))
+
+    @classmethod
+    def from_features(cls, features: ParsedFeatures) -> "CompactFeatures":
+        """Compact an existing ParsedFeatures"""
+        return cls(**{name: getattr(features, name) for name in cls.__slots__})
+
+    def to_features(self) -> ParsedFeatures:
+        """Expand back into a regular, mutable ParsedFeatures"""
+        return ParsedFeatures(**{name: _expand_value(getattr(self, name)) for name in self.__slots__})
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactFeatures):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"CompactFeatures(raw_text={self.raw_text!r})"
+
+
+# Sentence boundary for streaming: terminal punctuation, optional closing
+# quote/bracket, then whitespace. Deliberately cheap — no Doc is needed.
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+")
+
+
+def split_chunks(source: Union[str, Iterable[str]], by: str = "sentence",
+                 max_chars: int = 10_000) -> Iterator[str]:
+    """
+    Lazily split long input into paragraph or sentence chunks.
+
+    source is a string or any iterable of lines (an open file streams without
+    being read into memory). Paragraphs end at blank lines; sentences also end
+    after ., ! or ?. A chunk that grows past max_chars is cut there so one
+    runaway paragraph cannot make memory grow with the input.
+    """
+    if by not in ("sentence", "paragraph"):
+        raise ValueError(f"Unknown chunk mode '{by}', expected 'sentence' or 'paragraph'")
+    lines = source.splitlines() if isinstance(source, str) else source
+
+    buffer = ""
+    for line in lines:
+        if not line.strip():
+            if buffer.strip():
+                yield buffer.strip()
+            buffer = ""
+            continue
+        buffer = f"{buffer} {line.strip()}" if buffer else line.strip()
+        if by == "sentence":
+            parts = _SENTENCE_END.split(buffer)
+            buffer = parts.pop()
+            for part in parts:
+                if part.strip():
+                    yield part.strip()
+        while len(buffer) > max_chars:
+            yield buffer[:max_chars]
+            buffer = buffer[max_chars:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class FeatureAggregate:
+    """
+    Running totals over streamed chunks.
+
+    Keeps counts of distinct values per list field instead of the values
+    themselves, so memory grows with the vocabulary, not the input length.
+    """
+
+    FIELDS = ("actors", "objects", "actions", "intents", "conditions",
+              "beliefs", "identity_signals", "morality_signals", "philosophy_signals",
+              "psychology_signals", "social_signals", "physics_signals", "math_signals")
+
+    def __init__(self):
+        self.chunks = 0
+        self.token_count = 0
+        self.modal_count = 0
+        self.counts: Dict[str, Counter] = {name: Counter() for name in self.FIELDS}
+        self.domain_counts: Dict[str, Counter] = {}
+
+    def add(self, features: ParsedFeatures) -> None:
+        """Fold one chunk's features into the totals"""
+        self.chunks += 1
+        self.token_count += features.token_count
+        self.modal_count += features.modal_count
+        for name in self.FIELDS:
+            self.counts[name].update(getattr(features, name))
+        for domain, signals in features.domain_signals.items():
+            self.domain_counts.setdefault(domain, Counter()).update(signals)
+
+    @property
+    def uncertainty(self) -> float:
+        """Same modal-density heuristic as TextParser, over everything seen so far"""
+        return min(self.modal_count / max(self.token_count, 1) * 5, 1.0)
+
+    def to_features(self) -> ParsedFeatures:
+        """Document-level summary: distinct values per field, most frequent first"""
+        lists = {name: [value for value, _ in counts.most_common()]
+                 for name, counts in self.counts.items()}
+        return ParsedFeatures(
+            uncertainty=self.uncertainty,
+            token_count=self.token_count,
+            modal_count=self.modal_count,
+            domain_signals={domain: [value for value, _ in counts.most_common()]
+                            for domain, counts in self.domain_counts.items()},
+            **lists,
+        )
+
+
+def join_features(parts: Sequence[ParsedFeatures], raw_text: str) -> ParsedFeatures:
+    """
+    Features of consecutive pieces of one text (e.g. its sentences) as one document.
+
+    Lists are concatenated in order and counts summed. Token indices in
+    relations, relation_tokens and quantities are shifted by the tokens of
+    the pieces before them, so they count tokens across all the pieces.
+    The parts are left untouched (they may be shared cache entries).
+    """
+    joined = ParsedFeatures(raw_text=raw_text)
+    for name in FeatureAggregate.FIELDS:
+        setattr(joined, name, list(chain.from_iterable(getattr(part, name) for part in parts)))
+    offset = 0
+    for part in parts:
+        if offset:
+            joined.relations.extend([(head + offset, code, child + offset)
+                                     for head, code, child in part.relations])
+            joined.relation_tokens.update({index + offset: token
+                                           for index, token in part.relation_tokens.items()})
+            joined.quantities.extend([q._replace(start=q.start + offset, end=q.end + offset)
+                                      for q in part.quantities])
+        else:
+            joined.relations.extend(part.relations)
+            joined.relation_tokens.update(part.relation_tokens)
+            joined.quantities.extend(part.quantities)
+        if part.environment:
+            joined.environment.update(part.environment)
+        for domain, signals in part.domain_signals.items():
+            joined.domain_signals.setdefault(domain, []).extend(signals)
+        joined.modal_count += part.modal_count
+        offset += part.token_count
+    joined.token_count = offset
+    joined.uncertainty = min(joined.modal_count / max(joined.token_count, 1) * 5, 1.0)
+    return joined
+
+
+class StreamChunk(NamedTuple):
+    """One parsed chunk from TextParser.parse_stream"""
+    index: int
+    features: ParsedFeatures
+    # Shared running aggregate, already updated with this chunk
+    aggregate: FeatureAggregate
+
+
+def load_model(model_name: str = "en_core_web_sm", exclude: Iterable[str] = ()):
+    """Load a spaCy model, downloading it first if it is not installed"""
+    # spaCy is imported here, not at module level, so the spaCy-free fast
+    # engine (fast_parser.py) can use ParsedFeatures and the keyword tables
+    import spacy
+    import spacy_components  # noqa: F401 — registers the domain_signals factory
+
+    exclude = list(exclude)
+    try:
+        return spacy.load(model_name, exclude=exclude)
+    except OSError:
+        print(f"spaCy model '{model_name}' not found. Downloading...")
+        import subprocess
+        subprocess.run(["python", "-m", "spacy", "download", model_name], check=True)
+        return spacy.load(model_name, exclude=exclude)
+
+
 class TextParser:
     """Parser using spaCy for NLP analysis"""
 
-    def __init__(self, model_name: str = "en_core_web_sm"):
-        """Initialize parser with spaCy model"""
-        try:
-            self.nlp = spacy.load(model_name)
-        except OSError:
-            print(f"spaCy model '{model_name}' not found. Downloading...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", model_name], check=True)
-            self.nlp = spacy.load(model_name)
+    def __init__(self, model_name: str = "en_core_web_sm", profile: str = "full", nlp=None,
+                 cache=None):
+        """
+        Initialize parser with spaCy model.
+
+        profile selects which fields get filled (see FEATURE_PROFILES); the
+        components it does not need are never loaded. Fields outside the
+        profile are left empty. Pass an already loaded nlp to share one model
+        between parsers; components the profile does not need are then
+        disabled per call instead. cache is an optional parse_cache.ParseCache
+        consulted before running spaCy.
+        """
+        if profile not in PROFILE_EXCLUDES:
+            raise ValueError(
+                f"Unknown feature profile '{profile}', expected one of {FEATURE_PROFILES}"
+            )
+        self.profile = profile
+        if nlp is None:
+            nlp = load_model(model_name, exclude=PROFILE_EXCLUDES[profile])
+        # Note: a shared nlp gets the domain_signals component added in place
+        import spacy_components  # noqa: F401 — registers factory and Doc._.domain_signals
+        if "domain_signals" not in nlp.pipe_names:
+            nlp.add_pipe("domain_signals", last=True)
+        self.nlp = nlp
+        self._disable = [name for name in nlp.pipe_names if name in PROFILE_EXCLUDES[profile]]
+        self.cache = cache
+
+        # Attribute IDs and the hash/enum values _extract compares against.
+        # String hashes are stable, so these also hold for Docs from n_process workers
+        import spacy.attrs
+        from spacy.parts_of_speech import IDS as POS_IDS
+        strings = nlp.vocab.strings
+        self._attrs = [getattr(spacy.attrs, name) for name in _ARRAY_ATTRS]
+        self._intent_hashes = np.array([strings[word] for word in INTENT_WORDS], dtype=np.uint64)
+        self._keyword_hashes = np.array([strings[word] for word in KEYWORD_INDEX], dtype=np.uint64)
+        self._relation_codes = {strings[label]: code for label, code in RELATION_CODES.items()}
+        self._relation_hashes = np.array(list(self._relation_codes), dtype=np.uint64)
+        self._verb, self._num = POS_IDS["VERB"], POS_IDS["NUM"]
+        self._modal, self._advcl = strings["MD"], strings["advcl"]
+
+    @property
+    def cache_namespace(self) -> str:
+        """Identifies parser version, model, model version and profile for cached features"""
+        meta = self.nlp.meta
+        return (f"v{PARSER_VERSION}-{meta.get('lang', 'xx')}_{meta.get('name', 'blank')}"
+                f"-{meta.get('version', '0')}-{self.profile}")
 
     def parse(self, text: str) -> ParsedFeatures:
         """Parse text and extract structured features"""
-        doc = self.nlp(text)
+        if self.cache is None:
+            return self._extract(self.nlp(text, disable=self._disable))
+
+        namespace = self.cache_namespace
+        features = self.cache.get(namespace, text)
+        if features is None:
+            features = self._extract(self.nlp(text, disable=self._disable))
+            self.cache.put(namespace, text, features)
+        return features
+
+    def parse_many(self, texts: Iterable[str], batch_size: int = 64,
+                   n_process: int = 1) -> Iterator[ParsedFeatures]:
+        """
+        Parse a stream of texts, yielding ParsedFeatures in input order.
+
+        Texts are fed through nlp.pipe so spaCy can batch them; n_process > 1
+        spreads the batches across worker processes. The input is consumed
+        lazily, so this works on generators of arbitrary length. With a cache,
+        input is read batch_size × n_process texts at a time and only each
+        chunk's misses are sent to spaCy.
+        """
+        if self.cache is None:
+            docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process,
+                                 disable=self._disable)
+            for doc in docs:
+                yield self._extract(doc)
+            return
+
+        # Input is read a chunk at a time: the chunk's hits come straight from
+        # the cache and only its misses go to spaCy, so a run of hits is
+        # returned as it is read instead of waiting for the next miss
+        namespace = self.cache_namespace
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, batch_size * n_process))
+            if not chunk:
+                return
+            cached = [self.cache.get(namespace, text) for text in chunk]
+            # Each distinct miss is parsed once, however often the chunk repeats it
+            misses = list(dict.fromkeys(text for text, features in zip(chunk, cached)
+                                        if features is None))
+            parsed: Dict[str, ParsedFeatures] = {}
+            if misses:
+                docs = self.nlp.pipe(misses, batch_size=batch_size, n_process=n_process,
+                                     disable=self._disable)
+                parsed = dict(zip(misses, map(self._extract, docs)))
+                for text, features in parsed.items():
+                    self.cache.put(namespace, text, features)
+            for text, features in zip(chunk, cached):
+                yield parsed[text] if features is None else features
+
+    def parse_stream(self, source: Union[str, Iterable[str]], by: str = "sentence",
+                     batch_size: int = 32, n_process: int = 1,
+                     max_chars: int = 10_000) -> Iterator[StreamChunk]:
+        """
+        Parse long input chunk by chunk (see split_chunks) with flat memory.
+
+        Each yielded StreamChunk carries the chunk's own features, whose
+        raw_text is the chunk, so CategoryRouter.route() can classify it, and
+        the running FeatureAggregate for the document so far.
+        """
+        aggregate = FeatureAggregate()
+        chunks = split_chunks(source, by=by, max_chars=max_chars)
+        features_stream = self.parse_many(chunks, batch_size=batch_size, n_process=n_process)
+        for index, features in enumerate(features_stream):
+            aggregate.add(features)
+            yield StreamChunk(index, features, aggregate)
+
+    def _extract(self, doc) -> ParsedFeatures:
+        """Extract structured features from an already processed Doc"""
+        text = doc.text
+        strings = doc.vocab.strings
+
+        # One (tokens × attributes) uint64 array replaces a pass per field over
+        # Token objects; only tokens that match a mask are touched in Python.
+        # Annotations a pruned profile did not set read as 0 and match nothing.
+        array = doc.to_array(self._attrs)
+        starts = array[:, _IDX]
+        ends = starts + array[:, _LENGTH]
+
+        def texts(indices):
+            return [text[s:e] for s, e in zip(starts[indices].tolist(), ends[indices].tolist())]
 
-        # Basic extraction
         actors = [ent.text for ent in doc.ents if ent.label_ in ("PERSON", "ORG")]
-        objects = [chunk.text for chunk in doc.noun_chunks]
-        actions = [token.lemma_ for token in doc if token.pos_ == "VERB"]
-        relations = [f"{tok.head.text} → {tok.text}" for tok in doc if tok.dep_ in ("nsubj", "dobj")]
-        conditions = [tok.text for tok in doc if tok.dep_ == "advcl"]
-        intents = [tok.text for tok in doc if tok.text.lower() in ("want", "need", "should", "must")]
-
-        # Heuristic enrichers — compare lowercased token text against lowercase keyword sets
-        beliefs = [tok.text for tok in doc if tok.text.lower() in BELIEF_KEYWORDS]
-        identity_signals = [tok.text for tok in doc if tok.text.lower() in IDENTITY_KEYWORDS]
-        morality_signals = [tok.text for tok in doc if tok.text.lower() in MORALITY_KEYWORDS]
-        philosophy_signals = [tok.text for tok in doc if tok.text.lower() in PHILOSOPHY_KEYWORDS]
-        psychology_signals = [tok.text for tok in doc if tok.text.lower() in PSYCHOLOGY_KEYWORDS]
-        social_signals = [tok.text for tok in doc if tok.text.lower() in SOCIAL_KEYWORDS]
-        physics_signals = [tok.text for tok in doc if tok.text.lower() in PHYSICS_KEYWORDS]
-        math_signals = [tok.text for tok in doc if tok.text.lower() in MATH_KEYWORDS]
+        actions = [strings[h] for h in array[array[:, _POS] == self._verb, _LEMMA].tolist()]
+        intents = texts(np.isin(array[:, _LOWER], self._intent_hashes))
+
+        # Without a parser (pruned profile) doc.noun_chunks would raise
+        if doc.has_annotation("DEP"):
+            objects = [chunk.text for chunk in doc.noun_chunks]
+            conditions = texts(array[:, _DEP] == self._advcl)
+            # Integer triples; HEAD is stored as an offset from the token
+            children = np.flatnonzero(np.isin(array[:, _DEP], self._relation_hashes))
+            heads = children + array[children, _HEAD].view(np.int64)
+            codes = [self._relation_codes[h] for h in array[children, _DEP].tolist()]
+            relations = list(zip(heads.tolist(), codes, children.tolist()))
+            involved = np.union1d(heads, children)
+            relation_tokens = dict(zip(involved.tolist(), texts(involved)))
+        else:
+            objects, relations, relation_tokens, conditions = [], [], {}, []
+
+        # like_num is lexical, so quantities need no tagger; NUM covers the rest when tagged
+        numbers = np.flatnonzero((array[:, _LIKE_NUM] == 1) | (array[:, _POS] == self._num))
+        quantities = []
+        if len(numbers):
+            quantities = match_quantities(
+                text,
+                zip(numbers.tolist(), starts[numbers].tolist(), ends[numbers].tolist()),
+                starts.tolist(),
+            )
+
+        # Heuristic enrichers — filled in-pipeline by DomainSignalMatcher, which
+        # TextParser adds to every model it parses with
+        domain_signals = doc._.domain_signals
+        # The matcher compares lowercase text; inflected keywords ("fears",
+        # "desires") are found by lemma and recorded as the keyword itself
+        inflected = np.flatnonzero((array[:, _LEMMA] != array[:, _LOWER])
+                                   & np.isin(array[:, _LEMMA], self._keyword_hashes))
+        if len(inflected):
+            domain_signals = {domain: list(words) for domain, words in domain_signals.items()}
+            for lemma in array[inflected, _LEMMA].tolist():
+                for domain in KEYWORD_INDEX[strings[lemma]]:
+                    domain_signals.setdefault(domain, []).append(strings[lemma])
+        signals = {attr: domain_signals.get(domain, []) for domain, attr in DOMAIN_FIELDS.items()}
 
         # Uncertainty heuristic: modal verbs relative to sentence length
         # FIX: original included ALL verbs (VB tag), inflating the count falsely.
         # Only true modals (MD tag) contribute to uncertainty.
-        modal_count = sum(1 for tok in doc if tok.tag_ == "MD")
+        modal_count = int(np.count_nonzero(array[:, _TAG] == self._modal))
         uncertainty = min(modal_count / max(len(doc), 1) * 5, 1.0)
 
         return ParsedFeatures(
@@ -150,19 +725,17 @@ class TextParser:
             objects=objects,
             actions=actions,
             relations=relations,
+            relation_tokens=relation_tokens,
             intents=intents,
             conditions=conditions,
             environment={},
             uncertainty=uncertainty,
-            beliefs=beliefs,
-            identity_signals=identity_signals,
-            morality_signals=morality_signals,
-            philosophy_signals=philosophy_signals,
-            psychology_signals=psychology_signals,
-            social_signals=social_signals,
-            physics_signals=physics_signals,
-            math_signals=math_signals,
+            token_count=len(doc),
+            modal_count=modal_count,
+            quantities=quantities,
+            domain_signals=domain_signals,
             raw_text=text,
+            **signals,
         )
 
 
@@ -171,3 +744,6 @@ if __name__ == "__main__":
     sample = "The goddess Themis weighs justice and forgiveness, while fear and anxiety test identity."
     parsed = parser.parse(sample)
     print(parsed)
+
+    for features in parser.parse_many([sample, "A ball falls due to gravity."]):
+        print(features.physics_signals, features.identity_signals)
@@ -0,0 +1,266 @@
+"""
+workers.py - Pre-fork worker pool sharing one warm Pipeline copy-on-write
+
+With start_method="fork" the parent loads the spaCy model, router and
+generator registry once, freezes the garbage collector so the loaded objects
+are never touched by a collection, and forks the workers. Each worker then
+shares the model pages with the parent instead of holding its own copy.
+start_method="spawn" loads a fresh Pipeline in every worker and is kept for
+platforms without fork and for comparing memory (see
+benchmarks/bench_worker_pool.py).
+
+Scenarios are handed out over a queue and results come back in input order,
+with the IR sent as IntermediateRepresentation.to_bytes() rather than pickled.
+A worker that fails to start, fails a scenario or dies raises WorkerError in
+the parent instead of leaving it waiting.
+"""
+import gc
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ir import IntermediateRepresentation
+from pipeline import Pipeline, PipelineResult, build_pipeline
+from result_store import ResultStore
+
+# Seconds between worker liveness checks while the parent waits for a message
+POLL_SECONDS = 1.0
+
+
+class WorkerError(RuntimeError):
+    """A worker failed or died; the message has its traceback or exit status"""
+
+
+@dataclass
+class WorkerStats:
+    """What one worker did, reported when the pool closes"""
+    pid: int
+    processed: int
+    busy_seconds: float
+    # Time to become ready: ~0 for forked workers, a full model load for spawned ones
+    startup_seconds: float
+    rss_bytes: int
+    # Proportional set size: shared pages split between the processes sharing them
+    pss_bytes: int
+
+    @property
+    def throughput(self) -> float:
+        """Scenarios per second of busy time"""
+        return self.processed / self.busy_seconds if self.busy_seconds else 0.0
+
+
+def memory_usage() -> Tuple[int, int]:
+    """(RSS, PSS) of this process in bytes; PSS is 0 where /proc has no smaps_rollup"""
+    rss = pss = 0
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            for line in fh:
+                if line.startswith("Rss:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("Pss:"):
+                    pss = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+        # ru_maxrss is the peak, in kB on Linux; close enough where /proc is missing
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return rss, pss
+
+
+def _worker(pipeline: Optional[Pipeline], spec: tuple, store_spec: tuple, tasks, results) -> None:
+    """Worker loop: (index, text, options) in, (kind, index or pid, payload) out"""
+    start = time.perf_counter()
+    try:
+        if pipeline is None:
+            pipeline = build_pipeline(*spec)  # spawned: nothing was inherited
+        else:
+            gc.enable()
+        # Every worker opens its own connection; an inherited one must not be used
+        store_path, store_bytes = store_spec
+        pipeline.store = ResultStore(store_path, store_bytes) if store_path is not None else None
+    except Exception:
+        results.put(("error", os.getpid(), traceback.format_exc()))
+        return
+    startup = time.perf_counter() - start
+    results.put(("ready", os.getpid(), startup))
+
+    processed, busy = 0, 0.0
+    for index, text, options in iter(tasks.get, None):
+        began = time.perf_counter()
+        try:
+            result = pipeline.run(text, **options)
+            message = ("result", index, replace(result, ir=result.ir.to_bytes()))
+        except Exception:  # sent as text: the exception itself may not pickle
+            message = ("error", index, traceback.format_exc())
+        busy += time.perf_counter() - began
+        processed += 1
+        results.put(message)
+
+    rss, pss = memory_usage()
+    results.put(("stats", os.getpid(),
+                 WorkerStats(os.getpid(), processed, busy, startup, rss, pss)))
+
+
+class WorkerPool:
+    """
+    Fixed set of worker processes running Pipeline.run.
+
+    Use as a context manager; stats (one WorkerStats per worker) is filled
+    when the pool closes.
+    """
+
+    def __init__(self, workers: int = 2, start_method: str = "fork",
+                 model_name: str = "en_core_web_sm", profile: str = "full",
+                 engine: str = "accurate", cache_dir: Optional[str] = None,
+                 router_model: Optional[str] = None,
+                 store_path: Optional[str] = None, store_bytes: int = 64 * 2**20):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.start_method = start_method
+        self.spec = (model_name, profile, engine, cache_dir, router_model)
+        self.store_spec = (store_path, store_bytes)
+        self.context = multiprocessing.get_context(start_method)
+        self.stats: List[WorkerStats] = []
+        self.startup_seconds = 0.0
+        self._processes = []
+        self._tasks = self._results = None
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> float:
+        """Start the workers and wait until all are ready; returns the seconds taken"""
+        began = time.perf_counter()
+        self._tasks = self.context.Queue()
+        self._results = self.context.Queue()
+
+        pipeline = None
+        if self.start_method == "fork":
+            pipeline = build_pipeline(*self.spec)
+            # Move everything loaded so far out of the collector's reach: a
+            # collection in a child would otherwise write to (and so copy)
+            # every page holding a tracked object
+            gc.disable()
+            gc.freeze()
+        try:
+            for _ in range(self.workers):
+                process = self.context.Process(
+                    target=_worker,
+                    args=(pipeline, self.spec, self.store_spec, self._tasks, self._results),
+                    daemon=True,
+                )
+                process.start()
+                self._processes.append(process)
+        finally:
+            if pipeline is not None:
+                gc.unfreeze()
+                gc.enable()
+
+        try:
+            for _ in range(self.workers):
+                kind, pid, payload = self._get(self._processes)  # ("ready", pid, seconds)
+                if kind == "error":
+                    raise WorkerError(f"worker {pid} failed to start:\n{payload}")
+        except BaseException:
+            self._stop()
+            raise
+        self.startup_seconds = time.perf_counter() - began
+        return self.startup_seconds
+
+    def run_many(self, texts: Iterable[str], category: str = "auto", detail: str = "med",
+                 fmt: str = "all") -> Iterator[PipelineResult]:
+        """Run scenarios on the workers, yielding results in input order"""
+        options = {"category": category, "detail": detail, "fmt": fmt}
+        texts = iter(texts)
+        submitted = 0
+        # Keep a few tasks per worker queued so nobody idles, without reading
+        # the whole input into the queue
+        for text in islice(texts, self.workers * 4):
+            self._tasks.put((submitted, text, options))
+            submitted += 1
+
+        done = {}
+        next_index = 0
+        while next_index < submitted:
+            kind, index, payload = self._get(self._processes)
+            if kind == "error":
+                raise WorkerError(f"scenario {index} failed in a worker:\n{payload}")
+            payload.ir = IntermediateRepresentation.from_bytes(payload.ir)
+            done[index] = payload
+            text = next(texts, None)
+            if text is not None:
+                self._tasks.put((submitted, text, options))
+                submitted += 1
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+
+    def close(self) -> List[WorkerStats]:
+        """Stop the workers and collect their WorkerStats"""
+        if not self._processes:
+            return self.stats
+        for _ in self._processes:
+            self._tasks.put(None)
+        stats = {}
+        waiting = self._processes
+        while waiting:
+            try:
+                kind, pid, payload = self._get(waiting)
+            except WorkerError:
+                break  # a dead worker sends no stats; report the others
+            if kind == "stats":
+                stats[pid] = payload
+            waiting = [p for p in self._processes if p.pid not in stats]
+        self._stop()
+        self.stats = list(stats.values())
+        return self.stats
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _get(self, processes) -> tuple:
+        """Next worker message; raises WorkerError once any of processes has died"""
+        while True:
+            try:
+                return self._results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                dead = [p for p in processes if not p.is_alive()]
+                if not dead:
+                    continue
+            # A worker flushes its queue before exiting, so anything it sent is here now
+            try:
+                return self._results.get(timeout=0.1)
+            except queue.Empty:
+                raise WorkerError(", ".join(f"worker {p.pid} exited with status {p.exitcode}"
+                                            for p in dead)) from None
+
+    def _stop(self) -> None:
+        """Join the workers, terminating any that do not exit"""
+        for process in self._processes:
+            process.join(timeout=POLL_SECONDS)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+
+if __name__ == "__main__":
+    scenarios = ["A ball falls due to gravity with acceleration.",
+                 "Someone overcomes fear and anxiety."] * 50
+
+    with WorkerPool(workers=2) as pool:
+        print(f"Ready in {pool.startup_seconds:.3f}s")
+        results = list(pool.run_many(scenarios, fmt="pseudo"))
+    print(f"{len(results)} results, first: {results[0].category.name}")
+    for stats in pool.stats:
+        print(f"  pid {stats.pid}: {stats.processed} scenarios, "
+              f"{stats.throughput:.0f}/s, RSS {stats.rss_bytes / 2**20:.1f} MiB, "
+              f"PSS {stats.pss_bytes / 2**20:.1f} MiB")